@@ -9,21 +9,38 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import TYPE_CHECKING
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.const import Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
+from socketio.exceptions import SocketIOError
 
-from .api import OnlyCatApiClient
+from .api import OnlyCatApiClient, OnlyCatApiClientError
+from .const import (
+    DOMAIN,
+    EVENT_HISTORY_SIZE,
+    SNAPSHOT_RECONCILE_RETRY_INTERVAL,
+    STARTUP_CONCURRENCY,
+    SUBSCRIPTION_CONCURRENCY,
+    USER_UPDATE_DEBOUNCE_COOLDOWN,
+)
 from .data.__init__ import OnlyCatConfigEntry, OnlyCatData
 from .data.device import Device, DeviceUpdate
-from .data.event import Event
+from .data.event import Event, EventUpdate
+from .data.history import EventHistory
 from .data.pet import Pet
-from .data.policy import DeviceTransitPolicy
+from .data.policy import DeviceTransitPolicy, DeviceTransitPolicyUpdate
+from .registry import async_get_client_registry
 from .services import async_setup_services
+from .snapshot import OnlyCatSnapshotStore, snapshot_from_data, snapshot_structure
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable, Iterator
+
     from homeassistant.core import HomeAssistant
 
 PLATFORMS: list[Platform] = [
@@ -37,177 +54,470 @@ _LOGGER = logging.getLogger(__name__)
 
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
-async def async_setup_entry(
+async def async_setup_entry(  # noqa: PLR0915
     hass: HomeAssistant,
     entry: OnlyCatConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
+    # Entries with the same token share a client, released again on unload.
+    registry = async_get_client_registry(hass)
     entry.runtime_data = OnlyCatData(
-        client=OnlyCatApiClient(
-            token=entry.data["token"],
-            session=async_get_clientsession(hass),
-        ),
+        client=registry.acquire(entry.data["token"], entry.entry_id),
         devices=[],
         pets=[],
+        snapshot=OnlyCatSnapshotStore(hass, entry.entry_id),
     )
-    await entry.runtime_data.client.connect()
+    entry.async_on_unload(
+        partial(registry.async_release, entry.data["token"], entry.entry_id)
+    )
+    restored = await entry.runtime_data.snapshot.async_load_data()
+    if restored:
+        devices, pets = restored
+        entry.runtime_data.devices.extend(devices)
+        entry.runtime_data.pets.extend(pets)
+        _LOGGER.debug(
+            "Restored %s devices and %s pets from snapshot", len(devices), len(pets)
+        )
+    else:
+        await entry.runtime_data.client.connect()
+        await _initialize_devices(entry)
+        await _initialize_pets(entry)
+        await entry.runtime_data.snapshot.async_save_data(
+            entry.runtime_data.devices, entry.runtime_data.pets
+        )
 
-    await _initialize_devices(entry)
-    await _initialize_pets(entry)
+    # Devices subscribed to in the socket session with the ID subscribed_session.
+    subscribed_devices: set[str] = set()
+    subscribed_session: str | None = None
+    subscription_lock = asyncio.Lock()
 
-    async def refresh_subscriptions(args: dict | None) -> None:
+    async def refresh_subscriptions(args: dict | None = None) -> None:
         _LOGGER.debug("Refreshing subscriptions, caused by event: %s", args)
-        for device in entry.runtime_data.devices:
-            await entry.runtime_data.client.send_message(
-                "getDevice", {"deviceId": device.device_id, "subscribe": True}
-            )
-            await entry.runtime_data.client.send_message(
-                "getDeviceEvents", {"deviceId": device.device_id, "subscribe": True}
+        async with subscription_lock:
+            await _refresh_subscriptions()
+
+    async def _refresh_subscriptions() -> None:
+        nonlocal subscribed_session
+        client = entry.runtime_data.client
+        if client.session_id != subscribed_session:
+            subscribed_devices.clear()
+            subscribed_session = client.session_id
+
+        devices = [
+            device
+            for device in entry.runtime_data.devices
+            if device.device_id not in subscribed_devices
+        ]
+        with _log_phase_duration("subscriptions"):
+            subscribed = await _gather_bounded(
+                SUBSCRIPTION_CONCURRENCY,
+                (_subscribe_to_device(client, device) for device in devices),
             )
+        subscribed_devices.update(
+            device.device_id
+            for device, success in zip(devices, subscribed, strict=True)
+            if success
+        )
+
+    refresh_debouncer = Debouncer(
+        hass,
+        _LOGGER,
+        cooldown=USER_UPDATE_DEBOUNCE_COOLDOWN,
+        immediate=False,
+        function=partial(refresh_subscriptions, {"event": "userUpdate"}),
+    )
+    entry.async_on_unload(refresh_debouncer.async_shutdown)
+
+    async def on_user_update(*_args: Any) -> None:
+        """Refresh subscriptions once a burst of user updates settled."""
+        refresh_debouncer.async_schedule_call()
 
-    async def update_device(data: dict) -> None:
+    async def update_device(update: DeviceUpdate) -> None:
         """Update a device in our runtime data when it is changed."""
-        update = DeviceUpdate.from_api_response(data)
-
-        for device in entry.runtime_data.devices:
-            if device.device_id == update.device_id:
-                updated_device = Device.from_api_response(
-                    await entry.runtime_data.client.send_message(
-                        "getDevice", {"deviceId": update.device_id, "subscribe": True}
-                    )
-                )
-                device.update_from(updated_device)
-                await _retrieve_device_transit_policies(entry, device)
-                _LOGGER.debug("Updated device: %s", device)
-                break
-        else:
+        await _apply_device_update(entry, update)
+
+    async def update_policy(update: DeviceTransitPolicyUpdate) -> None:
+        """Update a transit policy in our runtime data when it is changed."""
+        device = next(
+            (d for d in entry.runtime_data.devices if d.device_id == update.device_id),
+            None,
+        )
+        if device is None:
             _LOGGER.warning(
                 "Device with ID %s not found in runtime data", update.device_id
             )
+            return
+
+        policy = update.body
+        if policy is None or policy.transit_policy is None:
+            policy = DeviceTransitPolicy.from_api_response(
+                await entry.runtime_data.client.send_message(
+                    "getDeviceTransitPolicy",
+                    {"deviceTransitPolicyId": update.device_transit_policy_id},
+                )
+            )
+        if policy is None:
+            return
+
+        # Update known policies in place, entities hold on to them.
+        for known_policy in device.device_transit_policies or []:
+            if known_policy.device_transit_policy_id == policy.device_transit_policy_id:
+                known_policy.name = policy.name
+                known_policy.transit_policy = policy.transit_policy
+                break
+        else:
+            policy.device = device
+            device.device_transit_policies = [
+                *(device.device_transit_policies or []),
+                policy,
+            ]
+        _LOGGER.debug("Updated policy: %s", policy)
 
-    async def subscribe_to_device_event(data: dict) -> None:
+    async def record_event(update: EventUpdate) -> None:
+        """Record an event in the history of its device."""
+        _event_history(entry, update.device_id).add_update(update)
+
+    async def subscribe_to_device_event(update: EventUpdate) -> None:
         """Subscribe to a device event to get updates about the event in the future."""
         await entry.runtime_data.client.send_message(
             "getEvent",
             {
-                "deviceId": data["deviceId"],
-                "eventId": data["eventId"],
+                "deviceId": update.device_id,
+                "eventId": update.event_id,
                 "subscribe": True,
             },
         )
 
-    await refresh_subscriptions(None)
-    entry.runtime_data.client.add_event_listener("connect", refresh_subscriptions)
-    entry.runtime_data.client.add_event_listener("userUpdate", refresh_subscriptions)
-    entry.runtime_data.client.add_event_listener("deviceUpdate", update_device)
-    entry.runtime_data.client.add_event_listener(
-        "deviceEventUpdate", subscribe_to_device_event
+    if not restored:
+        await refresh_subscriptions(None)
+    # Registered in the namespace of the entry, removed when it is unloaded.
+    add_event_listener = partial(
+        entry.runtime_data.client.add_event_listener, namespace=entry.entry_id
     )
-    # TODO: policyUpdate event handling when we hear back from OnlyCat about its structure
+    add_event_listener("connect", refresh_subscriptions)
+    add_event_listener("userUpdate", on_user_update)
+    # Entities reading the device on deviceUpdate are ordered after this listener.
+    add_event_listener("deviceUpdate", update_device, ordered=True)
+    add_event_listener("policyUpdate", update_policy, ordered=True)
+    add_event_listener("deviceEventUpdate", subscribe_to_device_event)
+    add_event_listener("deviceEventUpdate", record_event)
+    add_event_listener("eventUpdate", record_event)
 
     await async_setup_services(hass)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    if restored:
+        entry.async_create_background_task(
+            hass,
+            _async_reconcile_snapshot(hass, entry, refresh_subscriptions),
+            f"{DOMAIN}_reconcile_snapshot_{entry.entry_id}",
+        )
     return True
 
 
-async def _initialize_devices(entry: OnlyCatConfigEntry) -> None:
-    device_ids = (
-        device["deviceId"]
-        for device in await entry.runtime_data.client.send_message(
-            "getDevices", {"subscribe": True}
-        )
-    )
-    for device_id in device_ids:
-        device = Device.from_api_response(
-            await entry.runtime_data.client.send_message(
-                "getDevice", {"deviceId": device_id, "subscribe": True}
+async def _async_reconcile_snapshot(
+    hass: HomeAssistant,
+    entry: OnlyCatConfigEntry,
+    refresh_subscriptions: Callable[[dict | None], Awaitable[None]],
+) -> None:
+    """
+    Reconcile the data restored from the snapshot with the gateway.
+
+    The gateway is retried until it can be reached. If anything the entities
+    were created from changed, the entry is reloaded from the new snapshot,
+    otherwise only the current connectivity is pushed to the entities.
+    """
+    client = entry.runtime_data.client
+    retry_interval = SNAPSHOT_RECONCILE_RETRY_INTERVAL
+    while True:
+        try:
+            await client.connect()
+            await refresh_subscriptions(None)
+            devices = await _fetch_devices(entry)
+            pets = await _fetch_pets(entry, devices)
+            break
+        except (SocketIOError, OnlyCatApiClientError) as error:
+            _LOGGER.warning(
+                "Unable to reconcile snapshot with the gateway (%s), retrying in %s s",
+                error,
+                retry_interval,
+            )
+            await asyncio.sleep(retry_interval)
+
+    cached = snapshot_from_data(entry.runtime_data.devices, entry.runtime_data.pets)
+    fresh = snapshot_from_data(devices, pets)
+    await entry.runtime_data.snapshot.async_save(fresh)
+    if snapshot_structure(cached) != snapshot_structure(fresh):
+        _LOGGER.debug("Snapshot is outdated, reloading entry")
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+
+    _LOGGER.debug("Snapshot is up to date")
+    for device in devices:
+        if device.connectivity:
+            await client.handle_event(
+                "deviceUpdate",
+                {
+                    "deviceId": device.device_id,
+                    "type": "update",
+                    "body": {"connectivity": device.connectivity.to_dict()},
+                },
             )
-        )
-        entry.runtime_data.devices.append(device)
 
+
+async def _apply_device_update(entry: OnlyCatConfigEntry, update: DeviceUpdate) -> None:
+    """
+    Apply a pushed device update to the device in our runtime data.
+
+    The fields present in the update are merged into the device directly, the
+    device is only fetched from the gateway if the update lacks a usable body.
+    """
     for device in entry.runtime_data.devices:
+        if device.device_id == update.device_id:
+            break
+    else:
+        _LOGGER.warning("Device with ID %s not found in runtime data", update.device_id)
+        return
+
+    if update.is_complete():
+        entry.runtime_data.stats["device_updates_merged"] += 1
+        device.update_from(update.body)
+    else:
+        entry.runtime_data.stats["device_updates_refetched"] += 1
+        device.update_from(
+            Device.from_api_response(
+                await entry.runtime_data.client.send_message(
+                    "getDevice", {"deviceId": update.device_id, "subscribe": True}
+                )
+            )
+        )
+    if device.device_transit_policy_id is not None and (
+        device.device_transit_policy is None
+    ):
+        # Activated policy is unknown, so the policy list changed.
         await _retrieve_device_transit_policies(entry, device)
+    _LOGGER.debug("Updated device: %s", device)
+
+
+async def _subscribe_to_device(client: OnlyCatApiClient, device: Device) -> bool:
+    """Subscribe to updates and events of a device, returning whether it worked."""
+    try:
+        await asyncio.gather(
+            client.send_message(
+                "getDevice", {"deviceId": device.device_id, "subscribe": True}
+            ),
+            client.send_message(
+                "getDeviceEvents", {"deviceId": device.device_id, "subscribe": True}
+            ),
+        )
+    except (SocketIOError, OnlyCatApiClientError) as error:
+        _LOGGER.warning("Unable to subscribe to device %s: %s", device.device_id, error)
+        return False
+    return True
+
+
+def _event_history(entry: OnlyCatConfigEntry, device_id: str) -> EventHistory:
+    """Return the event history of a device, creating it if needed."""
+    history = entry.runtime_data.history.get(device_id)
+    if history is None:
+        history = entry.runtime_data.history[device_id] = EventHistory(
+            EVENT_HISTORY_SIZE
+        )
+    return history
+
+
+async def _gather_bounded(limit: int, aws: Iterable[Awaitable[Any]]) -> list[Any]:
+    """Await all awaitables with at most `limit` running, keeping result order."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws))
+
+
+@contextmanager
+def _log_phase_duration(phase: str) -> Iterator[None]:
+    """Log how long a setup phase took."""
+    start = time.perf_counter()
+    yield
+    _LOGGER.debug(
+        "Setup phase %s took %.0f ms", phase, (time.perf_counter() - start) * 1000
+    )
+
+
+async def _initialize_devices(
+    entry: OnlyCatConfigEntry, concurrency: int = STARTUP_CONCURRENCY
+) -> None:
+    entry.runtime_data.devices.extend(await _fetch_devices(entry, concurrency))
+
+
+async def _fetch_devices(
+    entry: OnlyCatConfigEntry, concurrency: int = STARTUP_CONCURRENCY
+) -> list[Device]:
+    """Fetch all devices of the account including their transit policies."""
+    client = entry.runtime_data.client
+    with _log_phase_duration("getDevices"):
+        device_ids = [
+            device["deviceId"]
+            for device in await client.send_message("getDevices", {"subscribe": True})
+        ]
+
+    with _log_phase_duration("getDevice"):
+        responses = await _gather_bounded(
+            concurrency,
+            (
+                client.send_message(
+                    "getDevice", {"deviceId": device_id, "subscribe": True}
+                )
+                for device_id in device_ids
+            ),
+        )
+    devices = [Device.from_api_response(response) for response in responses]
+
+    with _log_phase_duration("getDeviceTransitPolicies"):
+        await _gather_bounded(
+            concurrency,
+            (_retrieve_device_transit_policies(entry, device) for device in devices),
+        )
+    return devices
+
 
-# TODO: Currently this works by getting a list of policy IDs, then fetching each policy individually.
-# This happens whenever there is a device update which is super inefficient as usually policies aren't changing much.
-# Ideally we want to hear back from OnlyCat about whether they have a SocketIO event for policy updates.
-# Then device updates change policy ID, and policy updates change the underlying policy data.
 async def _retrieve_device_transit_policies(
     entry: OnlyCatConfigEntry, device: Device
 ) -> None:
+    """
+    Synchronize the transit policies of a device with the gateway.
+
+    Policies already known are kept as they are, only policies with IDs that
+    are new to the device get fetched. Policies no longer listed are dropped.
+    """
     resp = await entry.runtime_data.client.send_message(
         "getDeviceTransitPolicies", {"deviceId": device.device_id}
     )
-    if not resp:
-        return []
-    
-    # First populate a list of IDs
-    policy_ids: list[int] = []    
-    for item in resp:
-        pid = item.get("deviceTransitPolicyId")
-        if pid is None:
-            continue
-        policy_ids.append(pid)
-    
-    # Then fetch full policy details in parallel
-    if not policy_ids:
-        return []
-    
-    coros = [
-        entry.runtime_data.client.send_message(
-            "getDeviceTransitPolicy",
-            {"deviceTransitPolicyId": pid}
-        )
-        for pid in policy_ids
+    policy_ids = [
+        item["deviceTransitPolicyId"]
+        for item in resp or []
+        if item.get("deviceTransitPolicyId") is not None
     ]
-    responses = await asyncio.gather(*coros, return_exceptions=True)
-    policies: list[DeviceTransitPolicy] = []
-    for pid, res in zip(policy_ids, responses):
+    known_policies = {
+        policy.device_transit_policy_id: policy
+        for policy in device.device_transit_policies or []
+    }
+    new_policy_ids = [pid for pid in policy_ids if pid not in known_policies]
+
+    responses = await asyncio.gather(
+        *(
+            entry.runtime_data.client.send_message(
+                "getDeviceTransitPolicy", {"deviceTransitPolicyId": pid}
+            )
+            for pid in new_policy_ids
+        ),
+        return_exceptions=True,
+    )
+    for pid, res in zip(new_policy_ids, responses, strict=True):
         if isinstance(res, Exception):
             _LOGGER.warning(
                 "Failed to load policy %s for device %s: %s", pid, device.device_id, res
             )
             continue
         policy = DeviceTransitPolicy.from_api_response(res)
-        policy.device = device
         if policy is not None:
-            policies.append(policy)
-    
-    device.device_transit_policies = policies
+            policy.device = device
+            known_policies[pid] = policy
 
+    _LOGGER.debug(
+        "Synchronized policies of device %s, fetched %s of %s",
+        device.device_id,
+        len(new_policy_ids),
+        len(policy_ids),
+    )
+    device.device_transit_policies = [
+        known_policies[pid] for pid in policy_ids if pid in known_policies
+    ]
 
-async def _initialize_pets(entry: OnlyCatConfigEntry) -> None:
-    for device in entry.runtime_data.devices:
-        events = [
-            Event.from_api_response(event)
-            for event in await entry.runtime_data.client.send_message(
-                "getDeviceEvents", {"deviceId": device.device_id}
-            )
-        ]
-        rfids = await entry.runtime_data.client.send_message(
-            "getLastSeenRfidCodesByDevice", {"deviceId": device.device_id}
+
+async def _initialize_pets(
+    entry: OnlyCatConfigEntry, concurrency: int = STARTUP_CONCURRENCY
+) -> None:
+    entry.runtime_data.pets.extend(
+        await _fetch_pets(entry, entry.runtime_data.devices, concurrency)
+    )
+
+
+async def _fetch_pets(
+    entry: OnlyCatConfigEntry,
+    devices: list[Device],
+    concurrency: int = STARTUP_CONCURRENCY,
+) -> list[Pet]:
+    """Fetch the pets seen by the given devices and their last seen events."""
+    client = entry.runtime_data.client
+    pets: list[Pet] = []
+    with _log_phase_duration("getDeviceEvents"):
+        device_events = await _gather_bounded(
+            concurrency,
+            (
+                client.send_message("getDeviceEvents", {"deviceId": device.device_id})
+                for device in devices
+            ),
         )
+    with _log_phase_duration("getLastSeenRfidCodesByDevice"):
+        device_rfids = await _gather_bounded(
+            concurrency,
+            (
+                client.send_message(
+                    "getLastSeenRfidCodesByDevice", {"deviceId": device.device_id}
+                )
+                for device in devices
+            ),
+        )
+    with _log_phase_duration("getRfidProfile"):
+        labels = await _gather_bounded(
+            concurrency,
+            (
+                client.get_rfid_label(rfid["rfidCode"])
+                for rfids in device_rfids
+                for rfid in rfids
+            ),
+        )
+
+    labels = iter(labels)
+    for device, api_events, rfids in zip(
+        devices, device_events, device_rfids, strict=True
+    ):
+        events = [Event.from_api_response(event) for event in api_events]
+        # Events are listed newest first, the history is kept oldest first.
+        _event_history(entry, device.device_id).add_events(reversed(events))
+        latest_events = _latest_event_by_rfid(events)
         for rfid in rfids:
             rfid_code = rfid["rfidCode"]
             last_seen = datetime.fromisoformat(rfid["timestamp"])
-            rfid_profile = await entry.runtime_data.client.send_message(
-                "getRfidProfile", {"rfidCode": rfid_code}
+            label = next(labels)
+            # Get last seen event to determine current presence state
+            pet = Pet(
+                device,
+                rfid_code,
+                last_seen,
+                last_seen_event=latest_events.get(rfid_code),
+                label=label,
             )
-            label = rfid_profile.get("label")
-            pet = Pet(device, rfid_code, last_seen, label=label)
             _LOGGER.debug(
                 "Found Pet %s for device %s",
                 label if label else rfid_code,
                 device.device_id,
             )
-            entry.runtime_data.pets.append(pet)
+            pets.append(pet)
+    return pets
 
-            # Get last seen event to determine current presence state
-            for event in events:
-                if event.rfid_codes and pet.rfid_code in event.rfid_codes:
-                    pet.last_seen_event = event
-                    break
+
+def _latest_event_by_rfid(events: list[Event]) -> dict[str, Event]:
+    """Map every RFID code to the latest of the events, listed newest first."""
+    latest_events: dict[str, Event] = {}
+    for event in events:
+        for rfid_code in event.rfid_codes or ():
+            latest_events.setdefault(rfid_code, event)
+    return latest_events
 
 
 async def async_unload_entry(
@@ -215,13 +525,23 @@ async def async_unload_entry(
     entry: OnlyCatConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
+    # The snapshot isn't saved from the runtime data, which isn't kept up to
+    # date for pets and would overwrite a snapshot written by reconciliation.
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: OnlyCatConfigEntry,
+) -> None:
+    """Remove the snapshot of a removed entry."""
+    await OnlyCatSnapshotStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: OnlyCatConfigEntry,
 ) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    # Through Home Assistant, so that the unload callbacks of the entry run.
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -2,12 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from collections import defaultdict
+import math
+import random
+import time
+from bisect import bisect_left
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from itertools import accumulate
 from typing import TYPE_CHECKING, Any
+from weakref import WeakKeyDictionary
+
+from .data.device import DeviceUpdate
+from .data.event import EventUpdate
+from .data.lifecycle import EventLifecycle
+from .data.policy import DeviceTransitPolicyUpdate
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
     import aiohttp
+    from homeassistant.helpers.entity import Entity
 
     from .data import OnlyCatData
 
@@ -17,6 +36,53 @@ _LOGGER = logging.getLogger(__name__)
 
 ONLYCAT_URL = "https://gateway.onlycat.com"
 
+# Socket events whose payload is decoded once into a typed, immutable update
+# before it is handed to listeners.
+EVENT_DECODERS: dict[str, Callable[[dict], Any]] = {
+    "deviceUpdate": DeviceUpdate.from_api_response,
+    "deviceEventUpdate": EventUpdate.from_api_response,
+    "eventUpdate": EventUpdate.from_api_response,
+    "policyUpdate": DeviceTransitPolicyUpdate.from_api_response,
+}
+
+# Seconds an RPC may take before it fails, by method. Fetching the events of a
+# device returns the largest responses.
+DEFAULT_RPC_TIMEOUT = 10
+RPC_TIMEOUTS: dict[str, float] = {
+    "getDeviceEvents": 20,
+    "runDeviceCommand": 20,
+}
+
+# RPCs that only read. They are retried when they fail, and identical reads in
+# flight share a single request. Commands and policy changes are sent once
+# per call, as the user asked for them.
+IDEMPOTENT_RPCS = frozenset(
+    {
+        "getDevice",
+        "getDevices",
+        "getDeviceEvents",
+        "getDeviceTransitPolicies",
+        "getDeviceTransitPolicy",
+        "getEvent",
+        "getLastSeenRfidCodesByDevice",
+        "getRfidProfile",
+    }
+)
+RPC_RETRIES = 2
+RPC_RETRY_BACKOFF = 0.5
+RPC_RETRY_BACKOFF_MAX = 5
+
+# Seconds until the socket reconnects after it dropped, doubling per failed
+# attempt up to the maximum, plus or minus up to RECONNECTION_JITTER seconds.
+RECONNECTION_DELAY = 1
+RECONNECTION_DELAY_MAX = 120
+RECONNECTION_JITTER = 0.5
+
+# Seconds without any message after which the link is probed with an RPC, and
+# seconds the probe may take before the socket is considered half-open.
+LIVENESS_INTERVAL = 60
+LIVENESS_TIMEOUT = 10
+
 
 class OnlyCatApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -34,72 +100,753 @@ class OnlyCatApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
+@dataclass(frozen=True, slots=True)
+class EventListener:
+    """A callback registered for a socket event."""
+
+    callback: Callable
+    ordered: bool = False
+    timeout: float | None = None
+    namespace: str | None = None
+
+    @property
+    def name(self) -> str:
+        """Return a readable name of the callback for logging and statistics."""
+        return getattr(self.callback, "__qualname__", repr(self.callback))
+
+
+@dataclass(slots=True)
+class ListenerLatency:
+    """Aggregated handling latency of a listener."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Return the mean handling latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a single invocation."""
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+
+# Upper bounds in seconds of the buckets of latency histograms, 10% apart from
+# 1 ms to about 2 hours. Longer latencies are counted in an overflow bucket.
+HISTOGRAM_BOUNDS = tuple(0.001 * 1.1**index for index in range(166))
+
+
+class LatencyHistogram:
+    """
+    Streaming histogram of latencies in exponentially growing buckets.
+
+    Memory stays constant however many latencies are recorded, percentiles are
+    accurate to the width of a bucket, i.e. to 10%.
+    """
+
+    __slots__ = ("buckets", "count", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, latency: float) -> None:
+        """Record a latency in seconds."""
+        self.buckets[bisect_left(HISTOGRAM_BOUNDS, latency)] += 1
+        self.count += 1
+        self.max = max(self.max, latency)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the latency below which percent of the latencies are."""
+        if not self.count:
+            return None
+        rank = max(math.ceil(percent / 100 * self.count), 1)
+        index = bisect_left(list(accumulate(self.buckets)), rank)
+        if index == len(HISTOGRAM_BOUNDS):
+            return self.max
+        return min(HISTOGRAM_BOUNDS[index], self.max)
+
+    def summary(self) -> dict[str, float | None]:
+        """Return the count, p50, p95, p99 and maximum in milliseconds."""
+        return {
+            "count": self.count,
+            **{
+                f"p{percent}": _milliseconds(self.percentile(percent))
+                for percent in (50, 95, 99)
+            },
+            "max": _milliseconds(self.max if self.count else None),
+        }
+
+
+@dataclass(slots=True)
+class EventLatency:
+    """
+    End to end latency of the events of a device.
+
+    delivery is the delay from the timestamp of an event until the socket
+    received it, processing from then until the state of an entity was written.
+    Clocks of devices running ahead of ours show as negative delivery delays,
+    the largest seen is taken as the skew and added to all delays.
+    """
+
+    delivery: LatencyHistogram = field(default_factory=LatencyHistogram)
+    processing: LatencyHistogram = field(default_factory=LatencyHistogram)
+    skew: float = 0.0
+    last_event_id: int | None = None
+
+    def record_delivery(self, delay: float) -> None:
+        """Record the delivery delay of an event, correcting it for clock skew."""
+        self.skew = max(self.skew, -delay)
+        self.delivery.record(delay + self.skew)
+
+
+class RfidProfileCache:
+    """
+    LRU cache of RFID profiles with a time to live.
+
+    Concurrent lookups of the same RFID code share a single getRfidProfile
+    request. The cache doesn't belong to a client, so it can outlive one.
+    """
+
+    def __init__(self, ttl: float = 3600, max_size: int = 256) -> None:
+        """Initialize the cache."""
+        self._ttl = ttl
+        self._max_size = max_size
+        self._profiles: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._pending: dict[str, asyncio.Future[dict | None]] = {}
+        self.stats: Counter[str] = Counter()
+
+    async def async_get(self, client: OnlyCatApiClient, rfid_code: str) -> dict | None:
+        """Return the profile of an RFID code, fetching it if necessary."""
+        cached = self._profiles.get(rfid_code)
+        if cached is not None:
+            expires, profile = cached
+            if expires > time.monotonic():
+                self._profiles.move_to_end(rfid_code)
+                self.stats["hits"] += 1
+                return profile
+            del self._profiles[rfid_code]
+
+        pending = self._pending.get(rfid_code)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        self.stats["misses"] += 1
+        pending = asyncio.ensure_future(
+            client.send_message("getRfidProfile", {"rfidCode": rfid_code})
+        )
+        self._pending[rfid_code] = pending
+        pending.add_done_callback(lambda future: self._on_fetched(rfid_code, future))
+        return await asyncio.shield(pending)
+
+    def _on_fetched(self, rfid_code: str, future: asyncio.Future[dict | None]) -> None:
+        """Store a fetched profile, unless the lookup failed."""
+        del self._pending[rfid_code]
+        if (
+            future.cancelled()
+            or future.exception() is not None
+            or future.result() is None
+        ):
+            return
+        self._profiles[rfid_code] = (time.monotonic() + self._ttl, future.result())
+        self._profiles.move_to_end(rfid_code)
+        while len(self._profiles) > self._max_size:
+            self._profiles.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, rfid_code: str | None = None) -> None:
+        """Drop the profile of an RFID code, or all profiles."""
+        if rfid_code is None:
+            self._profiles.clear()
+        else:
+            self._profiles.pop(rfid_code, None)
+
+
+@dataclass(slots=True)
+class StateWriteCycle:
+    """The state writes requested while dispatching a single message."""
+
+    delayed: bool
+    received: float | None
+    # Dirty entities with the time the message making them dirty was received.
+    dirty: dict[int, tuple[Entity, float | None]] = field(default_factory=dict)
+
+
+class StateWriteCoalescer:
+    """
+    Coalesce the state writes of entities requested while dispatching messages.
+
+    Entities are marked dirty by listeners and written once at the end of the
+    dispatch cycle of their message. Messages are dispatched concurrently, so
+    every message has a cycle of its own, tracked in a context variable. For
+    delayed cycles, i.e. event updates, entities written less than window
+    seconds ago are written once the window has passed, so that a burst of
+    partial updates of an event results in a single trailing write per entity
+    while the first update is still written right away.
+    """
+
+    def __init__(
+        self,
+        window: float = 0,
+        on_write: Callable[[Entity, float], None] | None = None,
+    ) -> None:
+        """
+        Initialize the coalescer, throttling writes of delayed cycles by window.
+
+        on_write is called with every entity written for a cycle that was given
+        the time its message was received, and the seconds since then.
+        """
+        self.window = window
+        self.stats: Counter[str] = Counter()
+        self._on_write = on_write
+        self._cycle: ContextVar[StateWriteCycle | None] = ContextVar(
+            f"state_write_cycle_{id(self)}", default=None
+        )
+        self._written: WeakKeyDictionary[Entity, float] = WeakKeyDictionary()
+        self._delayed: dict[int, tuple[Entity, float | None]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    @contextmanager
+    def cycle(
+        self, *, delayed: bool = False, received: float | None = None
+    ) -> Iterator[StateWriteCycle]:
+        """
+        Collect the writes requested while dispatching a message.
+
+        received is the time.perf_counter() the message was received at.
+        """
+        cycle = StateWriteCycle(delayed=delayed and self.window > 0, received=received)
+        token = self._cycle.set(cycle)
+        try:
+            yield cycle
+        finally:
+            self._cycle.reset(token)
+            self._end_cycle(cycle)
+
+    def mark_dirty(self, entity: Entity) -> None:
+        """Request a state write, written right away outside a dispatch cycle."""
+        cycle = self._cycle.get()
+        if cycle is None:
+            self._write([(entity, None)])
+        elif id(entity) in cycle.dirty:
+            self.stats["suppressed"] += 1
+        else:
+            cycle.dirty[id(entity)] = (entity, cycle.received)
+
+    def _end_cycle(self, cycle: StateWriteCycle) -> None:
+        """Write the entities of a cycle, delaying those written recently."""
+        # Entities written after this are written again after the window.
+        recent = time.monotonic() - self.window
+        due = []
+        for key, (entity, received) in cycle.dirty.items():
+            if cycle.delayed and self._written.get(entity, -math.inf) > recent:
+                if key in self._delayed:
+                    self.stats["suppressed"] += 1
+                else:
+                    self._delayed[key] = (entity, received)
+            else:
+                due.append((entity, received))
+        self._write(due)
+        if self._delayed and self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.window, self.flush
+            )
+
+    def flush(self) -> None:
+        """Write the state of all entities whose write was delayed."""
+        self.cancel()
+        self._write(list(self._delayed.values()))
+
+    def _write(self, dirty: list[tuple[Entity, float | None]]) -> None:
+        """Write the state of entities once."""
+        now = time.monotonic()
+        for entity, received in dirty:
+            self._delayed.pop(id(entity), None)
+            self._written[entity] = now
+            if entity.hass is None:
+                continue
+            try:
+                entity.async_write_ha_state()
+            except Exception:
+                _LOGGER.exception("Unable to write state of %s", entity.entity_id)
+            self.stats["issued"] += 1
+            if received is not None and self._on_write is not None:
+                self._on_write(entity, time.perf_counter() - received)
+        if dirty:
+            _LOGGER.debug(
+                "Wrote %s states, %s issued and %s suppressed in total",
+                len(dirty),
+                self.stats["issued"],
+                self.stats["suppressed"],
+            )
+
+    def cancel(self) -> None:
+        """Cancel a pending delayed flush."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+
 class OnlyCatApiClient:
     """Only Cat API Client."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         token: str,
         session: aiohttp.ClientSession,
         data: OnlyCatData | None = None,
         socket: socketio.AsyncClient | None = None,
+        *,
+        concurrent_dispatch: bool = False,
+        max_concurrent_listeners: int = 10,
+        listener_timeout: float | None = None,
+        rfid_profiles: RfidProfileCache | None = None,
+        state_write_window: float = 0,
+        url: str = ONLYCAT_URL,
+        rpc_retries: int = RPC_RETRIES,
+        rpc_retry_backoff: float = RPC_RETRY_BACKOFF,
     ) -> None:
-        """Sample API Client."""
+        """
+        Initialize the client of the OnlyCat API.
+
+        token: Token authenticating the socket.
+        session: HTTP session of Home Assistant.
+        data: Runtime data of the config entry, if any.
+        socket: Socket to use instead of a new one, e.g. in tests.
+        concurrent_dispatch: Run the listeners of a message concurrently,
+            except for ordered ones, which run one after another.
+        max_concurrent_listeners: Number of listeners running at a time.
+        listener_timeout: Default time before a listener is cancelled.
+        rfid_profiles: Cache of RFID profiles, possibly shared with earlier
+            clients.
+        state_write_window: Seconds during which further state writes of an
+            entity are coalesced after an event update wrote it.
+        url: Gateway to connect to, e.g. a local simulator.
+        rpc_retries: Number of retries of failed reads.
+        rpc_retry_backoff: Initial backoff in seconds before a retry, doubling
+            with every retry and jittered.
+        """
         self._token = token
+        self._url = url
         self._data = data
         self._session = session
-        self._listeners = defaultdict(list)
+        self._listeners: defaultdict[tuple[str, ...], list[EventListener]] = (
+            defaultdict(list)
+        )
+        self._concurrent_dispatch = concurrent_dispatch
+        self._dispatch_semaphore = asyncio.Semaphore(max_concurrent_listeners)
+        self._listener_timeout = listener_timeout
+        self.rfid_profiles = rfid_profiles or RfidProfileCache()
+        self.state_writes = StateWriteCoalescer(
+            state_write_window, on_write=self._record_state_write
+        )
+        self.event_latency: defaultdict[str, EventLatency] = defaultdict(EventLatency)
+        self._event_lifecycles: dict[str, EventLifecycle] = {}
+        self._rpc_retries = rpc_retries
+        self._rpc_retry_backoff = rpc_retry_backoff
+        self._pending_reads: dict[tuple[str, str], asyncio.Future] = {}
+        self._last_received = time.monotonic()
+        self._liveness_probe: asyncio.Task | None = None
+        self._closing = False
+        self._disconnected_at: float | None = None
+        self._resubscribed = False
+        self.recovery = LatencyHistogram()
+        self.stats: Counter[str] = Counter()
+        self.listener_latency: defaultdict[str, ListenerLatency] = defaultdict(
+            ListenerLatency
+        )
         self._socket = socket or socketio.AsyncClient(
             http_session=self._session,
             reconnection=True,
             reconnection_attempts=0,
-            reconnection_delay=10,
-            reconnection_delay_max=10,
+            reconnection_delay=RECONNECTION_DELAY,
+            reconnection_delay_max=RECONNECTION_DELAY_MAX,
+            randomization_factor=RECONNECTION_JITTER,
             ssl_verify=True,
         )
         self._socket.on("*", self.handle_event)
+        # Reserved events like connect never reach the catch-all handler.
+        self._socket.on("connect", self._on_socket_connect)
+        self._socket.on("disconnect", self._on_socket_disconnect)
+        self.user_id: str | None = None
         self.add_event_listener("connect", self.on_connected)
+        self.add_event_listener("userUpdate", self._on_user_update)
 
-    async def connect(self) -> None:
-        """Connect to wesocket client."""
+    async def connect(self, *, retry: bool = False) -> None:
+        """
+        Connect to wesocket client.
+
+        With retry, a failed connection attempt is retried with the socket's
+        reconnection backoff instead of raising right away.
+        """
         if self._socket.connected:
             return
         _LOGGER.debug("Connecting to API")
+        self._closing = False
 
         await self._socket.connect(
-            ONLYCAT_URL,
+            self._url,
             transports=["websocket"],
             namespaces="/",
             headers={"platform": "home-assistant", "device": "onlycat-hass"},
             auth={"token": self._token},
+            retry=retry,
         )
 
+    @property
+    def session_id(self) -> str | None:
+        """Return the ID of the current socket session."""
+        return self._socket.get_sid()
+
+    async def _on_socket_connect(self) -> None:
+        """Forward the socket's connect event to the listeners."""
+        self._last_received = time.monotonic()
+        if self._liveness_probe is None or self._liveness_probe.done():
+            self._liveness_probe = asyncio.create_task(self._probe_liveness())
+        await self.handle_event("connect")
+        # The connect listeners resubscribed, the next message completes the
+        # recovery from a dropped connection.
+        self._resubscribed = True
+
+    async def _on_socket_disconnect(self, reason: str | None = None) -> None:
+        """Forward the socket's disconnect event to the listeners."""
+        self._stop_liveness_probe()
+        self._resubscribed = False
+        if not self._closing and self._disconnected_at is None:
+            _LOGGER.info("Connection to API lost: %s", reason)
+            self._disconnected_at = time.monotonic()
+        await self.handle_event("disconnect")
+
     async def disconnect(self) -> None:
         """Disconnect websocket client."""
         _LOGGER.debug("Disconnecting from API")
+        self._closing = True
+        self._stop_liveness_probe()
         await self._socket.disconnect()
         await self._socket.shutdown()
 
-    def add_event_listener(self, event: str, callback: Any) -> None:
-        """Add an event listener."""
-        self._listeners[event].append(callback)
-        _LOGGER.debug("Added event listener for event: %s", event)
+    async def _probe_liveness(self) -> None:
+        """
+        Probe the link with an RPC when no message was received for a while.
+
+        A half-open socket is dropped as soon as a probe goes unanswered, so
+        that the socket reconnects without waiting for the transport to notice.
+        """
+        while True:
+            idle = time.monotonic() - self._last_received
+            await asyncio.sleep(max(LIVENESS_INTERVAL - idle, 0))
+            if time.monotonic() - self._last_received < LIVENESS_INTERVAL:
+                continue
+            try:
+                await self._socket.call(
+                    "getDevices", {"subscribe": False}, timeout=LIVENESS_TIMEOUT
+                )
+            except socketio.exceptions.SocketIOError as error:
+                self.stats["liveness_failures"] += 1
+                _LOGGER.warning("API didn't answer a liveness probe: %r", error)
+                self._liveness_probe = None
+                await self._drop_transport()
+                return
+            self._last_received = time.monotonic()
+
+    async def _drop_transport(self) -> None:
+        """Abort the transport of the socket and connect again."""
+        # socketio doesn't reconnect a transport aborted by the client itself.
+        await self._socket.eio.disconnect(abort=True)
+        if self._closing:
+            return
+        try:
+            await self.connect(retry=True)
+        except socketio.exceptions.ConnectionError:
+            _LOGGER.exception("Unable to reconnect to API")
+
+    def _stop_liveness_probe(self) -> None:
+        """Stop probing the link."""
+        if self._liveness_probe is not None:
+            self._liveness_probe.cancel()
+            self._liveness_probe = None
+
+    def add_event_listener(  # noqa: PLR0913
+        self,
+        event: str,
+        callback: Any,
+        device_id: str | None = None,
+        rfid_code: str | None = None,
+        *,
+        ordered: bool = False,
+        timeout: float | None = None,
+        namespace: str | None = None,
+    ) -> Callable[[], None]:
+        """
+        Add an event listener.
+
+        Without a device_id the callback receives every occurrence of the event.
+        With a device_id (and optionally an rfid_code) it is only called for
+        messages concerning that device (and naming that RFID code).
+        Ordered listeners are never run concurrently with each other, so they
+        can rely on earlier ordered listeners having finished. Returns a
+        callable removing the listener again. Listeners registered in a
+        namespace, e.g. of a config entry sharing the client, can also be
+        removed together with remove_event_listeners.
+        """
+        if rfid_code is not None and device_id is None:
+            msg = "An rfid_code listener must also be bound to a device_id"
+            raise ValueError(msg)
+        key = _listener_key(event, device_id, rfid_code)
+        listener = EventListener(
+            callback, ordered=ordered, timeout=timeout, namespace=namespace
+        )
+        self._listeners[key].append(listener)
+        _LOGGER.debug(
+            "Added event listener for event: %s (device: %s, rfid: %s)",
+            event,
+            device_id,
+            rfid_code,
+        )
+
+        def remove_listener() -> None:
+            listeners = self._listeners.get(key)
+            if listeners is None or listener not in listeners:
+                return
+            listeners.remove(listener)
+            if not listeners:
+                del self._listeners[key]
+
+        return remove_listener
+
+    def remove_event_listeners(self, namespace: str) -> None:
+        """Remove all listeners registered in a namespace."""
+        for key, listeners in list(self._listeners.items()):
+            listeners[:] = [
+                listener for listener in listeners if listener.namespace != namespace
+            ]
+            if not listeners:
+                del self._listeners[key]
+
+    @property
+    def listener_count(self) -> int:
+        """Return the number of registered event listeners."""
+        return sum(len(listeners) for listeners in self._listeners.values())
+
+    def get_event_listeners(
+        self,
+        event: str,
+        device_id: str | None = None,
+        rfid_codes: Iterable[str] | None = None,
+    ) -> list[EventListener]:
+        """
+        Return the listeners interested in an event, in dispatch order.
+
+        Unkeyed listeners come first, followed by the listeners of the device
+        the message concerns and finally those of the RFID codes it names.
+        """
+        listeners = list(self._listeners.get((event,), ()))
+        if device_id is None:
+            return listeners
+
+        listeners.extend(self._listeners.get((event, device_id), ()))
+        for rfid_code in rfid_codes or ():
+            listeners.extend(self._listeners.get((event, device_id, rfid_code), ()))
+        return listeners
+
+    def event_lifecycle(self, device_id: str) -> EventLifecycle:
+        """Return the lifecycle of the events of a device, shared by its entities."""
+        lifecycle = self._event_lifecycles.get(device_id)
+        if lifecycle is None:
+            lifecycle = self._event_lifecycles[device_id] = EventLifecycle(device_id)
+            for event in ("deviceEventUpdate", "eventUpdate"):
+                self.add_event_listener(
+                    event, lifecycle.on_event_update, device_id=device_id, ordered=True
+                )
+        return lifecycle
 
     async def handle_event(self, event: str, *args: Any) -> None:
-        """Handle an event."""
+        """
+        Handle an event.
+
+        Payloads of events listed in EVENT_DECODERS are parsed once and the
+        resulting update object is shared by all listeners of the message.
+        """
+        received = time.perf_counter()
+        received_at = time.time()
+        self._last_received = time.monotonic()
+        if self._resubscribed and event not in ("connect", "disconnect"):
+            self._record_recovery()
         _LOGGER.debug("Received event: %s with args: %s", event, args)
-        for callback in self._listeners[event]:
+        decoder = EVENT_DECODERS.get(event)
+        update = None
+        if decoder is None or not args:
+            listeners = self.get_event_listeners(event)
+        else:
             try:
-                await callback(*args)
+                update = decoder(args[0])
             except Exception:
-                _LOGGER.exception(
-                    "Error while handling event %s with args %s", event, args
-                )
+                _LOGGER.exception("Unable to decode event %s with args %s", event, args)
+                return
+            if update is None:
+                _LOGGER.debug("Ignoring event %s without payload", event)
+                return
+            args = (update, *args[1:])
+            listeners = self.get_event_listeners(
+                event,
+                update.device_id,
+                update.event.rfid_codes if isinstance(update, EventUpdate) else None,
+            )
+            self.stats["parses"] += 1
+            self.stats["parses_saved"] += max(len(listeners) - 1, 0)
+
+        if isinstance(update, EventUpdate):
+            self._record_delivery(update, received_at)
+            cycle = self.state_writes.cycle(delayed=True, received=received)
+        else:
+            cycle = self.state_writes.cycle()
+        with cycle:
+            await self._dispatch(event, listeners, args)
+
+    def _record_delivery(self, update: EventUpdate, received_at: float) -> None:
+        """Record the delay from the timestamp of a new event until its receipt."""
+        latency = self.event_latency[update.device_id]
+        if update.event.timestamp is None or update.event_id == latency.last_event_id:
+            return
+        latency.last_event_id = update.event_id
+        latency.record_delivery(received_at - update.event.timestamp.timestamp())
+        _LOGGER.debug(
+            "Event %s of %s received %.0f ms after its timestamp (skew %.0f ms),"
+            " delivery %s, processing %s",
+            update.event_id,
+            update.device_id,
+            (received_at - update.event.timestamp.timestamp()) * 1000,
+            latency.skew * 1000,
+            latency.delivery.summary(),
+            latency.processing.summary(),
+        )
+
+    def _record_recovery(self) -> None:
+        """Record the time from losing the connection until messages flow again."""
+        self._resubscribed = False
+        if self._disconnected_at is None:
+            return
+        recovery = time.monotonic() - self._disconnected_at
+        self._disconnected_at = None
+        self.recovery.record(recovery)
+        _LOGGER.info("Recovered connection to API in %.1f s", recovery)
+
+    def _record_state_write(self, entity: Entity, latency: float) -> None:
+        """Record the delay from receiving an event update until a state write."""
+        device = getattr(entity, "device", None)
+        if device is not None:
+            self.event_latency[device.device_id].processing.record(latency)
+
+    async def _dispatch(
+        self, event: str, listeners: list[EventListener], args: tuple
+    ) -> None:
+        """Run the listeners of a message, sequentially or concurrently."""
+        if not self._concurrent_dispatch or len(listeners) <= 1:
+            for listener in listeners:
+                await self._run_listener(event, listener, args)
+            return
+
+        async def run_ordered(ordered: list[EventListener]) -> None:
+            for listener in ordered:
+                async with self._dispatch_semaphore:
+                    await self._run_listener(event, listener, args)
+
+        async def run_unordered(listener: EventListener) -> None:
+            async with self._dispatch_semaphore:
+                await self._run_listener(event, listener, args)
+
+        async with asyncio.TaskGroup() as group:
+            ordered = [listener for listener in listeners if listener.ordered]
+            if ordered:
+                group.create_task(run_ordered(ordered))
+            for listener in listeners:
+                if not listener.ordered:
+                    group.create_task(run_unordered(listener))
+
+    async def _run_listener(
+        self, event: str, listener: EventListener, args: tuple
+    ) -> None:
+        """Run a single listener, enforcing its timeout and recording its latency."""
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(listener.timeout or self._listener_timeout):
+                await listener.callback(*args)
+        except TimeoutError:
+            _LOGGER.warning(
+                "Listener %s timed out while handling event %s", listener.name, event
+            )
+        except Exception:
+            _LOGGER.exception("Error while handling event %s with args %s", event, args)
+        finally:
+            latency = time.perf_counter() - start
+            self.listener_latency[listener.name].record(latency)
+            _LOGGER.debug(
+                "Listener %s handled event %s in %.1f ms",
+                listener.name,
+                event,
+                latency * 1000,
+            )
 
     async def send_message(self, event: str, data: any) -> Any | None:
-        """Send a message to the API."""
-        _LOGGER.debug("Sending %s message to API: %s", event, data)
-        return await self._socket.call(event, data)
+        """
+        Send a message to the API.
+
+        Reads are retried if they fail, and concurrent identical reads share
+        one request. Raises OnlyCatApiClientCommunicationError if the message
+        can't be sent or isn't answered in time.
+        """
+        if event not in IDEMPOTENT_RPCS:
+            return await self._call(event, data, attempts=1)
+
+        key = (event, json.dumps(data, sort_keys=True, default=str))
+        pending = self._pending_reads.get(key)
+        if pending is not None:
+            self.stats["rpc_coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        pending = asyncio.ensure_future(
+            self._call(event, data, attempts=1 + self._rpc_retries)
+        )
+        self._pending_reads[key] = pending
+        pending.add_done_callback(lambda _: self._pending_reads.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _call(self, event: str, data: Any, attempts: int) -> Any | None:
+        """Call an RPC, retrying with exponential backoff and full jitter."""
+        timeout = RPC_TIMEOUTS.get(event, DEFAULT_RPC_TIMEOUT)
+        for attempt in range(attempts):
+            _LOGGER.debug("Sending %s message to API: %s", event, data)
+            try:
+                return await self._socket.call(event, data, timeout=timeout)
+            except socketio.exceptions.SocketIOError as error:
+                if attempt + 1 == attempts:
+                    self.stats["rpc_failures"] += 1
+                    msg = f"{event} failed after {attempts} attempt(s): {error!r}"
+                    raise OnlyCatApiClientCommunicationError(msg) from error
+                backoff = min(
+                    self._rpc_retry_backoff * 2**attempt, RPC_RETRY_BACKOFF_MAX
+                )
+                delay = random.uniform(0, backoff)  # noqa: S311
+                self.stats["rpc_retries"] += 1
+                _LOGGER.debug("%s failed (%r), retrying in %.2f s", event, error, delay)
+                await asyncio.sleep(delay)
+        return None
+
+    async def get_rfid_profile(self, rfid_code: str) -> dict | None:
+        """Return the profile of an RFID code, served from cache if possible."""
+        return await self.rfid_profiles.async_get(self, rfid_code)
+
+    async def get_rfid_label(self, rfid_code: str) -> str | None:
+        """Return the label of an RFID code, if it has one."""
+        profile = await self.get_rfid_profile(rfid_code)
+        return profile.get("label") if profile else None
 
     async def wait(self) -> None:
         """Wait until client is disconnected."""
@@ -108,3 +855,24 @@ class OnlyCatApiClient:
     async def on_connected(self) -> None:
         """Handle connected event."""
         _LOGGER.debug("(Re)connected to API")
+
+    async def _on_user_update(self, data: Any = None) -> None:
+        """Remember the ID of the user the token belongs to."""
+        if isinstance(data, dict) and "id" in data:
+            self.user_id = str(data["id"])
+
+
+def _listener_key(
+    event: str, device_id: str | None = None, rfid_code: str | None = None
+) -> tuple[str, ...]:
+    """Build the routing key a listener is stored under."""
+    if device_id is None:
+        return (event,)
+    if rfid_code is None:
+        return (event, device_id)
+    return (event, device_id, rfid_code)
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    """Convert seconds to milliseconds, rounded to a tenth."""
+    return round(seconds * 1000, 1) if seconds is not None else None
@@ -14,13 +14,13 @@ from homeassistant.const import EntityCategory
 from homeassistant.helpers.device_registry import DeviceInfo
 
 from .const import DOMAIN
-from .data.device import DeviceUpdate
 
 _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from . import Device
     from .api import OnlyCatApiClient
+    from .data.device import DeviceUpdate
 
 ENTITY_DESCRIPTION = BinarySensorEntityDescription(
     key="OnlyCat",
@@ -56,21 +56,23 @@ class OnlyCatConnectionSensor(BinarySensorEntity):
         self._attr_is_on = device.connectivity.connected
         self._attr_raw_data = None
         self.device = device
+        self._api_client = api_client
         self._attr_unique_id = (
             device.device_id.replace("-", "_").lower() + "_connectivity"
         )
         self.entity_id = "binary_sensor." + self._attr_unique_id
 
-        api_client.add_event_listener("deviceUpdate", self.on_device_update)
+    async def async_added_to_hass(self) -> None:
+        """Listen for updates of the device once added to Home Assistant."""
+        self.async_on_remove(
+            self._api_client.add_event_listener(
+                "deviceUpdate", self.on_device_update, device_id=self.device.device_id
+            )
+        )
 
-    async def on_device_update(self, data: dict) -> None:
+    async def on_device_update(self, device_update: DeviceUpdate) -> None:
         """Handle device update event."""
-        if data["deviceId"] != self.device.device_id:
-            return
-
-        device_update = DeviceUpdate.from_api_response(data)
-
-        self._attr_raw_data = str(data)
+        self._attr_raw_data = str(device_update)
         if device_update.body.connectivity:
             self._attr_is_on = device_update.body.connectivity.connected
-        self.async_write_ha_state()
+        self._api_client.state_writes.mark_dirty(self)
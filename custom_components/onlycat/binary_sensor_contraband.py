@@ -13,13 +13,15 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.helpers.device_registry import DeviceInfo
 
 from .const import DOMAIN
-from .data.event import Event, EventClassification, EventUpdate
+from .data.event import EventClassification
+from .data.lifecycle import EventTransition
 
 _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from .api import OnlyCatApiClient
     from .data.device import Device
+    from .data.event import Event
 
 ENTITY_DESCRIPTION = BinarySensorEntityDescription(
     key="OnlyCat",
@@ -55,24 +57,29 @@ class OnlyCatContrabandSensor(BinarySensorEntity):
         self._attr_is_on = False
         self._attr_raw_data = None
         self.device: Device = device
-        self._current_event: Event = Event()
         self._attr_unique_id = (
             device.device_id.replace("-", "_").lower() + "_contraband"
         )
         self._api_client = api_client
         self.entity_id = "sensor." + self._attr_unique_id
 
-        api_client.add_event_listener("deviceEventUpdate", self.on_event_update)
-        api_client.add_event_listener("eventUpdate", self.on_event_update)
-
-    async def on_event_update(self, data: dict) -> None:
-        """Handle event update event."""
-        if data["deviceId"] != self.device.device_id:
-            return
+    async def async_added_to_hass(self) -> None:
+        """Follow the events of the device once added to Home Assistant."""
+        self.async_on_remove(
+            self._api_client.event_lifecycle(self.device.device_id).subscribe(
+                self.on_event_transition,
+                (EventTransition.CLASSIFIED, EventTransition.CONCLUDED),
+            )
+        )
 
-        self._current_event.update_from(EventUpdate.from_api_response(data).event)
-        self.determine_new_state(self._current_event)
-        self.async_write_ha_state()
+    async def on_event_transition(
+        self,
+        transition: EventTransition,  # noqa: ARG002
+        event: Event,
+    ) -> None:
+        """Handle a classification or the conclusion of the ongoing event."""
+        self.determine_new_state(event)
+        self._api_client.state_writes.mark_dirty(self)
 
     def determine_new_state(self, event: Event) -> None:
         """Determine the new state of the sensor based on the event."""
@@ -81,7 +88,6 @@ class OnlyCatContrabandSensor(BinarySensorEntity):
 
         if event.frame_count:
             self._attr_is_on = False
-            self._current_event = Event()
         elif event.event_classification == EventClassification.CONTRABAND:
             _LOGGER.debug("Contraband detected for event %s", event)
             self._attr_is_on = True
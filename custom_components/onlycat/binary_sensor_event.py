@@ -13,13 +13,13 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.helpers.device_registry import DeviceInfo
 
 from .const import DOMAIN
-from .data.event import Event, EventUpdate
 
 _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from .api import OnlyCatApiClient
     from .data.device import Device
+    from .data.event import Event, EventUpdate
 
 ENTITY_DESCRIPTION = BinarySensorEntityDescription(
     key="OnlyCat",
@@ -59,16 +59,19 @@ class OnlyCatEventSensor(BinarySensorEntity):
         self._api_client = api_client
         self.entity_id = "sensor." + self._attr_unique_id
 
-        api_client.add_event_listener("deviceEventUpdate", self.on_event_update)
-        api_client.add_event_listener("eventUpdate", self.on_event_update)
+    async def async_added_to_hass(self) -> None:
+        """Listen for events of the device once added to Home Assistant."""
+        for event in ("deviceEventUpdate", "eventUpdate"):
+            self.async_on_remove(
+                self._api_client.add_event_listener(
+                    event, self.on_event_update, device_id=self.device.device_id
+                )
+            )
 
-    async def on_event_update(self, data: dict) -> None:
+    async def on_event_update(self, update: EventUpdate) -> None:
         """Handle event update event."""
-        if data["deviceId"] != self.device.device_id:
-            return
-
-        self.determine_new_state(EventUpdate.from_api_response(data).event)
-        self.async_write_ha_state()
+        self.determine_new_state(update.event)
+        self._api_client.state_writes.mark_dirty(self)
 
     def determine_new_state(self, event: Event) -> None:
         """Determine the new state of the sensor based on the event."""
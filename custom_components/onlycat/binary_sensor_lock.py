@@ -3,23 +3,31 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
-from .data.event import Event, EventUpdate
 
 _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
     from .api import OnlyCatApiClient
-    from .data.device import Device
+    from .data.device import Device, DeviceUpdate
+    from .data.event import Event
+    from .data.lifecycle import EventTransition
+    from .data.policy import DeviceTransitPolicyUpdate
 
 ENTITY_DESCRIPTION = BinarySensorEntityDescription(
     key="OnlyCat",
@@ -52,38 +60,93 @@ class OnlyCatLockSensor(BinarySensorEntity):
         """Initialize the sensor class."""
         self.entity_description = ENTITY_DESCRIPTION
         self.device: Device = device
-        self._current_event: Event = Event()
         self._attr_is_on = self.device.is_unlocked_in_idle_state()
         self._attr_unique_id = device.device_id.replace("-", "_").lower() + "_lock"
         self._api_client = api_client
         self.entity_id = "sensor." + self._attr_unique_id
+        self._cancel_policy_timer: Callable[[], None] | None = None
+
+        self._event_lifecycle = api_client.event_lifecycle(self.device.device_id)
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for updates and schedule the first policy change once added."""
+        self.async_on_remove(self._event_lifecycle.subscribe(self.on_event_transition))
+        for event, handler in (
+            ("deviceUpdate", self.on_device_update),
+            ("policyUpdate", self.on_policy_update),
+        ):
+            self.async_on_remove(
+                self._api_client.add_event_listener(
+                    event, handler, device_id=self.device.device_id, ordered=True
+                )
+            )
+        self._schedule_policy_change()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the policy change timer."""
+        if self._cancel_policy_timer:
+            self._cancel_policy_timer()
+            self._cancel_policy_timer = None
+
+    async def on_event_transition(
+        self,
+        transition: EventTransition,  # noqa: ARG002
+        event: Event,
+    ) -> None:
+        """Handle a transition of the ongoing event."""
+        self.determine_new_state(event)
+        self._api_client.state_writes.mark_dirty(self)
 
-        api_client.add_event_listener("deviceEventUpdate", self.on_event_update)
-        api_client.add_event_listener("eventUpdate", self.on_event_update)
-        api_client.add_event_listener("deviceUpdate", self.on_device_update)
+    async def on_device_update(self, update: DeviceUpdate) -> None:  # noqa: ARG002
+        """Handle device update event."""
+        self._attr_is_on = self.device.is_unlocked_in_idle_state()
+        self._schedule_policy_change()
+        self._api_client.state_writes.mark_dirty(self)
 
-    async def on_event_update(self, data: dict) -> None:
-        """Handle event update event."""
-        if data["deviceId"] != self.device.device_id:
+    async def on_policy_update(self, update: DeviceTransitPolicyUpdate) -> None:
+        """Handle policy update event."""
+        if update.device_transit_policy_id != self.device.device_transit_policy_id:
             return
-
-        self._current_event.update_from(EventUpdate.from_api_response(data).event)
-        self.determine_new_state(self._current_event)
+        self._schedule_policy_change()
+        self._api_client.state_writes.mark_dirty(self)
+
+    @callback
+    def _on_policy_change(self, _now: datetime) -> None:
+        """Re-evaluate an ongoing event once the active policy rules changed."""
+        self._cancel_policy_timer = None
+        if self._event_lifecycle.event is not None:
+            self.determine_new_state(self._event_lifecycle.event)
+        self._schedule_policy_change()
         self.async_write_ha_state()
 
-    async def on_device_update(self, data: dict) -> None:
-        """Handle device update event."""
-        if data["deviceId"] != self.device.device_id:
-            return
-
-        self._attr_is_on = self.device.is_unlocked_in_idle_state()
-        self.async_write_ha_state()
+    def _schedule_policy_change(self) -> None:
+        """Schedule a single timer for the next change of the active rules."""
+        if self._cancel_policy_timer:
+            self._cancel_policy_timer()
+            self._cancel_policy_timer = None
+
+        policy = self.device.device_transit_policy
+        attributes: dict[str, Any] = {}
+        if policy and policy.transit_policy and self.hass:
+            schedule = policy.transit_policy.schedule
+            now = dt_util.utcnow()
+            local = now.astimezone(self.device.time_zone)
+            attributes["active_rules"] = [
+                rule.description
+                for _, _, rule in schedule.rules_at(local.hour * 60 + local.minute)
+            ]
+            next_change = schedule.next_change(now, self.device.time_zone)
+            if next_change:
+                attributes["next_policy_change"] = next_change.isoformat()
+                self._cancel_policy_timer = async_track_point_in_utc_time(
+                    self.hass, self._on_policy_change, next_change
+                )
+        self._attr_extra_state_attributes = attributes
 
     def determine_new_state(self, event: Event) -> None:
         """Determine the new state of the sensor based on the event."""
         if event.frame_count:
             self._attr_is_on = self.device.is_unlocked_in_idle_state()
-            self._current_event = Event()
         else:
             unlocked = self.device.is_unlocked_by_event(event)
             if unlocked is not None:
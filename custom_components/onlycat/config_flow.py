@@ -8,7 +8,6 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_ACCESS_TOKEN
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import (
     OnlyCatApiClient,
@@ -17,6 +16,7 @@ from .api import (
     OnlyCatApiClientError,
 )
 from .const import DOMAIN, LOGGER
+from .registry import async_get_client_registry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,21 +33,13 @@ class OnlyCatFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle a flow initialized by the user."""
         _errors = {}
         if user_input is not None:
+            # Reuses the connection of an entry with the same token, if any.
+            registry = async_get_client_registry(self.hass)
+            token = user_input[CONF_ACCESS_TOKEN]
+            client = registry.acquire(token, self.flow_id)
             try:
-                _LOGGER.debug("Initializing API client")
-                client = OnlyCatApiClient(
-                    user_input[CONF_ACCESS_TOKEN],
-                    session=async_create_clientsession(self.hass),
-                )
-                user_id = None
-
-                async def on_user_update(data: any) -> None:
-                    nonlocal user_id
-                    if data is not None and "id" in data:
-                        user_id = str(data["id"])
-
-                client.add_event_listener("userUpdate", on_user_update)
                 await self._validate_connection(client)
+                user_id = client.user_id
             except OnlyCatApiClientAuthenticationError as exception:
                 LOGGER.warning(exception)
                 _errors["base"] = "auth"
@@ -63,12 +55,14 @@ class OnlyCatFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 self._abort_if_unique_id_configured()
                 return_data = {
                     "user_id": user_id,
-                    "token": user_input[CONF_ACCESS_TOKEN],
+                    "token": token,
                 }
                 return self.async_create_entry(
                     title=user_id,
                     data=return_data,
                 )
+            finally:
+                await registry.async_release(token, self.flow_id)
 
         return self.async_show_form(
             step_id="user",
@@ -93,4 +87,3 @@ class OnlyCatFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Validate connection."""
         await client.connect()
         await client.send_message("getDevices", {"subscribe": False})
-        await client.disconnect()
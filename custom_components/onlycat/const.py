@@ -6,3 +6,30 @@ LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "onlycat"
 ATTRIBUTION = ""
+
+# Listeners of a socket event run concurrently, apart from those registered as
+# ordered. Each listener is cancelled after LISTENER_TIMEOUT seconds.
+MAX_CONCURRENT_LISTENERS = 10
+LISTENER_TIMEOUT = 30
+
+# Maximum number of requests in flight while loading devices and pets at setup.
+STARTUP_CONCURRENCY = 5
+
+# Maximum number of devices subscribed to at once when subscriptions are
+# refreshed, and seconds a burst of userUpdate events is collapsed into one refresh.
+SUBSCRIPTION_CONCURRENCY = 10
+USER_UPDATE_DEBOUNCE_COOLDOWN = 2
+
+# Seconds within which further state writes caused by event updates are
+# collapsed into one trailing write per entity. The first write of a burst of
+# partial updates isn't delayed.
+STATE_WRITE_WINDOW = 0.5
+
+# Seconds an RFID profile (i.e. the label of a pet) is cached.
+RFID_PROFILE_TTL = 3600
+
+# Number of events kept in the in-memory history of each device.
+EVENT_HISTORY_SIZE = 50_000
+
+# Seconds between attempts to reconcile a restored snapshot with the gateway.
+SNAPSHOT_RECONCILE_RETRY_INTERVAL = 30
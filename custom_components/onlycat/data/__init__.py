@@ -3,15 +3,18 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
 
     from custom_components.onlycat.api import OnlyCatApiClient
+    from custom_components.onlycat.snapshot import OnlyCatSnapshotStore
 
     from .device import Device
+    from .history import EventHistory
     from .pet import Pet
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,3 +30,6 @@ class OnlyCatData:
     client: OnlyCatApiClient
     devices: list[Device]
     pets: list[Pet]
+    snapshot: OnlyCatSnapshotStore | None = None
+    stats: Counter[str] = field(default_factory=Counter)
+    history: dict[str, EventHistory] = field(default_factory=dict)
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import logging
+import sys
 import zoneinfo
-from dataclasses import dataclass, fields
+from dataclasses import dataclass
 from datetime import UTC, datetime, tzinfo
 from typing import TYPE_CHECKING
 
 from .event import EventTriggerSource
+from .merge import merge_function
 from .pet import PolicyResult
 from .type import Type
 
@@ -19,7 +21,7 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeviceConnectivity:
     """Data representing the connectivity of an OnlyCat device."""
 
@@ -41,8 +43,16 @@ class DeviceConnectivity:
             ),
         )
 
+    def to_dict(self) -> dict:
+        """Convert the connectivity back to its API representation."""
+        return {
+            "connected": self.connected,
+            "disconnectReason": self.disconnect_reason,
+            "timestamp": round(self.timestamp.timestamp() * 1000),
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class Device:
     """Data representing an OnlyCat device."""
 
@@ -64,9 +74,14 @@ class Device:
 
     @classmethod
     def from_api_response(
-        cls, api_device: dict, device_id: str | None = None
+        cls, api_device: dict, device_id: str | None = None, *, partial: bool = False
     ) -> Device | None:
-        """Create a Device instance from API response data."""
+        """
+        Create a Device instance from API response data.
+
+        A partial device only carries the fields present in the data, fields
+        with defaults (i.e. the time zone) are left empty if they are missing.
+        """
         if api_device is None:
             return None
         timezone_str = api_device.get("timeZone")
@@ -77,12 +92,12 @@ class Device:
                 _LOGGER.warning("Unable to parse timezone: %s", timezone_str)
                 timezone = UTC
         else:
-            timezone = UTC
+            timezone = None if partial else UTC
         device_id = api_device.get("deviceId", device_id)
         if device_id is None:
             return None
         return cls(
-            device_id=device_id,
+            device_id=sys.intern(device_id),
             connectivity=DeviceConnectivity.from_api_response(
                 api_device.get("connectivity")
             ),
@@ -91,15 +106,19 @@ class Device:
             device_transit_policy_id=api_device.get("deviceTransitPolicyId"),
         )
 
-    def update_from(self, updated_device: Device) -> None:
-        """Update the device with data from another Device instance."""
-        if updated_device is None:
-            return
+    def to_dict(self) -> dict:
+        """Convert the device back to its API representation."""
+        return {
+            "deviceId": self.device_id,
+            "description": self.description,
+            "timeZone": str(self.time_zone) if self.time_zone else None,
+            "deviceTransitPolicyId": self.device_transit_policy_id,
+            "connectivity": self.connectivity.to_dict() if self.connectivity else None,
+        }
 
-        for field in fields(self):
-            new_value = getattr(updated_device, field.name, None)
-            if new_value is not None:
-                setattr(self, field.name, new_value)
+    def update_from(self, updated_device: Device) -> None:
+        """Update the device with the fields of another device that are not None."""
+        _merge_device(self, updated_device)
 
     def is_unlocked_in_idle_state(self) -> bool | None:
         """Check if the device is unlocked in idle state."""
@@ -124,7 +143,10 @@ class Device:
         return None
 
 
-@dataclass
+_merge_device = merge_function(Device)
+
+
+@dataclass(frozen=True, slots=True)
 class DeviceUpdate:
     """Data representing an update to a device."""
 
@@ -138,9 +160,21 @@ class DeviceUpdate:
         if api_event is None:
             return None
         return cls(
-            device_id=api_event["deviceId"],
+            device_id=sys.intern(api_event["deviceId"]),
             type=Type(api_event["type"]) if api_event.get("type") else Type.UNKNOWN,
             body=Device.from_api_response(
-                api_event.get("body"), device_id=api_event["deviceId"]
+                api_event.get("body"), device_id=api_event["deviceId"], partial=True
             ),
         )
+
+    def is_complete(self) -> bool:
+        """Check whether the update carries data that can be applied directly."""
+        return self.body is not None and any(
+            value is not None
+            for value in (
+                self.body.connectivity,
+                self.body.description,
+                self.body.time_zone,
+                self.body.device_transit_policy_id,
+            )
+        )
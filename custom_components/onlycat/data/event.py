@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass, fields
+import sys
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
+from .merge import merge_function
 from .type import Type
 
 _LOGGER = logging.getLogger(__name__)
@@ -45,7 +47,7 @@ class EventClassification(Enum):
         return cls.UNKNOWN
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Data representing an OnlyCat flap event."""
 
@@ -66,12 +68,13 @@ class Event:
         if not api_event:
             return None
         timestamp = api_event.get("timestamp")
+        device_id = api_event.get("deviceId")
         trigger_source = api_event.get("eventTriggerSource")
         classification = api_event.get("eventClassification")
 
         return cls(
             global_id=api_event.get("globalId"),
-            device_id=api_event.get("deviceId"),
+            device_id=sys.intern(device_id) if device_id else device_id,
             event_id=api_event.get("eventId"),
             timestamp=datetime.fromisoformat(timestamp) if timestamp else None,
             frame_count=api_event.get("frameCount"),
@@ -83,21 +86,37 @@ class Event:
             else None,
             poster_frame_index=api_event.get("posterFrameIndex"),
             access_token=api_event.get("accessToken"),
-            rfid_codes=api_event.get("rfidCodes", []),
+            rfid_codes=[sys.intern(code) for code in api_event.get("rfidCodes") or []],
         )
 
+    def to_dict(self) -> dict:
+        """Convert the event back to its API representation."""
+        return {
+            "globalId": self.global_id,
+            "deviceId": self.device_id,
+            "eventId": self.event_id,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "frameCount": self.frame_count,
+            "eventTriggerSource": self.event_trigger_source.value
+            if self.event_trigger_source
+            else None,
+            "eventClassification": self.event_classification.value
+            if self.event_classification
+            else None,
+            "posterFrameIndex": self.poster_frame_index,
+            "accessToken": self.access_token,
+            "rfidCodes": self.rfid_codes,
+        }
+
     def update_from(self, updated_event: Event) -> None:
-        """Update the event with data from another event instance."""
-        if updated_event is None:
-            return
+        """Update the event with the fields of another event that are not None."""
+        _merge_event(self, updated_event)
+
 
-        for field in fields(self):
-            new_value = getattr(updated_event, field.name, None)
-            if new_value is not None:
-                setattr(self, field.name, new_value)
+_merge_event = merge_function(Event)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EventUpdate:
     """Data representing an update to an OnlyCat flap event."""
 
@@ -118,7 +137,7 @@ class EventUpdate:
         if event.event_id is None:
             event.event_id = event_id
         return cls(
-            device_id=device_id,
+            device_id=sys.intern(device_id),
             event_id=event_id,
             type=event_type,
             event=event,
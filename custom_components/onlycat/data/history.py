@@ -0,0 +1,265 @@
+"""Columnar in-memory history of the flap events of an OnlyCat device."""
+
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .event import Event, EventClassification, EventTriggerSource
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .event import EventUpdate
+
+_LOGGER = logging.getLogger(__name__)
+
+# Enum members are stored as their position in the enum, None as NO_VALUE.
+NO_VALUE = 255
+TRIGGER_SOURCES = tuple(EventTriggerSource)
+CLASSIFICATIONS = tuple(EventClassification)
+TRIGGER_SOURCE_CODES = {source: code for code, source in enumerate(TRIGGER_SOURCES)}
+CLASSIFICATION_CODES = {
+    classification: code for code, classification in enumerate(CLASSIFICATIONS)
+}
+
+NO_TIMESTAMP = np.iinfo(np.int64).min
+# RFID codes are interned per device into the bits of a uint64 mask. Beyond
+# that, the code seen least recently is evicted from the history.
+MAX_RFID_CODES = 64
+# Rows allocated at first, doubled whenever they are used up until capacity.
+INITIAL_ROWS = 64
+# The columns of the history and their values in rows without an event.
+EMPTY_ROW = {
+    "event_ids": 0,
+    "timestamps": NO_TIMESTAMP,
+    "trigger_sources": NO_VALUE,
+    "classifications": NO_VALUE,
+    "rfid_masks": 0,
+}
+
+
+class EventHistory:
+    """
+    Bounded history of the events of a device, stored column-wise.
+
+    Events are kept in a ring buffer of NumPy arrays, which grow as events are
+    added until they hold capacity events. From then on memory stays flat and
+    the oldest events are overwritten. Updates to an event already in the
+    history are merged into its row.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty history holding up to capacity events."""
+        self.capacity = capacity
+        rows = min(capacity, INITIAL_ROWS)
+        self.event_ids = np.zeros(rows, dtype=np.int64)
+        # Milliseconds since the epoch, NO_TIMESTAMP if not known yet.
+        self.timestamps = np.full(rows, NO_TIMESTAMP, dtype=np.int64)
+        self.trigger_sources = np.full(rows, NO_VALUE, dtype=np.uint8)
+        self.classifications = np.full(rows, NO_VALUE, dtype=np.uint8)
+        self.rfid_masks = np.zeros(rows, dtype=np.uint64)
+        self.rfid_codes: list[str] = []
+        self._rfid_indices: dict[str, int] = {}
+        # When each interned RFID code was last added, by index.
+        self._rfid_last_added: list[int] = []
+        self._additions = 0
+        self._rows: dict[int, int] = {}
+        self._next_row = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of events in the history."""
+        return self._size
+
+    def add_update(self, update: EventUpdate) -> None:
+        """Append the event of an update, or merge it into a known event."""
+        self.add_event(update.event)
+
+    def add_event(self, event: Event) -> None:
+        """Append an event, or merge it into the row of a known event."""
+        if event.event_id is None:
+            return
+        row = self._rows.get(event.event_id)
+        if row is None:
+            row = self._append(event.event_id)
+
+        if event.timestamp is not None:
+            self.timestamps[row] = int(event.timestamp.timestamp() * 1000)
+        if event.event_trigger_source is not None:
+            self.trigger_sources[row] = TRIGGER_SOURCE_CODES[event.event_trigger_source]
+        if event.event_classification is not None:
+            self.classifications[row] = CLASSIFICATION_CODES[event.event_classification]
+        if event.rfid_codes:
+            self.rfid_masks[row] |= self.rfid_mask(event.rfid_codes)
+
+    def add_events(self, events: Iterable[Event]) -> None:
+        """
+        Add several events, e.g. from getDeviceEvents.
+
+        New events older than the newest one in the history, e.g. fetched while
+        later events arrived over the socket, are merged in by event ID.
+        """
+        new_events = []
+        for event in events:
+            if event.event_id in self._rows:
+                self.add_event(event)
+            elif event.event_id is not None:
+                new_events.append(event)
+        new_events.sort(key=lambda event: event.event_id)
+        if self._size and new_events and new_events[0].event_id < self._newest_id():
+            new_events = sorted(
+                [self.event_at(row) for row in self._rows_in_order()] + new_events,
+                key=lambda event: event.event_id,
+            )
+            self._rows.clear()
+            self._next_row = 0
+            self._size = 0
+        for event in new_events[-self.capacity :]:
+            self.add_event(event)
+
+    def _newest_id(self) -> int:
+        """Return the ID of the event added last."""
+        return int(self.event_ids[(self._next_row - 1) % self.capacity])
+
+    def _append(self, event_id: int) -> int:
+        """Claim the next row of the ring buffer for a new event."""
+        row = self._next_row
+        if self._size == self.capacity:
+            del self._rows[int(self.event_ids[row])]
+        else:
+            if self._size == len(self.event_ids):
+                self._grow()
+            self._size += 1
+        self._next_row = (row + 1) % self.capacity
+
+        self.event_ids[row] = event_id
+        self.timestamps[row] = NO_TIMESTAMP
+        self.trigger_sources[row] = NO_VALUE
+        self.classifications[row] = NO_VALUE
+        self.rfid_masks[row] = 0
+        self._rows[event_id] = row
+        return row
+
+    def _grow(self) -> None:
+        """Double the rows of the columns, up to capacity."""
+        rows = min(len(self.event_ids) * 2, self.capacity)
+        for name, empty in EMPTY_ROW.items():
+            column = getattr(self, name)
+            grown = np.full(rows, empty, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def rfid_mask(self, rfid_codes: Iterable[str], *, intern: bool = True) -> np.uint64:
+        """Return the mask of the given RFID codes, interning unknown codes."""
+        mask = 0
+        if intern:
+            self._additions += 1
+        for rfid_code in rfid_codes:
+            index = self._rfid_indices.get(rfid_code)
+            if index is None and intern:
+                index = self._intern(rfid_code)
+            if index is not None:
+                if intern:
+                    self._rfid_last_added[index] = self._additions
+                mask |= 1 << index
+        return np.uint64(mask)
+
+    def _intern(self, rfid_code: str) -> int:
+        """Assign a bit to an RFID code, evicting the code added least recently."""
+        if len(self.rfid_codes) < MAX_RFID_CODES:
+            index = len(self.rfid_codes)
+            self.rfid_codes.append(rfid_code)
+            self._rfid_last_added.append(self._additions)
+        else:
+            index = self._rfid_last_added.index(min(self._rfid_last_added))
+            evicted = self.rfid_codes[index]
+            _LOGGER.debug("Evicting RFID code %s from the history", evicted)
+            del self._rfid_indices[evicted]
+            self.rfid_masks &= ~np.uint64(1 << index)
+            self.rfid_codes[index] = rfid_code
+        self._rfid_indices[rfid_code] = index
+        return index
+
+    def select(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        *,
+        trigger_sources: Iterable[EventTriggerSource] | None = None,
+        classifications: Iterable[EventClassification] | None = None,
+        rfid_codes: Iterable[str] | None = None,
+    ) -> np.ndarray:
+        """
+        Return the rows of the events matching all filters, oldest first.
+
+        start is inclusive and end exclusive. Events of unknown time only match
+        if neither is given. rfid_codes matches events with any of the codes.
+        """
+        rows = self._rows_in_order()
+        selected = np.ones(len(rows), dtype=bool)
+        timestamps = self.timestamps[rows]
+        if start is not None:
+            selected &= timestamps >= int(start.timestamp() * 1000)
+        if end is not None:
+            selected &= (timestamps < int(end.timestamp() * 1000)) & (
+                timestamps != NO_TIMESTAMP
+            )
+        if trigger_sources is not None:
+            codes = [TRIGGER_SOURCE_CODES[source] for source in trigger_sources]
+            selected &= np.isin(self.trigger_sources[rows], codes)
+        if classifications is not None:
+            codes = [CLASSIFICATION_CODES[cls] for cls in classifications]
+            selected &= np.isin(self.classifications[rows], codes)
+        if rfid_codes is not None:
+            mask = self.rfid_mask(rfid_codes, intern=False)
+            selected &= (self.rfid_masks[rows] & mask) != 0
+        return rows[selected]
+
+    def count(self, *args: datetime | None, **filters: Any) -> int:
+        """Return the number of events matching the filters of select."""
+        return len(self.select(*args, **filters))
+
+    def events(self, *args: datetime | None, **filters: Any) -> list[Event]:
+        """Return the events matching the filters of select, oldest first."""
+        return [self.event_at(row) for row in self.select(*args, **filters)]
+
+    def last_seen(self, rfid_code: str) -> datetime | None:
+        """Return the time of the latest event with the RFID code."""
+        rows = self.select(rfid_codes=[rfid_code])
+        timestamps = self.timestamps[rows]
+        timestamps = timestamps[timestamps != NO_TIMESTAMP]
+        if not len(timestamps):
+            return None
+        return datetime.fromtimestamp(timestamps.max() / 1000, tz=UTC)
+
+    def event_at(self, row: int) -> Event:
+        """Rebuild the event stored in a row."""
+        timestamp = int(self.timestamps[row])
+        trigger_source = int(self.trigger_sources[row])
+        classification = int(self.classifications[row])
+        mask = int(self.rfid_masks[row])
+        return Event(
+            event_id=int(self.event_ids[row]),
+            timestamp=datetime.fromtimestamp(timestamp / 1000, tz=UTC)
+            if timestamp != NO_TIMESTAMP
+            else None,
+            event_trigger_source=TRIGGER_SOURCES[trigger_source]
+            if trigger_source != NO_VALUE
+            else None,
+            event_classification=CLASSIFICATIONS[classification]
+            if classification != NO_VALUE
+            else None,
+            rfid_codes=[
+                code for index, code in enumerate(self.rfid_codes) if mask >> index & 1
+            ],
+        )
+
+    def _rows_in_order(self) -> np.ndarray:
+        """Return the rows in use, from the oldest to the newest event."""
+        if self._size < self.capacity:
+            return np.arange(self._size)
+        return np.roll(np.arange(self.capacity), -self._next_row)
@@ -0,0 +1,122 @@
+"""Lifecycle of the flap event in progress on an OnlyCat device."""
+
+from __future__ import annotations
+
+import logging
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from .event import Event
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+    from .event import EventUpdate
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EventTransition(Enum):
+    """Transitions of a flap event through its lifecycle."""
+
+    STARTED = "started"
+    CLASSIFIED = "classified"
+    TRIGGER_CHANGED = "trigger_changed"
+    RFID_IDENTIFIED = "rfid_identified"
+    CONCLUDED = "concluded"
+
+
+type TransitionListener = Callable[[EventTransition, Event], Awaitable[None]]
+
+
+class EventLifecycle:
+    """
+    The flap event in progress on a device, shared by all of its entities.
+
+    An event is opened by the first update of a new event ID, merged with every
+    further update and closed once its frame count arrives. Entities subscribe
+    to the transitions they act on instead of each merging their own copy.
+    """
+
+    def __init__(self, device_id: str) -> None:
+        """Initialize the lifecycle of the events of a device."""
+        self.device_id = device_id
+        self.event: Event | None = None
+        self._concluded_event_id: int | None = None
+        self._listeners: list[
+            tuple[TransitionListener, frozenset[EventTransition]]
+        ] = []
+
+    def subscribe(
+        self,
+        callback: TransitionListener,
+        transitions: Iterable[EventTransition] | None = None,
+    ) -> Callable[[], None]:
+        """
+        Subscribe to the given transitions, or to all of them.
+
+        The callback receives the transition and the merged event. Returns a
+        callable removing the subscription again.
+        """
+        subscription = (callback, frozenset(transitions or EventTransition))
+        self._listeners.append(subscription)
+
+        def unsubscribe() -> None:
+            if subscription in self._listeners:
+                self._listeners.remove(subscription)
+
+        return unsubscribe
+
+    async def on_event_update(self, update: EventUpdate) -> None:
+        """Merge an update into the event in progress and publish its transitions."""
+        transitions = self.apply(update.event)
+        event = self.event
+        for transition in transitions:
+            for callback, subscribed in list(self._listeners):
+                if transition not in subscribed:
+                    continue
+                try:
+                    await callback(transition, event)
+                except Exception:
+                    _LOGGER.exception(
+                        "Error while handling %s of event %s", transition, event
+                    )
+        if EventTransition.CONCLUDED in transitions:
+            self.event = None
+
+    def apply(self, update: Event) -> list[EventTransition]:
+        """Merge an update into the event in progress and return its transitions."""
+        if update.event_id is not None and update.event_id == self._concluded_event_id:
+            _LOGGER.debug("Ignoring update of concluded event %s", update.event_id)
+            return []
+
+        transitions = []
+        event = self.event
+        if event is None or (
+            update.event_id is not None and update.event_id != event.event_id
+        ):
+            event = self.event = Event(device_id=self.device_id)
+            transitions.append(EventTransition.STARTED)
+
+        classification = event.event_classification
+        trigger_source = event.event_trigger_source
+        rfid_codes = event.rfid_codes or []
+        event.update_from(update)
+        # Updates only carry the RFID codes they add, keep the known ones.
+        new_codes = [code for code in update.rfid_codes or () if code not in rfid_codes]
+        event.rfid_codes = [*rfid_codes, *new_codes]
+
+        if event.event_classification != classification:
+            transitions.append(EventTransition.CLASSIFIED)
+        # The trigger source an event starts with is part of STARTED.
+        if (
+            event.event_trigger_source != trigger_source
+            and EventTransition.STARTED not in transitions
+        ):
+            transitions.append(EventTransition.TRIGGER_CHANGED)
+        if new_codes:
+            transitions.append(EventTransition.RFID_IDENTIFIED)
+        if update.frame_count:
+            self._concluded_event_id = event.event_id
+            transitions.append(EventTransition.CONCLUDED)
+        return transitions
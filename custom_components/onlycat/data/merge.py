@@ -0,0 +1,39 @@
+"""Generated merge functions for partial updates of the onlycat data types."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def merge_function(cls: type) -> Callable[[Any, Any], None]:
+    """
+    Generate a function merging one instance of a dataclass into another.
+
+    Fields of the update that are None are treated as not present and keep
+    their current value. The function is generated once per class with an
+    unrolled check per field, like dataclasses generates __init__, so that
+    merges don't look up the fields and their values reflectively.
+    """
+    lines = [
+        "def merge(target, update):",
+        "    if update is None:",
+        "        return",
+    ]
+    for field in fields(cls):
+        lines += [
+            f"    value = update.{field.name}",
+            "    if value is not None:",
+            f"        target.{field.name} = value",
+        ]
+    namespace: dict[str, Any] = {}
+    exec("\n".join(lines), namespace)  # noqa: S102
+    merge = namespace["merge"]
+    merge.__qualname__ = f"{cls.__qualname__}.merge"
+    return merge
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import sys
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -18,7 +19,7 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Pet:
     """Data representing a pet."""
 
@@ -28,6 +29,22 @@ class Pet:
     last_seen_event: Event | None = None
     label: str | None = None
 
+    def __post_init__(self) -> None:
+        """Share the RFID code string with the events carrying it."""
+        self.rfid_code = sys.intern(self.rfid_code)
+
+    def to_dict(self) -> dict:
+        """Convert the pet to a dictionary, referencing its device by ID."""
+        return {
+            "deviceId": self.device.device_id,
+            "rfidCode": self.rfid_code,
+            "timestamp": self.last_seen.isoformat(),
+            "label": self.label,
+            "lastSeenEvent": self.last_seen_event.to_dict()
+            if self.last_seen_event
+            else None,
+        }
+
     def is_present(self, event: Event) -> bool | None:
         """Determine whether a pet is present based on an event."""
         pet_name = self.label if self.label else self.rfid_code
@@ -4,12 +4,15 @@ from __future__ import annotations
 
 import json
 import logging
-from dataclasses import dataclass
-from datetime import datetime, timedelta, tzinfo
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta, tzinfo
 from enum import Enum, StrEnum
 from typing import TYPE_CHECKING
 
 from .event import Event, EventClassification, EventTriggerSource
+from .type import Type
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -18,6 +21,9 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+MINUTES_PER_DAY = 24 * 60
+ALL_MINUTES = (1 << MINUTES_PER_DAY) - 1
+
 
 def map_api_list_or_obj(api_obj: list | object, mapper: Callable) -> list | None:
     """Map a single object or list of objects from the API using the mapper function."""
@@ -57,7 +63,7 @@ class SoundAction(StrEnum):
         return cls.UNKNOWN
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RuleAction:
     """Data representing an action in a transit policy rule."""
 
@@ -86,7 +92,7 @@ class RuleAction:
         return d
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TimeRange:
     """Data representing a range of time when a rule criteria is active."""
 
@@ -134,8 +140,17 @@ class TimeRange:
 
         return start_time <= event_time <= end_time
 
+    def minute_mask(self) -> int:
+        """Return a bitmask with a bit set for every minute of the day covered."""
+        start = self.start_hour * 60 + self.start_minute
+        end = self.end_hour * 60 + self.end_minute
+        if start <= end:
+            return ((1 << (end - start + 1)) - 1) << start
+        # Overnight ranges (e.g., 22:00-02:00) cover the end and start of the day.
+        return ((1 << (MINUTES_PER_DAY - start)) - 1) << start | (1 << (end + 1)) - 1
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RuleCriteria:
     """Data representing criteria for a rule in a transit policy."""
 
@@ -160,7 +175,7 @@ class RuleCriteria:
         time_range = map_api_list_or_obj(
             api_criteria.get("timeRange"), lambda x: TimeRange.from_api_response(x)
         )
-        rfid_code = map_api_list_or_obj(api_criteria.get("rfidCode"), lambda x: x)
+        rfid_code = map_api_list_or_obj(api_criteria.get("rfidCode"), sys.intern)
 
         return cls(
             event_trigger_sources=trigger_source,
@@ -218,7 +233,178 @@ class RuleCriteria:
         )
 
 
-@dataclass
+# Bits enum members are represented by in compiled criteria, None matches nothing.
+TRIGGER_SOURCE_BITS = {
+    source: 1 << bit for bit, source in enumerate(EventTriggerSource)
+}
+CLASSIFICATION_BITS = {
+    classification: 1 << bit for bit, classification in enumerate(EventClassification)
+}
+
+
+def enum_mask(members: list[Enum] | None, bits: dict[Enum, int]) -> int | None:
+    """Combine the bits of the given enum members, None if there are none."""
+    if not members:
+        return None
+    mask = 0
+    for member in members:
+        mask |= bits[member]
+    return mask
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRuleCriteria:
+    """RuleCriteria compiled into bitmasks and sets for fast matching."""
+
+    trigger_sources: int | None
+    classifications: int | None
+    rfid_codes: frozenset[str] | None
+    minutes: int | None
+
+    @classmethod
+    def from_criteria(cls, criteria: RuleCriteria) -> CompiledRuleCriteria:
+        """Compile the given criteria, empty criteria match everything."""
+        minutes = None
+        if criteria.time_ranges:
+            minutes = 0
+            for time_range in criteria.time_ranges:
+                minutes |= time_range.minute_mask()
+
+        return cls(
+            trigger_sources=enum_mask(
+                criteria.event_trigger_sources, TRIGGER_SOURCE_BITS
+            ),
+            classifications=enum_mask(
+                criteria.event_classifications, CLASSIFICATION_BITS
+            ),
+            rfid_codes=frozenset(criteria.rfid_codes) if criteria.rfid_codes else None,
+            minutes=minutes,
+        )
+
+    def matches(self, event: Event, timezone: tzinfo) -> bool:
+        """Check if the event matches the compiled criteria."""
+        return self.matches_attributes(
+            TRIGGER_SOURCE_BITS.get(event.event_trigger_source, 0),
+            CLASSIFICATION_BITS.get(event.event_classification, 0),
+            event.rfid_codes,
+        ) and (
+            self.minutes is None
+            or self.covers_minute(local_minute_of_day(event, timezone))
+        )
+
+    def matches_attributes(
+        self, trigger_source: int, classification: int, rfid_codes: list[str] | None
+    ) -> bool:
+        """Check if the bits and RFID codes of an event match the criteria."""
+        return (
+            (self.trigger_sources is None or self.trigger_sources & trigger_source)
+            and (self.classifications is None or self.classifications & classification)
+            and (
+                self.rfid_codes is None
+                or not self.rfid_codes.isdisjoint(rfid_codes or ())
+            )
+        )
+
+    def covers_minute(self, minute_of_day: int) -> bool:
+        """Check if the time ranges cover the given minute of the day."""
+        return self.minutes is None or bool(self.minutes >> minute_of_day & 1)
+
+
+def local_minute_of_day(event: Event, timezone: tzinfo) -> int:
+    """Return the minute of the day the event happened at in the given timezone."""
+    event_time = event.timestamp.astimezone(timezone)
+    return event_time.hour * 60 + event_time.minute
+
+
+# A compiled rule: its criteria, the result if it matches and the original rule.
+CompiledRule = tuple[CompiledRuleCriteria, PolicyResult, "Rule"]
+
+
+@dataclass(frozen=True, slots=True)
+class PolicySchedule:
+    """
+    Rules of a transit policy split into segments of the day.
+
+    rules holds all compiled rules in order, boundaries the sorted minutes of
+    the day at which the set of rules active by their time ranges changes and
+    segments[i] the rules active from boundaries[i] up to the next boundary.
+    The last segment wraps around midnight up to the first boundary.
+    """
+
+    rules: tuple[CompiledRule, ...]
+    boundaries: tuple[int, ...]
+    segments: tuple[tuple[CompiledRule, ...], ...]
+
+    @classmethod
+    def from_compiled_rules(cls, rules: tuple[CompiledRule, ...]) -> PolicySchedule:
+        """Build the schedule of the given compiled rules, keeping their order."""
+        changes = 0
+        for criteria, _, _ in rules:
+            if criteria.minutes is not None:
+                # Bit m of the rotated mask is bit m - 1 of the original one.
+                rotated = criteria.minutes << 1 | criteria.minutes >> (
+                    MINUTES_PER_DAY - 1
+                )
+                changes |= criteria.minutes ^ (rotated & ALL_MINUTES)
+        boundaries = tuple(
+            minute for minute in range(MINUTES_PER_DAY) if changes >> minute & 1
+        )
+
+        return cls(
+            rules=rules,
+            boundaries=boundaries,
+            segments=tuple(
+                tuple(rule for rule in rules if rule[0].covers_minute(start))
+                for start in boundaries or (0,)
+            ),
+        )
+
+    def rules_at(self, minute_of_day: int) -> tuple[CompiledRule, ...]:
+        """Return the rules active at the given minute of the day."""
+        if not self.boundaries:
+            return self.segments[0]
+        return self.segments[bisect_right(self.boundaries, minute_of_day) - 1]
+
+    def next_change(self, now: datetime, timezone: tzinfo) -> datetime | None:
+        """
+        Return the next time the active rules may change, in UTC.
+
+        When the UTC offset of the timezone changes first, the time of that
+        change is returned, as the boundaries are in wall-clock time and may
+        be skipped or repeated by it.
+        """
+        if not self.boundaries:
+            return None
+
+        local = now.astimezone(timezone)
+        index = bisect_right(self.boundaries, local.hour * 60 + local.minute)
+        # Wrap around to the first boundary of the next day, keeping the fold
+        # while inside the hour repeated when DST ends otherwise.
+        days = index == len(self.boundaries)
+        boundary = self.boundaries[0 if days else index]
+        candidate = local.replace(
+            hour=boundary // 60, minute=boundary % 60, second=0, microsecond=0
+        )
+        if days:
+            candidate += timedelta(days=1)
+        next_change = candidate.astimezone(UTC)
+
+        offset = local.utcoffset()
+        if next_change.astimezone(timezone).utcoffset() == offset:
+            return next_change
+
+        # Find the offset change by bisection, down to the second.
+        low, high = now.astimezone(UTC), next_change
+        while high - low > timedelta(seconds=1):
+            middle = low + (high - low) / 2
+            if middle.astimezone(timezone).utcoffset() == offset:
+                low = middle
+            else:
+                high = middle
+        return high.replace(microsecond=0)
+
+
+@dataclass(frozen=True, slots=True)
 class Rule:
     """Data representing a rule in a transit policy."""
 
@@ -249,13 +435,32 @@ class Rule:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TransitPolicy:
     """Data representing a transit policy for an OnlyCat device."""
 
     rules: list[Rule]
     idle_lock: bool
     idle_lock_battery: bool
+    schedule: PolicySchedule = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Compile the rules once, so that events can be evaluated quickly.
+
+        Rules without criteria or without an action never decide an event.
+        """
+        self.schedule = PolicySchedule.from_compiled_rules(
+            tuple(
+                (
+                    CompiledRuleCriteria.from_criteria(rule.criteria),
+                    PolicyResult.LOCKED if rule.action.lock else PolicyResult.UNLOCKED,
+                    rule,
+                )
+                for rule in self.rules or ()
+                if rule.criteria and rule.action
+            )
+        )
 
     @classmethod
     def from_api_response(cls, api_policy: dict) -> TransitPolicy | None:
@@ -279,7 +484,7 @@ class TransitPolicy:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceTransitPolicy:
     """Data representing a transit policy for an OnlyCat device."""
 
@@ -297,7 +502,7 @@ class DeviceTransitPolicy:
 
         return cls(
             device_transit_policy_id=api_policy["deviceTransitPolicyId"],
-            device_id=api_policy["deviceId"],
+            device_id=sys.intern(api_policy["deviceId"]),
             name=api_policy.get("name"),
             transit_policy=TransitPolicy.from_api_response(
                 api_policy.get("transitPolicy")
@@ -321,22 +526,27 @@ class DeviceTransitPolicy:
             )
             return PolicyResult.UNKNOWN
 
-        if self.transit_policy.rules:
-            for rule in self.transit_policy.rules:
-                if not rule.criteria or not rule.criteria.matches(
-                    event, self.device.time_zone
-                ):
+        trigger_source = TRIGGER_SOURCE_BITS.get(event.event_trigger_source, 0)
+        classification = CLASSIFICATION_BITS.get(event.event_classification, 0)
+        # The local time is only needed once a rule with time ranges is reached.
+        minute_of_day = None
+        for criteria, result, rule in self.transit_policy.schedule.rules:
+            if not criteria.matches_attributes(
+                trigger_source, classification, event.rfid_codes
+            ):
+                continue
+            if criteria.minutes is not None:
+                if minute_of_day is None:
+                    minute_of_day = local_minute_of_day(event, self.device.time_zone)
+                if not criteria.covers_minute(minute_of_day):
                     continue
-                result = (
-                    PolicyResult.LOCKED if rule.action.lock else PolicyResult.UNLOCKED
-                )
-                _LOGGER.debug(
-                    "Rule %s matched for event %s, result is: %s",
-                    rule,
-                    event.event_id,
-                    result,
-                )
-                return result
+            _LOGGER.debug(
+                "Rule %s matched for event %s, result is: %s",
+                rule,
+                event.event_id,
+                result,
+            )
+            return result
 
         _LOGGER.debug(
             "No matching rules found for event %s, result is equal to idle lock: %s",
@@ -348,3 +558,34 @@ class DeviceTransitPolicy:
             if self.transit_policy.idle_lock
             else PolicyResult.UNLOCKED
         )
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceTransitPolicyUpdate:
+    """Data representing an update to a transit policy of a device."""
+
+    device_id: str
+    device_transit_policy_id: int
+    type: Type
+    body: DeviceTransitPolicy | None
+
+    @classmethod
+    def from_api_response(cls, api_update: dict) -> DeviceTransitPolicyUpdate | None:
+        """Create a DeviceTransitPolicyUpdate instance from API response data."""
+        if api_update is None:
+            return None
+        body = api_update.get("body") or {}
+        device_id = api_update.get("deviceId", body.get("deviceId"))
+        policy_id = api_update.get(
+            "deviceTransitPolicyId", body.get("deviceTransitPolicyId")
+        )
+        return cls(
+            device_id=device_id,
+            device_transit_policy_id=policy_id,
+            type=Type(api_update["type"]) if api_update.get("type") else Type.UNKNOWN,
+            body=DeviceTransitPolicy.from_api_response(
+                {**body, "deviceId": device_id, "deviceTransitPolicyId": policy_id}
+            )
+            if body
+            else None,
+        )
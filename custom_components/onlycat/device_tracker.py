@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.device_tracker import (
     SourceType,
@@ -12,9 +13,10 @@ from homeassistant.components.device_tracker import (
 )
 from homeassistant.const import STATE_HOME, STATE_NOT_HOME
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
-from .data.event import Event, EventUpdate
+from .data.lifecycle import EventTransition
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +27,8 @@ if TYPE_CHECKING:
     from .api import OnlyCatApiClient
     from .data import OnlyCatConfigEntry
     from .data.device import Device
+    from .data.event import Event
+    from .data.history import EventHistory
     from .data.pet import Pet
 
 ENTITY_DESCRIPTION = TrackerEntityDescription(
@@ -42,16 +46,75 @@ async def async_setup_entry(
 ) -> None:
     """Set up the tracker platform."""
     if entry.runtime_data.pets:
-        async_add_entities(
-            sensor
+        trackers = [
+            OnlyCatPetTracker(
+                pet=pet,
+                api_client=entry.runtime_data.client,
+                history=entry.runtime_data.history,
+            )
             for pet in entry.runtime_data.pets
-            for sensor in (
-                OnlyCatPetTracker(
-                    pet=pet,
-                    api_client=entry.runtime_data.client,
+        ]
+        index = PetTrackerIndex(trackers, entry.runtime_data.client)
+        entry.async_on_unload(index.unsubscribe)
+        async_add_entities(trackers)
+
+
+class PetTrackerIndex:
+    """
+    Index of the pet trackers of an account by device ID and RFID code.
+
+    The index follows the event lifecycle of each device with a tracker, and
+    only the trackers of the pets named in the event are updated once a pet is
+    identified, and again whenever the event is classified, its trigger source
+    changes or it concludes. Events without RFID codes touch no tracker.
+    """
+
+    def __init__(
+        self, trackers: list[OnlyCatPetTracker], api_client: OnlyCatApiClient
+    ) -> None:
+        """Initialize the index with the given trackers."""
+        self._api_client = api_client
+        self._trackers: dict[tuple[str, str], list[OnlyCatPetTracker]] = {}
+        for tracker in trackers:
+            self._trackers.setdefault(
+                (tracker.device.device_id, tracker.pet.rfid_code), []
+            ).append(tracker)
+        self._unsubscribes = [
+            api_client.event_lifecycle(device_id).subscribe(
+                self.on_event_transition,
+                (
+                    EventTransition.RFID_IDENTIFIED,
+                    EventTransition.CLASSIFIED,
+                    EventTransition.TRIGGER_CHANGED,
+                    EventTransition.CONCLUDED,
                 ),
             )
-        )
+            for device_id in {device_id for device_id, _ in self._trackers}
+        ]
+
+    def unsubscribe(self) -> None:
+        """Stop following the event lifecycles, e.g. when the entry is unloaded."""
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._unsubscribes.clear()
+
+    def trackers_for(self, device_id: str, event: Event) -> list[OnlyCatPetTracker]:
+        """Return the trackers of the pets named in an event of a device."""
+        return [
+            tracker
+            for rfid_code in event.rfid_codes or ()
+            for tracker in self._trackers.get((device_id, rfid_code), ())
+        ]
+
+    async def on_event_transition(
+        self,
+        transition: EventTransition,  # noqa: ARG002
+        event: Event,
+    ) -> None:
+        """Update the trackers of the pets named in the ongoing event."""
+        for tracker in self.trackers_for(event.device_id, event):
+            tracker.determine_new_state(event)
+            self._api_client.state_writes.mark_dirty(tracker)
 
 
 class OnlyCatPetTracker(TrackerEntity):
@@ -76,20 +139,17 @@ class OnlyCatPetTracker(TrackerEntity):
         if present is not None:
             self._attr_location_name = STATE_HOME if present else STATE_NOT_HOME
 
-        if event.frame_count:
-            self._current_event = Event()
-
     def __init__(
         self,
         pet: Pet,
         api_client: OnlyCatApiClient,
+        history: dict[str, EventHistory] | None = None,
     ) -> None:
-        """Initialize the sensor class."""
+        """Initialize the sensor class, with the event histories by device ID."""
         self.entity_description = ENTITY_DESCRIPTION
         self._attr_raw_data = None
         self.device: Device = pet.device
         self.pet: Pet = pet
-        self._current_event: Event = Event()
         self.pet_name = pet.label if pet.label is not None else pet.rfid_code
         self._attr_translation_placeholders = {
             "pet_name": self.pet_name,
@@ -101,22 +161,26 @@ class OnlyCatPetTracker(TrackerEntity):
             + "_tracker"
         )
         self._api_client = api_client
+        self._history = history if history is not None else {}
         self.entity_id = "sensor." + self._attr_unique_id
         self._attr_location_name = STATE_NOT_HOME
         if pet.last_seen_event:
             self.determine_new_state(pet.last_seen_event)
 
-        api_client.add_event_listener("deviceEventUpdate", self.on_event_update)
-        api_client.add_event_listener("eventUpdate", self.on_event_update)
-
-    async def on_event_update(self, data: dict) -> None:
-        """Handle event update event."""
-        if data["deviceId"] != self.device.device_id:
-            return
-
-        self._current_event.update_from(EventUpdate.from_api_response(data).event)
-        self.determine_new_state(self._current_event)
-        self.async_write_ha_state()
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return when the pet was last seen and in how many events of the day."""
+        last_seen = self.pet.last_seen
+        events_last_day = 0
+        history = self._history.get(self.device.device_id)
+        if history is not None:
+            seen = history.last_seen(self.pet.rfid_code)
+            if seen is not None and seen > last_seen:
+                last_seen = seen
+            events_last_day = history.count(
+                dt_util.utcnow() - timedelta(days=1), rfid_codes=[self.pet.rfid_code]
+            )
+        return {"last_seen": last_seen.isoformat(), "events_last_day": events_last_day}
 
     async def manual_update_location(self, location: str) -> None:
         """Manually override current state of a pets device tracker."""
@@ -0,0 +1,86 @@
+"""Registry of the OnlyCat API clients shared by config entries and flows."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import OnlyCatApiClient, RfidProfileCache
+from .const import (
+    DOMAIN,
+    LISTENER_TIMEOUT,
+    MAX_CONCURRENT_LISTENERS,
+    RFID_PROFILE_TTL,
+    STATE_WRITE_WINDOW,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OnlyCatClientRegistry:
+    """
+    API clients by token, reference counted by their owners.
+
+    Owners (config entries or config flows, by their ID) using the same token
+    share one client and thus one socket. The listeners an owner registered in
+    its namespace are removed when it releases the client, and the socket is
+    closed once the last owner released it. RFID profiles are cached per token
+    across clients, so they survive reloads.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty registry."""
+        self._hass = hass
+        self._clients: dict[str, OnlyCatApiClient] = {}
+        self._owners: dict[str, set[str]] = {}
+        self._rfid_profiles: dict[str, RfidProfileCache] = {}
+
+    def acquire(self, token: str, owner: str) -> OnlyCatApiClient:
+        """Return the client of a token for an owner, creating it if necessary."""
+        client = self._clients.get(token)
+        if client is None:
+            _LOGGER.debug("Creating API client for %s", owner)
+            client = OnlyCatApiClient(
+                token=token,
+                session=async_get_clientsession(self._hass),
+                concurrent_dispatch=True,
+                max_concurrent_listeners=MAX_CONCURRENT_LISTENERS,
+                listener_timeout=LISTENER_TIMEOUT,
+                rfid_profiles=self._rfid_profiles.setdefault(
+                    token, RfidProfileCache(ttl=RFID_PROFILE_TTL)
+                ),
+                state_write_window=STATE_WRITE_WINDOW,
+            )
+            self._clients[token] = client
+            self._owners[token] = set()
+        else:
+            _LOGGER.debug("Sharing API client with %s", owner)
+        self._owners[token].add(owner)
+        return client
+
+    async def async_release(self, token: str, owner: str) -> None:
+        """Release the client of an owner, disconnecting it if it was the last."""
+        client = self._clients.get(token)
+        if client is None or owner not in self._owners[token]:
+            return
+        client.remove_event_listeners(owner)
+        self._owners[token].discard(owner)
+        if self._owners[token]:
+            return
+        del self._clients[token]
+        del self._owners[token]
+        client.state_writes.cancel()
+        await client.disconnect()
+
+
+def async_get_client_registry(hass: HomeAssistant) -> OnlyCatClientRegistry:
+    """Return the client registry of Home Assistant, creating it if necessary."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if "clients" not in data:
+        data["clients"] = OnlyCatClientRegistry(hass)
+    return data["clients"]
@@ -13,7 +13,6 @@ from homeassistant.const import EntityCategory
 from homeassistant.helpers.device_registry import DeviceInfo
 
 from .const import DOMAIN
-from .data.device import DeviceUpdate
 from .data.policy import DeviceTransitPolicy
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,6 +23,8 @@ if TYPE_CHECKING:
 
     from .api import OnlyCatApiClient
     from .data import Device, OnlyCatConfigEntry
+    from .data.device import DeviceUpdate
+    from .data.policy import DeviceTransitPolicyUpdate
 
 ENTITY_DESCRIPTION = SelectEntityDescription(
     key="OnlyCat",
@@ -90,7 +91,25 @@ class OnlyCatPolicySelect(SelectEntity):
         self._policies = policies
         if device.device_transit_policy_id is not None:
             self.set_current_policy(device.device_transit_policy_id)
-        api_client.add_event_listener("deviceUpdate", self.on_device_update)
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for updates of the device and its policies once added."""
+        self.async_on_remove(
+            self._api_client.add_event_listener(
+                "deviceUpdate",
+                self.on_device_update,
+                device_id=self.device.device_id,
+                ordered=True,
+            )
+        )
+        self.async_on_remove(
+            self._api_client.add_event_listener(
+                "policyUpdate",
+                self.on_policy_update,
+                device_id=self.device.device_id,
+                ordered=True,
+            )
+        )
 
     def set_current_policy(self, policy_id: int) -> None:
         """Set the current policy."""
@@ -102,22 +121,26 @@ class OnlyCatPolicySelect(SelectEntity):
             p.name for p in self._policies if p.device_transit_policy_id == policy_id
         )
 
-    async def on_device_update(self, data: dict) -> None:
+    async def on_device_update(self, device_update: DeviceUpdate) -> None:
         """Handle device update event."""
-        if data["deviceId"] != self.device.device_id:
-            return
-
-        _LOGGER.debug("Device update event received for select: %s", data)
+        _LOGGER.debug("Device update event received for select: %s", device_update)
 
-        device_update = DeviceUpdate.from_api_response(data)
         if device_update.body.device_transit_policy_id:
-            # Reload policies in case a new policy got added in the meantime
-            # TODO: The next two lines can possibly be moved to a PoliciesUpdate event handler if such an event exists.
-            # Ask is currently out with OnlyCat about this.
+            # Reload policies in case activating an unknown policy synced new ones
             self._policies = self.device.device_transit_policies
             self._attr_options = [policy.name for policy in self._policies]
             self.set_current_policy(device_update.body.device_transit_policy_id)
-        self.async_write_ha_state()
+        self._api_client.state_writes.mark_dirty(self)
+
+    async def on_policy_update(self, policy_update: DeviceTransitPolicyUpdate) -> None:
+        """Handle policy update event."""
+        _LOGGER.debug("Policy update event received for select: %s", policy_update)
+
+        self._policies = self.device.device_transit_policies
+        self._attr_options = [policy.name for policy in self._policies]
+        if self.device.device_transit_policy_id is not None:
+            self.set_current_policy(self.device.device_transit_policy_id)
+        self._api_client.state_writes.mark_dirty(self)
 
     async def async_select_option(self, option: str) -> None:
         """Activate a device policy."""
@@ -13,10 +13,13 @@ from homeassistant.components.sensor import (
 from homeassistant.const import EntityCategory
 from homeassistant.helpers.device_registry import DeviceInfo
 
-from custom_components.onlycat.data.device import DeviceUpdate
-
 from .const import DOMAIN
 from .data.policy import DeviceTransitPolicy
+from .sensor_latency import (
+    ENTITY_DESCRIPTIONS,
+    OnlyCatConnectionRecoverySensor,
+    OnlyCatEventLatencySensor,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +29,8 @@ if TYPE_CHECKING:
 
     from .api import OnlyCatApiClient
     from .data import Device, OnlyCatConfigEntry
+    from .data.device import DeviceUpdate
+    from .data.policy import DeviceTransitPolicyUpdate
 
 ENTITY_DESCRIPTION = SensorEntityDescription(
     key="OnlyCat",
@@ -41,8 +46,18 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up OnlyCat policy sensors: one sensor per policy returned by the OnlyCat API."""
-    entities = []
+    entities = [
+        OnlyCatConnectionRecoverySensor(
+            entry_id=entry.entry_id, api_client=entry.runtime_data.client
+        )
+    ]
     for device in entry.runtime_data.devices:
+        entities.extend(
+            OnlyCatEventLatencySensor(
+                device=device, api_client=entry.runtime_data.client, kind=kind
+            )
+            for kind in ENTITY_DESCRIPTIONS
+        )
         policies = device.device_transit_policies
         for policy in policies:
             entities.append(
@@ -106,21 +121,48 @@ class OnlyCatTransitPolicyConfigSensor(SensorEntity):
         self.policy_id = device_transit_policy_id
         self._api_client = api_client
 
-        # TODO: When we hear back from OnlyCat about whether there is a policyUpdate event, we should add a listener here to refresh this components local list.
-        api_client.add_event_listener("deviceUpdate", self.on_device_update)
+    async def async_added_to_hass(self) -> None:
+        """Listen for updates of the device and its policies once added."""
+        self.async_on_remove(
+            self._api_client.add_event_listener(
+                "deviceUpdate",
+                self.on_device_update,
+                device_id=self.device.device_id,
+                ordered=True,
+            )
+        )
+        self.async_on_remove(
+            self._api_client.add_event_listener(
+                "policyUpdate",
+                self.on_policy_update,
+                device_id=self.device.device_id,
+                ordered=True,
+            )
+        )
 
 
-    async def on_device_update(self, data: dict) -> None:
+    async def on_device_update(self, device_update: DeviceUpdate) -> None:
         """Handle device update event."""
-        if data["deviceId"] != self.device.device_id:
-            return
-        
-        _LOGGER.debug("Device update event received for sensor: %s", data)
-        
-        device_update = DeviceUpdate.from_api_response(data)
+        _LOGGER.debug("Device update event received for sensor: %s", device_update)
+
         if device_update.body.device_transit_policy_id:
             self._attr_extra_state_attributes["currently_active"] = (
                 device_update.body.device_transit_policy_id == self.policy_id
             )
 
-        self.async_write_ha_state()
\ No newline at end of file
+        self._api_client.state_writes.mark_dirty(self)
+
+    async def on_policy_update(self, policy_update: DeviceTransitPolicyUpdate) -> None:
+        """Handle policy update event."""
+        if policy_update.device_transit_policy_id != self.policy_id:
+            return
+
+        _LOGGER.debug("Policy update event received for sensor: %s", policy_update)
+
+        # The policy object is updated in place by the integration.
+        self._attr_native_value = self.policy.name
+        self._attr_extra_state_attributes["policy_name"] = self.policy.name
+        self._attr_extra_state_attributes["policy_json"] = json.dumps(
+            self.policy.to_dict(), indent=2
+        )
+        self._api_client.state_writes.mark_dirty(self)
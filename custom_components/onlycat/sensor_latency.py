@@ -0,0 +1,141 @@
+"""Sensor platform for OnlyCat event latency diagnostics."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from .api import LatencyHistogram, OnlyCatApiClient
+    from .data.device import Device
+
+ENTITY_DESCRIPTIONS = {
+    "delivery": SensorEntityDescription(
+        key="delivery",
+        name="Event Delivery Latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        translation_key="onlycat_event_delivery_latency_sensor",
+    ),
+    "processing": SensorEntityDescription(
+        key="processing",
+        name="Event Processing Latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        translation_key="onlycat_event_processing_latency_sensor",
+    ),
+}
+
+RECOVERY_ENTITY_DESCRIPTION = SensorEntityDescription(
+    key="recovery",
+    name="Connection Recovery Time",
+    device_class=SensorDeviceClass.DURATION,
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    translation_key="onlycat_connection_recovery_sensor",
+)
+
+
+class OnlyCatEventLatencySensor(SensorEntity):
+    """
+    p95 latency of the events of a device, with p50 and p99 as attributes.
+
+    The delivery sensor covers the delay from the timestamp of an event until
+    it is received, the processing sensor from then until the state write. The
+    histograms are kept by the API client, so the sensor is polled.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = True
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info to map to a device."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.device.device_id)},
+            name=self.device.description,
+            serial_number=self.device.device_id,
+        )
+
+    def __init__(
+        self,
+        device: Device,
+        api_client: OnlyCatApiClient,
+        kind: str,
+    ) -> None:
+        """Initialize the sensor class for the delivery or processing latency."""
+        self.entity_description = ENTITY_DESCRIPTIONS[kind]
+        self.device: Device = device
+        self._kind = kind
+        self._attr_unique_id = (
+            device.device_id.replace("-", "_").lower() + f"_event_{kind}_latency"
+        )
+        self._api_client = api_client
+        self.entity_id = "sensor." + self._attr_unique_id
+
+    @property
+    def _histogram(self) -> LatencyHistogram:
+        """Return the histogram of the device this sensor reports."""
+        return getattr(
+            self._api_client.event_latency[self.device.device_id], self._kind
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the p95 latency in milliseconds."""
+        return self._histogram.summary()["p95"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the count, percentiles and maximum of the latency."""
+        attributes = self._histogram.summary()
+        if self._kind == "delivery":
+            skew = self._api_client.event_latency[self.device.device_id].skew
+            attributes["clock_skew"] = round(skew * 1000, 1)
+        return attributes
+
+
+class OnlyCatConnectionRecoverySensor(SensorEntity):
+    """
+    p95 time from losing the connection to the API until messages flow again.
+
+    The connection is shared by all devices, so there is one sensor per config
+    entry. Like the latency sensors, it is polled.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = True
+
+    def __init__(self, entry_id: str, api_client: OnlyCatApiClient) -> None:
+        """Initialize the sensor class."""
+        self.entity_description = RECOVERY_ENTITY_DESCRIPTION
+        self._attr_unique_id = f"{entry_id}_connection_recovery"
+        self._api_client = api_client
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the p95 recovery time in milliseconds."""
+        return self._api_client.recovery.summary()["p95"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the count, percentiles and maximum of the recovery time."""
+        return self._api_client.recovery.summary()
@@ -0,0 +1,137 @@
+"""Persistent snapshot of the OnlyCat runtime data for fast restarts."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .data.device import Device
+from .data.event import Event
+from .data.pet import Pet
+from .data.policy import DeviceTransitPolicy
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class OnlyCatSnapshotStore(Store[dict]):
+    """Store persisting the devices, policies and pets of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store for the given config entry."""
+        super().__init__(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,  # noqa: ARG002
+        old_data: dict,  # noqa: ARG002
+    ) -> dict:
+        """Discard snapshots of other versions, they are only a cache."""
+        _LOGGER.debug("Discarding snapshot of version %s", old_major_version)
+        return {}
+
+    async def async_load_data(self) -> tuple[list[Device], list[Pet]] | None:
+        """Load the devices and pets of the snapshot, if there is one."""
+        try:
+            snapshot = await self.async_load()
+        except Exception:
+            _LOGGER.exception("Unable to load snapshot, ignoring it")
+            return None
+        if not snapshot:
+            return None
+        return data_from_snapshot(snapshot)
+
+    async def async_save_data(self, devices: list[Device], pets: list[Pet]) -> None:
+        """Persist the devices and pets in a snapshot."""
+        await self.async_save(snapshot_from_data(devices, pets))
+
+
+def snapshot_from_data(devices: list[Device], pets: list[Pet]) -> dict[str, Any]:
+    """Serialize devices, their transit policies and pets into a snapshot."""
+    return {
+        "devices": [
+            {
+                **device.to_dict(),
+                "deviceTransitPolicies": [
+                    policy.to_dict() for policy in device.device_transit_policies
+                ]
+                if device.device_transit_policies is not None
+                else None,
+            }
+            for device in devices
+        ],
+        "pets": [_pet_snapshot(pet) for pet in pets],
+    }
+
+
+def _pet_snapshot(pet: Pet) -> dict[str, Any]:
+    """Serialize a pet, leaving out the access token of its last seen event."""
+    snapshot = pet.to_dict()
+    if snapshot["lastSeenEvent"] is not None:
+        snapshot["lastSeenEvent"] = {
+            key: value
+            for key, value in snapshot["lastSeenEvent"].items()
+            if key != "accessToken"
+        }
+    return snapshot
+
+
+def data_from_snapshot(snapshot: dict[str, Any]) -> tuple[list[Device], list[Pet]]:
+    """Restore devices, their transit policies and pets from a snapshot."""
+    devices: list[Device] = []
+    for api_device in snapshot["devices"]:
+        device = Device.from_api_response(api_device)
+        api_policies = api_device.get("deviceTransitPolicies")
+        if api_policies is not None:
+            device.device_transit_policies = []
+            for api_policy in api_policies:
+                policy = DeviceTransitPolicy.from_api_response(api_policy)
+                policy.device = device
+                device.device_transit_policies.append(policy)
+        devices.append(device)
+
+    devices_by_id = {device.device_id: device for device in devices}
+    pets = [
+        Pet(
+            devices_by_id[api_pet["deviceId"]],
+            api_pet["rfidCode"],
+            datetime.fromisoformat(api_pet["timestamp"]),
+            last_seen_event=Event.from_api_response(api_pet.get("lastSeenEvent")),
+            label=api_pet.get("label"),
+        )
+        for api_pet in snapshot["pets"]
+    ]
+    return devices, pets
+
+
+def snapshot_structure(snapshot: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the parts of a snapshot that entities are created from.
+
+    Connectivity is left out as it changes all the time and is pushed to the
+    entities through a deviceUpdate instead, as are when a pet was last seen
+    and in which event.
+    """
+    return {
+        "devices": [
+            {key: value for key, value in device.items() if key != "connectivity"}
+            for device in snapshot["devices"]
+        ],
+        "pets": [
+            {
+                key: value
+                for key, value in pet.items()
+                if key not in ("timestamp", "lastSeenEvent")
+            }
+            for pet in snapshot["pets"]
+        ],
+    }
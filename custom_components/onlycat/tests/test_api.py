@@ -0,0 +1,493 @@
+"""Tests for OnlyCat/api.py."""
+
+import asyncio
+import gc
+import random
+import tracemalloc
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from socketio.exceptions import BadNamespaceError
+from socketio.exceptions import TimeoutError as SocketIOTimeoutError
+
+from custom_components.onlycat import (
+    api,
+    binary_sensor,
+    device_tracker,
+    select,
+    sensor,
+)
+from custom_components.onlycat.api import (
+    LatencyHistogram,
+    OnlyCatApiClient,
+    OnlyCatApiClientCommunicationError,
+    RfidProfileCache,
+)
+from custom_components.onlycat.data import OnlyCatData
+from custom_components.onlycat.data.device import Device
+from custom_components.onlycat.data.event import EventUpdate
+from custom_components.onlycat.data.pet import Pet
+from custom_components.onlycat.data.policy import DeviceTransitPolicy
+
+event_update = {
+    "deviceId": "OC-00000000001",
+    "eventId": 1,
+    "type": "update",
+    "body": {"rfidCodes": ["000000000000001"]},
+}
+
+
+def create_client() -> OnlyCatApiClient:
+    """Create an API client with a mocked socket."""
+    return OnlyCatApiClient(token="", session=MagicMock(), socket=MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_handle_event_routes_by_device_and_rfid() -> None:
+    """Test that keyed listeners only receive messages they subscribed to."""
+    client = create_client()
+    unkeyed = AsyncMock()
+    same_device = AsyncMock()
+    other_device = AsyncMock()
+    same_rfid = AsyncMock()
+    other_rfid = AsyncMock()
+    client.add_event_listener("eventUpdate", unkeyed)
+    client.add_event_listener("eventUpdate", same_device, device_id="OC-00000000001")
+    client.add_event_listener("eventUpdate", other_device, device_id="OC-00000000002")
+    client.add_event_listener(
+        "eventUpdate",
+        same_rfid,
+        device_id="OC-00000000001",
+        rfid_code="000000000000001",
+    )
+    client.add_event_listener(
+        "eventUpdate",
+        other_rfid,
+        device_id="OC-00000000001",
+        rfid_code="000000000000002",
+    )
+
+    await client.handle_event("eventUpdate", event_update)
+
+    update = EventUpdate.from_api_response(event_update)
+    unkeyed.assert_awaited_once_with(update)
+    same_device.assert_awaited_once_with(update)
+    same_rfid.assert_awaited_once_with(update)
+    other_device.assert_not_awaited()
+    other_rfid.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_handle_event_decodes_once() -> None:
+    """Test that all listeners of a message share a single decoded update."""
+    client = create_client()
+    listeners = [AsyncMock() for _ in range(3)]
+    for listener in listeners:
+        client.add_event_listener("eventUpdate", listener, device_id="OC-00000000001")
+
+    await client.handle_event("eventUpdate", event_update)
+
+    updates = [listener.await_args.args[0] for listener in listeners]
+    assert isinstance(updates[0], EventUpdate)
+    assert all(update is updates[0] for update in updates)
+    assert client.stats["parses"] == 1
+    assert client.stats["parses_saved"] == len(listeners) - 1
+
+
+@pytest.mark.asyncio
+async def test_handle_event_ignores_empty_payloads() -> None:
+    """Test that messages without a payload reach no listener."""
+    client = create_client()
+    listener = AsyncMock()
+    client.add_event_listener("deviceUpdate", listener)
+
+    await client.handle_event("deviceUpdate", None)
+    await client.handle_event("deviceUpdate", {})
+
+    listener.assert_not_awaited()
+    assert client.stats["parses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dispatch() -> None:
+    """Test that slow ordered listeners don't hold up unordered ones."""
+    client = OnlyCatApiClient(
+        token="",
+        session=MagicMock(),
+        socket=MagicMock(),
+        concurrent_dispatch=True,
+        listener_timeout=0.2,
+    )
+    calls = []
+
+    async def slow_ordered(_update: EventUpdate) -> None:
+        await asyncio.sleep(0.05)
+        calls.append("slow_ordered")
+
+    async def next_ordered(_update: EventUpdate) -> None:
+        calls.append("next_ordered")
+
+    async def unordered(_update: EventUpdate) -> None:
+        calls.append("unordered")
+
+    async def hanging(_update: EventUpdate) -> None:
+        await asyncio.sleep(10)
+        calls.append("hanging")
+
+    client.add_event_listener("eventUpdate", slow_ordered, ordered=True)
+    client.add_event_listener("eventUpdate", next_ordered, ordered=True)
+    client.add_event_listener("eventUpdate", unordered)
+    client.add_event_listener("eventUpdate", hanging)
+
+    await client.handle_event("eventUpdate", event_update)
+
+    assert calls == ["unordered", "slow_ordered", "next_ordered"]
+    latency = client.listener_latency[hanging.__qualname__]
+    assert latency.count == 1
+    assert latency.max < 1
+
+
+def test_rfid_listener_requires_device() -> None:
+    """Test that RFID listeners must be bound to a device."""
+    client = create_client()
+    with pytest.raises(ValueError, match="device_id"):
+        client.add_event_listener("eventUpdate", AsyncMock(), rfid_code="1")
+
+
+@pytest.mark.asyncio
+async def test_rfid_profile_cache() -> None:
+    """Test that RFID profiles are fetched once and evicted in LRU order."""
+    client = create_client()
+    client.rfid_profiles = RfidProfileCache(max_size=2)
+    requested = []
+
+    async def send_message(_event: str, data: dict) -> dict:
+        requested.append(data["rfidCode"])
+        await asyncio.sleep(0.01)
+        return {"label": "Cat " + data["rfidCode"]}
+
+    client.send_message = send_message
+
+    labels = await asyncio.gather(
+        client.get_rfid_label("1"),
+        client.get_rfid_label("1"),
+        client.get_rfid_label("2"),
+    )
+    assert labels == ["Cat 1", "Cat 1", "Cat 2"]
+    assert await client.get_rfid_label("1") == "Cat 1"
+    assert await client.get_rfid_label("3") == "Cat 3"
+    assert await client.get_rfid_label("2") == "Cat 2"
+
+    assert requested == ["1", "2", "3", "2"]
+    assert client.rfid_profiles.stats == {
+        "misses": 4,
+        "coalesced": 1,
+        "hits": 1,
+        "evictions": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_rfid_profile_cache_skips_failed_lookups() -> None:
+    """Test that a lookup without a profile is retried by the next one."""
+    client = create_client()
+    client.send_message = AsyncMock(side_effect=[None, {"label": "Cat 1"}])
+
+    assert await client.get_rfid_label("1") is None
+    assert await client.get_rfid_label("1") == "Cat 1"
+    assert await client.get_rfid_label("1") == "Cat 1"
+    assert client.send_message.await_count == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_state_writes_are_coalesced() -> None:
+    """Test that entities are written once per message and per event burst."""
+    client = OnlyCatApiClient(
+        token="", session=MagicMock(), socket=MagicMock(), state_write_window=0.05
+    )
+    entity = MagicMock()
+
+    async def mark_dirty(_update: object) -> None:
+        client.state_writes.mark_dirty(entity)
+
+    client.add_event_listener("eventUpdate", mark_dirty)
+    client.add_event_listener("eventUpdate", mark_dirty)
+    client.add_event_listener("deviceUpdate", mark_dirty)
+
+    # The first update of a burst is written right away, the rest once.
+    await client.handle_event("eventUpdate", event_update)
+    entity.async_write_ha_state.assert_called_once()
+    await client.handle_event("eventUpdate", event_update)
+    await client.handle_event("eventUpdate", event_update)
+    entity.async_write_ha_state.assert_called_once()
+    await asyncio.sleep(0.1)
+    assert entity.async_write_ha_state.call_count == 2  # noqa: PLR2004
+
+    await client.handle_event("deviceUpdate", {"deviceId": "OC-00000000001"})
+    assert entity.async_write_ha_state.call_count == 3  # noqa: PLR2004
+    assert client.state_writes.stats == {"issued": 3, "suppressed": 4}
+
+
+@pytest.mark.asyncio
+async def test_state_writes_are_not_held_by_other_messages() -> None:
+    """Test that every message's writes are flushed when its own cycle ends."""
+    client = OnlyCatApiClient(
+        token="", session=MagicMock(), socket=MagicMock(), concurrent_dispatch=True
+    )
+    slow_entity = MagicMock()
+    entity = MagicMock()
+    release = asyncio.Event()
+
+    async def slow_listener(_update: object) -> None:
+        client.state_writes.mark_dirty(slow_entity)
+        await release.wait()
+
+    async def listener(_update: object) -> None:
+        client.state_writes.mark_dirty(entity)
+
+    client.add_event_listener("deviceUpdate", slow_listener)
+    client.add_event_listener("eventUpdate", listener)
+    client.add_event_listener("eventUpdate", listener)
+
+    slow = asyncio.create_task(
+        client.handle_event("deviceUpdate", {"deviceId": "OC-00000000001"})
+    )
+    await asyncio.sleep(0)
+    await client.handle_event("eventUpdate", event_update)
+    entity.async_write_ha_state.assert_called_once()
+    slow_entity.async_write_ha_state.assert_not_called()
+
+    release.set()
+    await slow
+    slow_entity.async_write_ha_state.assert_called_once()
+
+
+def test_latency_histogram_percentiles() -> None:
+    """Test that percentiles are within a bucket of the exact percentiles."""
+    rng = random.Random(0)  # noqa: S311
+    latencies = sorted(rng.lognormvariate(-2, 1.5) for _ in range(10000))
+    histogram = LatencyHistogram()
+    for latency in latencies:
+        histogram.record(latency)
+
+    for percent in (50, 95, 99, 100):
+        exact = latencies[round(percent / 100 * len(latencies)) - 1]
+        assert exact <= histogram.percentile(percent) <= exact * 1.1
+    assert LatencyHistogram().percentile(50) is None
+
+
+@pytest.mark.asyncio
+async def test_event_latency_is_recorded() -> None:
+    """Test that delivery is corrected for skew and processing ends at the write."""
+    client = create_client()
+    entity = MagicMock()
+    entity.device.device_id = "OC-00000000001"
+
+    async def mark_dirty(_update: object) -> None:
+        client.state_writes.mark_dirty(entity)
+
+    client.add_event_listener("deviceEventUpdate", mark_dirty)
+    now = datetime.now(UTC)
+    # The clock of the device runs a second ahead for the second event.
+    for event_id, timestamp in [
+        (1, now - timedelta(seconds=2)),
+        (2, now + timedelta(seconds=1)),
+    ]:
+        await client.handle_event(
+            "deviceEventUpdate",
+            {
+                "deviceId": "OC-00000000001",
+                "eventId": event_id,
+                "type": "create",
+                "body": {"eventId": event_id, "timestamp": timestamp.isoformat()},
+            },
+        )
+
+    latency = client.event_latency["OC-00000000001"]
+    assert latency.delivery.count == latency.processing.count == 2  # noqa: PLR2004
+    assert 0.99 < latency.skew < 1.1  # noqa: PLR2004
+    assert latency.delivery.percentile(100) > 2  # noqa: PLR2004
+    assert latency.processing.percentile(100) < 1
+
+
+@pytest.mark.asyncio
+async def test_send_message_coalesces_identical_reads() -> None:
+    """Test that concurrent identical reads share one request."""
+    client = create_client()
+    release = asyncio.Event()
+
+    async def call(_event: str, data: dict, **_kwargs: float) -> dict:
+        await release.wait()
+        return {"deviceId": data["deviceId"]}
+
+    client._socket.call = AsyncMock(side_effect=call)  # noqa: SLF001
+    requests = [
+        asyncio.create_task(client.send_message("getDevice", {"deviceId": "OC-1"}))
+        for _ in range(5)
+    ]
+    requests.append(
+        asyncio.create_task(client.send_message("getDevice", {"deviceId": "OC-2"}))
+    )
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*requests)
+
+    assert results[:5] == [{"deviceId": "OC-1"}] * 5
+    assert results[5] == {"deviceId": "OC-2"}
+    assert client._socket.call.await_count == 2  # noqa: PLR2004, SLF001
+    assert client.stats["rpc_coalesced"] == 4  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_send_message_retries_reads_only() -> None:
+    """Test that failed reads are retried and commands are not."""
+    client = OnlyCatApiClient(
+        token="", session=MagicMock(), socket=MagicMock(), rpc_retry_backoff=0
+    )
+    client._socket.call = AsyncMock(  # noqa: SLF001
+        side_effect=[SocketIOTimeoutError(), BadNamespaceError(), {"devices": []}]
+    )
+    assert await client.send_message("getDevices", {}) == {"devices": []}
+    assert client.stats["rpc_retries"] == 2  # noqa: PLR2004
+
+    client._socket.call = AsyncMock(side_effect=SocketIOTimeoutError())  # noqa: SLF001
+    with pytest.raises(OnlyCatApiClientCommunicationError):
+        await client.send_message(
+            "runDeviceCommand", {"deviceId": "OC-1", "command": "unlock"}
+        )
+    client._socket.call.assert_awaited_once()  # noqa: SLF001
+
+    client._socket.call.reset_mock()  # noqa: SLF001
+    with pytest.raises(OnlyCatApiClientCommunicationError):
+        await client.send_message("getDevices", {})
+    assert client._socket.call.await_count == 3  # noqa: PLR2004, SLF001
+
+
+@pytest.mark.asyncio
+async def test_recovery_is_recorded_after_resubscribing() -> None:
+    """Test that recovery lasts until the first message after resubscribing."""
+    client = create_client()
+    client._socket.disconnect = AsyncMock()  # noqa: SLF001
+    client._socket.shutdown = AsyncMock()  # noqa: SLF001
+
+    async def resubscribe_and_update(*_: object) -> None:
+        await client.handle_event("userUpdate", {})
+
+    resubscribe = AsyncMock(side_effect=resubscribe_and_update)
+    client.add_event_listener("connect", resubscribe)
+
+    await client._on_socket_disconnect("transport error")  # noqa: SLF001
+    await client._on_socket_connect()  # noqa: SLF001
+    resubscribe.assert_awaited_once()
+    assert client.recovery.count == 0
+
+    await client.handle_event("userUpdate", {})
+    await client.handle_event("userUpdate", {})
+    assert client.recovery.count == 1
+
+    # Disconnecting on purpose is no outage.
+    await client.disconnect()
+    await client._on_socket_disconnect("client disconnect")  # noqa: SLF001
+    await client._on_socket_connect()  # noqa: SLF001
+    await client.handle_event("userUpdate", {})
+    assert client.recovery.count == 1
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_liveness_probe_drops_half_open_socket(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that an unanswered probe aborts the transport and reconnects."""
+    monkeypatch.setattr(api, "LIVENESS_INTERVAL", 0.01)
+    client = create_client()
+    client._socket.call = AsyncMock(side_effect=SocketIOTimeoutError())  # noqa: SLF001
+    client._socket.eio.disconnect = AsyncMock()  # noqa: SLF001
+    client._socket.connected = False  # noqa: SLF001
+    client._socket.connect = AsyncMock()  # noqa: SLF001
+
+    await client._on_socket_connect()  # noqa: SLF001
+    await asyncio.sleep(0.05)
+
+    client._socket.eio.disconnect.assert_awaited_once_with(abort=True)  # noqa: SLF001
+    assert client._socket.connect.call_args.kwargs["retry"]  # noqa: SLF001
+    assert client.stats["liveness_failures"] == 1
+
+
+class FakeEntry:
+    """The part of a config entry the platforms use."""
+
+    def __init__(self, runtime_data: OnlyCatData) -> None:
+        """Initialize the entry."""
+        self.entry_id = "entry"
+        self.runtime_data = runtime_data
+        self._on_unload: list = []
+
+    def async_on_unload(self, func: object) -> None:
+        """Register a callback to run on unload."""
+        self._on_unload.append(func)
+
+    def unload(self) -> None:
+        """Run the unload callbacks."""
+        while self._on_unload:
+            self._on_unload.pop()()
+
+
+@pytest.mark.asyncio
+async def test_listeners_are_released_across_reloads() -> None:
+    """Test that listener count and memory stay flat across 100 reloads."""
+    client = create_client()
+    device = Device.from_api_response(
+        {
+            "deviceId": "OC-00000000001",
+            "description": "Device Name",
+            "timeZone": "Europe/Zurich",
+            "deviceTransitPolicyId": 1,
+            "connectivity": {"connected": True, "timestamp": 1743841488269},
+        }
+    )
+    device.device_transit_policies = [
+        DeviceTransitPolicy.from_api_response(
+            {"deviceTransitPolicyId": 1, "deviceId": "OC-00000000001", "name": "Day"}
+        )
+    ]
+    pet = Pet(device, "000000000000001", last_seen=datetime.now(UTC))
+    device_update = {
+        "deviceId": "OC-00000000001",
+        "type": "update",
+        "body": {"connectivity": {"connected": False, "timestamp": 1743841488270}},
+    }
+
+    async def reload() -> int:
+        entry = FakeEntry(OnlyCatData(client=client, devices=[device], pets=[pet]))
+        entities: list = []
+        for platform in (binary_sensor, device_tracker, select, sensor):
+            await platform.async_setup_entry(None, entry, entities.extend)
+        for entity in entities:
+            await entity.async_added_to_hass()
+        await client.handle_event("deviceUpdate", device_update)
+        listeners = client.listener_count
+        for entity in entities:
+            entity._call_on_remove_callbacks()  # noqa: SLF001
+        entry.unload()
+        return listeners
+
+    tracemalloc.start()
+    try:
+        for _ in range(10):
+            listeners = await reload()
+        # Event lifecycles stay registered once per device.
+        baseline = client.listener_count
+        gc.collect()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(100):
+            assert await reload() == listeners
+            assert client.listener_count == baseline
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert listeners > baseline
+    assert after - before < 64 * 1024
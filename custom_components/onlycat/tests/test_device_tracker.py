@@ -0,0 +1,96 @@
+"""Tests for OnlyCat/device_tracker.py."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.onlycat.api import OnlyCatApiClient
+from custom_components.onlycat.data.device import Device
+from custom_components.onlycat.data.event import Event, EventTriggerSource
+from custom_components.onlycat.data.history import EventHistory
+from custom_components.onlycat.data.pet import Pet
+from custom_components.onlycat.device_tracker import (
+    OnlyCatPetTracker,
+    PetTrackerIndex,
+)
+
+
+def create_tracker(device_id: str, rfid_code: str) -> MagicMock:
+    """Create a mocked tracker of a pet."""
+    tracker = MagicMock()
+    tracker.device.device_id = device_id
+    tracker.pet.rfid_code = rfid_code
+    return tracker
+
+
+def create_client() -> OnlyCatApiClient:
+    """Create an API client with a mocked socket."""
+    return OnlyCatApiClient(token="", session=MagicMock(), socket=MagicMock())
+
+
+def event_update(body: dict) -> dict:
+    """Create an update of event 1 of device OC-00000000001."""
+    return {"deviceId": "OC-00000000001", "eventId": 1, "type": "update", "body": body}
+
+
+@pytest.mark.asyncio
+async def test_index_updates_named_trackers_only() -> None:
+    """Test that only trackers of pets named in an event are updated."""
+    named = create_tracker("OC-00000000001", "000000000000001")
+    other_pet = create_tracker("OC-00000000001", "000000000000002")
+    other_device = create_tracker("OC-00000000002", "000000000000001")
+    client = create_client()
+    PetTrackerIndex([named, other_pet, other_device], client)
+    # The merged event is updated further, so record it when called.
+    seen = []
+    named.determine_new_state.side_effect = lambda event: seen.append(
+        (event.event_id, event.event_trigger_source)
+    )
+
+    await client.handle_event("eventUpdate", event_update({"eventTriggerSource": 3}))
+    await client.handle_event(
+        "eventUpdate", event_update({"rfidCodes": ["000000000000001"]})
+    )
+    # A changed trigger source and the conclusion re-evaluate the pet.
+    await client.handle_event("eventUpdate", event_update({"eventTriggerSource": 2}))
+    await client.handle_event("eventUpdate", event_update({"posterFrameIndex": 2}))
+    await client.handle_event("eventUpdate", event_update({"frameCount": 10}))
+
+    assert seen == [
+        (1, EventTriggerSource.OUTDOOR_MOTION),
+        (1, EventTriggerSource.INDOOR_MOTION),
+        (1, EventTriggerSource.INDOOR_MOTION),
+    ]
+    assert named.async_write_ha_state.call_count == len(seen)
+    other_pet.determine_new_state.assert_not_called()
+    other_device.determine_new_state.assert_not_called()
+
+
+def test_tracker_reports_sightings_from_history() -> None:
+    """Test that the tracker reports when the pet was seen since startup."""
+    # The history keeps milliseconds.
+    now = datetime.now(UTC).replace(microsecond=0)
+    device = Device(device_id="OC-00000000001")
+    pet = Pet(device, "000000000000001", now - timedelta(days=3))
+    history = EventHistory(100)
+    tracker = OnlyCatPetTracker(
+        pet, create_client(), history={"OC-00000000001": history}
+    )
+    assert tracker.extra_state_attributes == {
+        "last_seen": pet.last_seen.isoformat(),
+        "events_last_day": 0,
+    }
+
+    for event_id, hours in [(1, 30), (2, 2), (3, 1)]:
+        history.add_event(
+            Event(
+                event_id=event_id,
+                timestamp=now - timedelta(hours=hours),
+                rfid_codes=["000000000000001"],
+            )
+        )
+    assert tracker.extra_state_attributes == {
+        "last_seen": (now - timedelta(hours=1)).isoformat(),
+        "events_last_day": 2,
+    }
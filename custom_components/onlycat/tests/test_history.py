@@ -0,0 +1,128 @@
+"""Tests for OnlyCat/data/history.py."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.onlycat.data.event import (
+    Event,
+    EventClassification,
+    EventTriggerSource,
+    EventUpdate,
+)
+from custom_components.onlycat.data.history import EventHistory
+
+START = datetime(2025, 8, 1, tzinfo=UTC)
+
+
+def event(event_id: int, rfid_codes: list[str] | None = None) -> Event:
+    """Create an event, one minute after the previous one."""
+    return Event(
+        event_id=event_id,
+        timestamp=START + timedelta(minutes=event_id),
+        event_trigger_source=EventTriggerSource.OUTDOOR_MOTION
+        if event_id % 2
+        else EventTriggerSource.INDOOR_MOTION,
+        event_classification=EventClassification.CLEAR,
+        rfid_codes=rfid_codes or [],
+    )
+
+
+def test_history_merges_updates() -> None:
+    """Test that updates of a known event are merged into its row."""
+    history = EventHistory(10)
+    history.add_event(event(1))
+    history.add_update(
+        EventUpdate.from_api_response(
+            {
+                "deviceId": "OC-00000000001",
+                "eventId": 1,
+                "type": "update",
+                "body": {"eventClassification": 3, "rfidCodes": ["000000000000001"]},
+            }
+        )
+    )
+
+    assert len(history) == 1
+    [stored] = history.events()
+    assert stored.timestamp == START + timedelta(minutes=1)
+    assert stored.event_trigger_source == EventTriggerSource.OUTDOOR_MOTION
+    assert stored.event_classification == EventClassification.CONTRABAND
+    assert stored.rfid_codes == ["000000000000001"]
+
+
+def test_history_is_bounded() -> None:
+    """Test that the oldest events are overwritten once the history is full."""
+    history = EventHistory(100)
+    for event_id in range(1000):
+        history.add_event(event(event_id, [f"{event_id % 3:015d}"]))
+
+    assert len(history) == history.capacity
+    assert [stored.event_id for stored in history.events()] == list(range(900, 1000))
+    assert history.last_seen(f"{1:015d}") == START + timedelta(minutes=997)
+
+
+def test_history_merges_older_events_in_order() -> None:
+    """Test that fetched events older than live ones are merged by event ID."""
+    history = EventHistory(4)
+    history.add_event(event(5, ["000000000000001"]))
+    history.add_event(event(6))
+    # Listed newest first like getDeviceEvents, one of them already known.
+    history.add_events([event(6), event(4), event(2), event(1)])
+
+    assert [stored.event_id for stored in history.events()] == [2, 4, 5, 6]
+    assert history.last_seen("000000000000001") == START + timedelta(minutes=5)
+
+    history.add_event(event(7))
+    assert [stored.event_id for stored in history.events()] == [4, 5, 6, 7]
+
+
+def test_history_queries() -> None:
+    """Test range and filter queries."""
+    history = EventHistory(100)
+    events = 60
+    for event_id in range(events):
+        history.add_event(event(event_id, [f"{event_id % 3:015d}"]))
+
+    start, end = START + timedelta(minutes=10), START + timedelta(minutes=20)
+    assert history.count(start, end) == end.minute - start.minute
+    assert (
+        history.count(trigger_sources=[EventTriggerSource.OUTDOOR_MOTION])
+        == events // 2
+    )
+    assert history.count(classifications=[EventClassification.CONTRABAND]) == 0
+    assert history.count(rfid_codes=[f"{2:015d}"]) == events // 3
+    assert history.count(rfid_codes=["unknown"]) == 0
+    assert [
+        stored.event_id
+        for stored in history.events(
+            start,
+            end,
+            trigger_sources=[EventTriggerSource.OUTDOOR_MOTION],
+            rfid_codes=[f"{0:015d}", f"{1:015d}"],
+        )
+    ] == [13, 15, 19]
+
+
+def test_history_grows_lazily() -> None:
+    """Test that rows are allocated as events are added, up to the capacity."""
+    history = EventHistory(50_000)
+    assert len(history.event_ids) < 100  # noqa: PLR2004
+    for event_id in range(1000):
+        history.add_event(event(event_id))
+
+    assert len(history) == 1000  # noqa: PLR2004
+    assert len(history.event_ids) < 2000  # noqa: PLR2004
+    assert [stored.event_id for stored in history.events()] == list(range(1000))
+
+
+def test_history_evicts_rfid_codes() -> None:
+    """Test that the RFID code added least recently makes room for new codes."""
+    history = EventHistory(1000)
+    history.add_event(event(0, [f"{0:015d}"]))
+    for event_id in range(1, 100):
+        history.add_event(event(event_id, [f"{event_id:015d}", f"{0:015d}"]))
+
+    # Code 0 is still in use, the early codes after it were evicted.
+    assert history.count(rfid_codes=[f"{0:015d}"]) == 100  # noqa: PLR2004
+    assert history.count(rfid_codes=[f"{1:015d}"]) == 0
+    assert history.count(rfid_codes=[f"{99:015d}"]) == 1
+    assert len(history.rfid_codes) == 64  # noqa: PLR2004
@@ -1,11 +1,27 @@
 """Tests for OnlyCat/__init.py."""
 
+import asyncio
+from collections import Counter
 from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from custom_components.onlycat import _initialize_devices
+from custom_components.onlycat import (
+    Device,
+    DeviceUpdate,
+    _apply_device_update,
+    _event_history,
+    _fetch_pets,
+    _initialize_devices,
+    _initialize_pets,
+    _latest_event_by_rfid,
+    _retrieve_device_transit_policies,
+    _subscribe_to_device,
+)
+from custom_components.onlycat.api import OnlyCatApiClientCommunicationError
+from custom_components.onlycat.data.event import Event
+from custom_components.onlycat.data.policy import DeviceTransitPolicy
 
 get_devices = [
     # "Normal device"
@@ -134,3 +150,197 @@ async def test_initialize_devices() -> None:
         )
     assert mock_entry.runtime_data.devices[1].device_transit_policy_id is None
     assert mock_retrieve_device_transit_policies.call_count == 1
+
+
+get_last_seen_rfid_codes_by_device = {
+    "OC-00000000001": [
+        {"rfidCode": "000000000000001", "timestamp": "2025-08-01T10:00:00.000Z"},
+        {"rfidCode": "000000000000002", "timestamp": "2025-08-01T09:00:00.000Z"},
+    ],
+    "OC-00000000002": [
+        {"rfidCode": "000000000000003", "timestamp": "2025-08-01T08:00:00.000Z"},
+    ],
+}
+
+
+async def mock_send_message_delayed(topic: str, data: dict) -> Any | None:
+    """Mock of OnlyCatApiClient.send_message answering later requests first."""
+    if topic == "getDeviceEvents":
+        await asyncio.sleep(0.02 if data["deviceId"].endswith("1") else 0)
+        return []
+    if topic == "getLastSeenRfidCodesByDevice":
+        await asyncio.sleep(0.02 if data["deviceId"].endswith("1") else 0)
+        return get_last_seen_rfid_codes_by_device[data["deviceId"]]
+    return None
+
+
+async def mock_get_rfid_label(rfid_code: str) -> str:
+    """Mock of OnlyCatApiClient.get_rfid_label answering later requests first."""
+    await asyncio.sleep(0.01 * (3 - int(rfid_code[-1])))
+    return "Cat " + rfid_code[-1]
+
+
+@pytest.mark.asyncio
+async def test_initialize_pets_keeps_order() -> None:
+    """Test that concurrent requests in _initialize_pets keep a stable pet order."""
+    mock_entry = AsyncMock()
+    mock_entry.runtime_data.devices = [
+        Device(device_id="OC-00000000001"),
+        Device(device_id="OC-00000000002"),
+    ]
+    mock_entry.runtime_data.pets = []
+    mock_entry.runtime_data.history = {}
+    mock_entry.runtime_data.client = AsyncMock()
+    mock_entry.runtime_data.client.send_message.side_effect = mock_send_message_delayed
+    mock_entry.runtime_data.client.get_rfid_label.side_effect = mock_get_rfid_label
+
+    await _initialize_pets(mock_entry, concurrency=2)
+
+    assert [
+        (pet.device.device_id, pet.rfid_code, pet.label)
+        for pet in mock_entry.runtime_data.pets
+    ] == [
+        ("OC-00000000001", "000000000000001", "Cat 1"),
+        ("OC-00000000001", "000000000000002", "Cat 2"),
+        ("OC-00000000002", "000000000000003", "Cat 3"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fetch_pets_keeps_live_events_in_order() -> None:
+    """Test that events arriving while pets are fetched stay in event order."""
+    device = Device(device_id="OC-00000000001")
+    mock_entry = AsyncMock()
+    mock_entry.runtime_data.history = {}
+    history = _event_history(mock_entry, device.device_id)
+    history.add_event(Event(event_id=1))
+
+    async def send_message(topic: str, _data: dict) -> Any | None:
+        if topic == "getDeviceEvents":
+            # A new event arrives over the socket while the request is pending.
+            history.add_event(Event(event_id=4))
+            return [{"eventId": 3}, {"eventId": 2}, {"eventId": 1}]
+        return []
+
+    mock_entry.runtime_data.client = AsyncMock()
+    mock_entry.runtime_data.client.send_message.side_effect = send_message
+
+    await _fetch_pets(mock_entry, [device])
+
+    assert [event.event_id for event in history.events()] == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_device_transit_policies_is_incremental() -> None:
+    """Test that only policies unknown to the device are fetched."""
+    device = Device(device_id="OC-00000000001", device_transit_policy_id=1)
+    known_policy = DeviceTransitPolicy.from_api_response(get_device_transit_policy[0])
+    removed_policy = DeviceTransitPolicy(
+        device_transit_policy_id=2, device_id="OC-00000000001", name="Removed"
+    )
+    device.device_transit_policies = [known_policy, removed_policy]
+
+    async def send_message(topic: str, data: dict) -> Any | None:
+        if topic == "getDeviceTransitPolicies":
+            return [{"deviceTransitPolicyId": 0}, {"deviceTransitPolicyId": 1}]
+        if topic == "getDeviceTransitPolicy":
+            return {
+                **get_device_transit_policy[0],
+                "deviceTransitPolicyId": data["deviceTransitPolicyId"],
+                "name": "New",
+            }
+        return None
+
+    mock_entry = AsyncMock()
+    mock_entry.runtime_data.client = AsyncMock()
+    mock_entry.runtime_data.client.send_message.side_effect = send_message
+
+    await _retrieve_device_transit_policies(mock_entry, device)
+
+    mock_entry.runtime_data.client.send_message.assert_any_call(
+        "getDeviceTransitPolicy", {"deviceTransitPolicyId": 1}
+    )
+    mock_entry.runtime_data.client.send_message.assert_any_call(
+        "getDeviceTransitPolicies", {"deviceId": device.device_id}
+    )
+    assert mock_entry.runtime_data.client.send_message.await_count == len(
+        ["getDeviceTransitPolicies", "getDeviceTransitPolicy"]
+    )
+    assert device.device_transit_policies[0] is known_policy
+    assert removed_policy not in device.device_transit_policies
+    assert device.device_transit_policy.name == "New"
+    assert device.device_transit_policy.device is device
+
+
+@pytest.mark.asyncio
+async def test_apply_device_update_merges_body() -> None:
+    """Test that pushed device updates are merged without fetching the device."""
+    device = Device.from_api_response(get_device["OC-00000000002"])
+    time_zone = device.time_zone
+    mock_entry = AsyncMock()
+    mock_entry.runtime_data.devices = [device]
+    mock_entry.runtime_data.stats = Counter()
+    mock_entry.runtime_data.client = AsyncMock()
+    mock_entry.runtime_data.client.send_message.side_effect = mock_send_message
+
+    await _apply_device_update(
+        mock_entry, DeviceUpdate.from_api_response(device_update[0])
+    )
+
+    mock_entry.runtime_data.client.send_message.assert_not_called()
+    assert device.connectivity.connected is False
+    assert device.connectivity.disconnect_reason == "SERVER_INITIATED_DISCONNECT"
+    assert device.time_zone == time_zone
+    assert device.description == "Device Name"
+    assert mock_entry.runtime_data.stats == {"device_updates_merged": 1}
+
+
+@pytest.mark.asyncio
+async def test_apply_device_update_refetches_without_body() -> None:
+    """Test that device updates without usable body fall back to getDevice."""
+    device = Device(device_id="OC-00000000002")
+    mock_entry = AsyncMock()
+    mock_entry.runtime_data.devices = [device]
+    mock_entry.runtime_data.stats = Counter()
+    mock_entry.runtime_data.client = AsyncMock()
+    mock_entry.runtime_data.client.send_message.side_effect = mock_send_message
+
+    await _apply_device_update(
+        mock_entry,
+        DeviceUpdate.from_api_response(
+            {"deviceId": "OC-00000000002", "type": "update", "body": {}}
+        ),
+    )
+
+    mock_entry.runtime_data.client.send_message.assert_called_once_with(
+        "getDevice", {"deviceId": "OC-00000000002", "subscribe": True}
+    )
+    assert device.connectivity.connected is True
+    assert mock_entry.runtime_data.stats == {"device_updates_refetched": 1}
+
+
+@pytest.mark.asyncio
+async def test_subscribe_to_device_reports_failure() -> None:
+    """Test that failed subscriptions are reported instead of raised."""
+    device = Device.from_api_response(get_devices[0])
+    client = AsyncMock()
+    assert await _subscribe_to_device(client, device)
+    subscriptions = [call.args[0] for call in client.send_message.await_args_list]
+    assert sorted(subscriptions) == ["getDevice", "getDeviceEvents"]
+
+    client.send_message.side_effect = OnlyCatApiClientCommunicationError
+    assert not await _subscribe_to_device(client, device)
+
+
+def test_latest_event_by_rfid() -> None:
+    """Test that every RFID code maps to the first, i.e. latest, listed event."""
+    events = [
+        Event(event_id=3, rfid_codes=["000000000000001"]),
+        Event(event_id=2, rfid_codes=[]),
+        Event(event_id=1, rfid_codes=["000000000000001", "000000000000002"]),
+    ]
+    latest_events = _latest_event_by_rfid(events)
+    assert latest_events == {
+        "000000000000001": events[0],
+        "000000000000002": events[2],
+    }
@@ -0,0 +1,66 @@
+"""Tests for OnlyCat/data/lifecycle.py."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.onlycat.api import OnlyCatApiClient
+from custom_components.onlycat.data.event import EventClassification
+from custom_components.onlycat.data.lifecycle import EventTransition
+
+DEVICE_ID = "OC-00000000001"
+
+
+def event_update(event_id: int, body: dict) -> dict:
+    """Create an update of an event of device OC-00000000001."""
+    return {"deviceId": DEVICE_ID, "eventId": event_id, "type": "update", "body": body}
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_publishes_transitions() -> None:
+    """Test that updates are merged once and published as typed transitions."""
+    client = OnlyCatApiClient(token="", session=MagicMock(), socket=MagicMock())
+    lifecycle = client.event_lifecycle(DEVICE_ID)
+    assert client.event_lifecycle(DEVICE_ID) is lifecycle
+
+    seen = []
+
+    async def record(transition, event) -> None:  # noqa: ANN001
+        seen.append(
+            (transition, event.event_id, event.event_classification, event.rfid_codes)
+        )
+
+    lifecycle.subscribe(record)
+    concluded = []
+
+    async def record_concluded(_transition, event) -> None:  # noqa: ANN001
+        concluded.append(event.event_id)
+
+    lifecycle.subscribe(record_concluded, [EventTransition.CONCLUDED])
+
+    for event_id, body in [
+        (1, {"eventTriggerSource": 3, "rfidCodes": ["000000000000001"]}),
+        (1, {"posterFrameIndex": 2}),
+        (1, {"eventTriggerSource": 3}),
+        (1, {"eventTriggerSource": 2}),
+        (1, {"eventClassification": 3, "rfidCodes": []}),
+        (1, {"frameCount": 10}),
+        # Late updates of a concluded event don't reopen it.
+        (1, {"eventClassification": 1}),
+        (2, {"eventTriggerSource": 2}),
+    ]:
+        await client.handle_event("eventUpdate", event_update(event_id, body))
+
+    rfid_codes = ["000000000000001"]
+    contraband = EventClassification.CONTRABAND
+    assert seen == [
+        (EventTransition.STARTED, 1, EventClassification.UNKNOWN, rfid_codes),
+        (EventTransition.RFID_IDENTIFIED, 1, EventClassification.UNKNOWN, rfid_codes),
+        (EventTransition.TRIGGER_CHANGED, 1, EventClassification.UNKNOWN, rfid_codes),
+        (EventTransition.CLASSIFIED, 1, contraband, rfid_codes),
+        (EventTransition.CONCLUDED, 1, contraband, rfid_codes),
+        (EventTransition.STARTED, 2, EventClassification.UNKNOWN, []),
+    ]
+    assert concluded == [1]
+    assert lifecycle.event.event_id == 2  # noqa: PLR2004
+    assert lifecycle.event.device_id == DEVICE_ID
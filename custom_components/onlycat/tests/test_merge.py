@@ -0,0 +1,76 @@
+"""Tests for OnlyCat/data/merge.py."""
+
+import random
+from dataclasses import fields, replace
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from custom_components.onlycat.data.device import Device, DeviceConnectivity
+from custom_components.onlycat.data.event import (
+    Event,
+    EventClassification,
+    EventTriggerSource,
+)
+
+# Candidate values per field, None meaning the field is not present.
+EVENT_VALUES = {
+    "global_id": [1, 2],
+    "device_id": ["OC-00000000001"],
+    "event_id": [0, 1],
+    "timestamp": [datetime(2025, 8, 1, tzinfo=UTC)],
+    "frame_count": [0, 120],
+    "event_trigger_source": list(EventTriggerSource),
+    "event_classification": list(EventClassification),
+    "poster_frame_index": [0, 10],
+    "access_token": ["", "token"],
+    "rfid_codes": [[], ["000000000000001"]],
+}
+DEVICE_VALUES = {
+    "device_id": ["OC-00000000001", "OC-00000000002"],
+    "connectivity": [
+        DeviceConnectivity(
+            connected=True,
+            disconnect_reason="",
+            timestamp=datetime(2025, 8, 1, tzinfo=UTC) + timedelta(seconds=1),
+        )
+    ],
+    "description": ["", "Cat Flap"],
+    "time_zone": [UTC, ZoneInfo("Europe/Zurich")],
+    "device_transit_policy_id": [0, 1],
+    "device_transit_policies": [[]],
+}
+
+
+def reference_update_from(target: object, update: object) -> None:
+    """Merge like update_from did before it was generated."""
+    if update is None:
+        return
+    for field in fields(target):
+        new_value = getattr(update, field.name, None)
+        if new_value is not None:
+            setattr(target, field.name, new_value)
+
+
+def random_instance(rng: random.Random, cls: type, values: dict) -> object:
+    """Create an instance with a random subset of fields present."""
+    return cls(
+        **{name: rng.choice([None, *candidates]) for name, candidates in values.items()}
+    )
+
+
+def test_update_from_matches_reference() -> None:
+    """Test that the generated merges treat None as not present, as before."""
+    rng = random.Random(0)  # noqa: S311
+    for cls, values in [(Event, EVENT_VALUES), (Device, DEVICE_VALUES)]:
+        for _ in range(500):
+            target = random_instance(rng, cls, values)
+            update = random_instance(rng, cls, values)
+            expected = replace(target)
+            reference_update_from(expected, update)
+            target.update_from(update)
+            assert target == expected, (target, update)
+
+        target = random_instance(rng, cls, values)
+        expected = replace(target)
+        target.update_from(None)
+        assert target == expected
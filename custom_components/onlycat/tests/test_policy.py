@@ -0,0 +1,182 @@
+"""Tests for OnlyCat/data/policy.py."""
+
+import random
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from custom_components.onlycat.data.device import Device
+from custom_components.onlycat.data.event import (
+    Event,
+    EventClassification,
+    EventTriggerSource,
+)
+from custom_components.onlycat.data.policy import (
+    DeviceTransitPolicy,
+    PolicyResult,
+    PolicySchedule,
+    TimeRange,
+    TransitPolicy,
+)
+
+RFID_CODES = [f"{i:015d}" for i in range(8)]
+TIME_ZONES = ["Europe/Zurich", "America/New_York", "Australia/Sydney", "UTC"]
+
+
+def random_time_range(rng: random.Random) -> str:
+    """Create a time range, overnight ranges and single minutes included."""
+    start = rng.randrange(24 * 60)
+    end = rng.choice([start, rng.randrange(24 * 60)])
+    return f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}"
+
+
+def random_subset(rng: random.Random, values: list) -> list | object | None:
+    """Pick no criteria, a single value or a list of values like the API does."""
+    count = rng.randrange(3)
+    if count == 0:
+        return None
+    subset = rng.sample(values, count)
+    return subset[0] if count == 1 else subset
+
+
+def random_policy(rng: random.Random, rules: int) -> dict:
+    """Create a transit policy as returned by the API."""
+    return {
+        "idleLock": rng.random() < 0.5,  # noqa: PLR2004
+        "idleLockBattery": False,
+        "rules": [
+            {
+                # Rules without an action are skipped.
+                "action": rng.choice([{"lock": True}, {"lock": False}, None]),
+                "criteria": {
+                    key: value
+                    for key, value in {
+                        "eventTriggerSource": random_subset(
+                            rng, [source.value for source in EventTriggerSource]
+                        ),
+                        "eventClassification": random_subset(
+                            rng, [cls.value for cls in EventClassification]
+                        ),
+                        "rfidCode": random_subset(rng, RFID_CODES),
+                        "timeRange": [
+                            random_time_range(rng) for _ in range(rng.randrange(3))
+                        ]
+                        or None,
+                    }.items()
+                    if value is not None
+                },
+            }
+            for _ in range(rules)
+        ],
+    }
+
+
+def random_event(rng: random.Random) -> Event:
+    """Create an event at a random time, often on a minute boundary."""
+    timestamp = datetime(2025, 1, 1, tzinfo=UTC) + timedelta(
+        minutes=rng.randrange(365 * 24 * 60),
+        seconds=rng.choice([0, 59, rng.randrange(60)]),
+    )
+    return Event(
+        timestamp=timestamp,
+        event_trigger_source=rng.choice(list(EventTriggerSource)),
+        event_classification=rng.choice(list(EventClassification)),
+        rfid_codes=rng.sample(RFID_CODES, rng.randrange(3)),
+    )
+
+
+def reference_policy_result(policy: DeviceTransitPolicy, event: Event) -> PolicyResult:
+    """Evaluate the policy rule by rule using RuleCriteria.matches."""
+    for rule in policy.transit_policy.rules or []:
+        if rule.action is None:
+            continue
+        if rule.criteria and rule.criteria.matches(event, policy.device.time_zone):
+            return PolicyResult.LOCKED if rule.action.lock else PolicyResult.UNLOCKED
+    if policy.transit_policy.idle_lock:
+        return PolicyResult.LOCKED
+    return PolicyResult.UNLOCKED
+
+
+def test_compiled_policy_matches_reference() -> None:
+    """Test that the compiled evaluator agrees with the rule by rule evaluator."""
+    rng = random.Random(0)  # noqa: S311
+    for index in range(200):
+        device = Device(
+            device_id="OC-00000000001", time_zone=ZoneInfo(TIME_ZONES[index % 4])
+        )
+        policy = DeviceTransitPolicy(
+            device_transit_policy_id=index,
+            device_id=device.device_id,
+            transit_policy=TransitPolicy.from_api_response(
+                random_policy(rng, rng.randrange(6))
+            ),
+            device=device,
+        )
+        for _ in range(50):
+            event = random_event(rng)
+            assert policy.determine_policy_result(event) == reference_policy_result(
+                policy, event
+            ), (policy, event)
+
+
+def test_time_range_minute_mask() -> None:
+    """Test that minute masks cover the same minutes as contains_timestamp."""
+    day = datetime(2025, 3, 30, tzinfo=UTC)
+    for api_time_range in ["00:00-23:59", "08:30-08:30", "22:00-02:00", "12:00-11:59"]:
+        time_range = TimeRange.from_api_response(api_time_range)
+        mask = time_range.minute_mask()
+        for minute in range(24 * 60):
+            timestamp = day + timedelta(minutes=minute, seconds=30)
+            assert bool(mask >> minute & 1) == time_range.contains_timestamp(
+                timestamp, UTC
+            ), (api_time_range, minute)
+
+
+def schedule_of(*api_time_ranges: str) -> PolicySchedule:
+    """Create the schedule of a policy with a rule per time range."""
+    return TransitPolicy.from_api_response(
+        {
+            "idleLock": True,
+            "rules": [
+                {"action": {"lock": False}, "criteria": {"timeRange": time_range}}
+                for time_range in api_time_ranges
+            ],
+        }
+    ).schedule
+
+
+def test_schedule_segments() -> None:
+    """Test that the schedule knows which rules are active at any minute."""
+    schedule = schedule_of("22:00-02:00", "08:00-09:59")
+    assert schedule.boundaries == (2 * 60 + 1, 8 * 60, 10 * 60, 22 * 60)
+    active = [len(schedule.rules_at(minute)) for minute in range(24 * 60)]
+    for minute, count in enumerate(active):
+        assert count == sum(
+            criteria.covers_minute(minute) for criteria, _, _ in schedule.rules
+        )
+
+    assert schedule_of().next_change(datetime.now(UTC), UTC) is None
+
+
+def test_schedule_next_change_across_dst() -> None:
+    """Test that DST changes can't skip or repeat a change of the active rules."""
+    zurich = ZoneInfo("Europe/Zurich")
+    schedule = schedule_of("02:30-02:44")
+
+    # On a regular day the next change is at the wall clock time.
+    now = datetime(2025, 3, 1, 12, tzinfo=zurich)
+    assert schedule.next_change(now, zurich) == datetime(
+        2025, 3, 2, 2, 30, tzinfo=zurich
+    )
+
+    # 02:00-03:00 is skipped when DST starts, the change is at the switch.
+    now = datetime(2025, 3, 30, 1, tzinfo=zurich)
+    assert schedule.next_change(now, zurich) == datetime(2025, 3, 30, 1, tzinfo=UTC)
+
+    # 02:00-03:00 is repeated when DST ends, the change is at the switch.
+    now = datetime(2025, 10, 26, 2, 50, tzinfo=zurich)
+    next_change = schedule.next_change(now, zurich)
+    assert next_change == datetime(2025, 10, 26, 1, tzinfo=UTC)
+    # The second 02:30, in CET.
+    assert schedule.next_change(next_change, zurich) == datetime(
+        2025, 10, 26, 1, 30, tzinfo=UTC
+    )
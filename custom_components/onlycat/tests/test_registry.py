@@ -0,0 +1,40 @@
+"""Tests for OnlyCat/registry.py."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.onlycat.registry import OnlyCatClientRegistry
+
+
+@pytest.mark.asyncio
+@patch("custom_components.onlycat.registry.async_get_clientsession", MagicMock())
+async def test_clients_are_shared_and_reference_counted() -> None:
+    """Test that owners of a token share a client until the last releases it."""
+    registry = OnlyCatClientRegistry(MagicMock())
+    client = registry.acquire("token", "entry")
+    assert registry.acquire("token", "flow") is client
+    assert registry.acquire("other token", "other entry") is not client
+    client.disconnect = AsyncMock()
+    baseline = client.listener_count
+    entry_listener = AsyncMock()
+    flow_listener = AsyncMock()
+    client.add_event_listener("userUpdate", entry_listener, namespace="entry")
+    client.add_event_listener("userUpdate", flow_listener, namespace="flow")
+
+    await registry.async_release("token", "flow")
+    await client.handle_event("userUpdate", {"id": 1})
+    entry_listener.assert_awaited_once()
+    flow_listener.assert_not_awaited()
+    client.disconnect.assert_not_awaited()
+    assert client.user_id == "1"
+
+    await registry.async_release("token", "entry")
+    await registry.async_release("token", "entry")
+    client.disconnect.assert_awaited_once()
+    assert client.listener_count == baseline
+
+    # RFID profiles outlive the client of their token.
+    new_client = registry.acquire("token", "entry")
+    assert new_client is not client
+    assert new_client.rfid_profiles is client.rfid_profiles
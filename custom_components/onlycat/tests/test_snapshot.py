@@ -0,0 +1,123 @@
+"""Tests for OnlyCat/snapshot.py."""
+
+from dataclasses import replace
+from datetime import UTC, datetime
+from zoneinfo import ZoneInfo
+
+from custom_components.onlycat.data.device import Device, DeviceConnectivity
+from custom_components.onlycat.data.event import (
+    Event,
+    EventClassification,
+    EventTriggerSource,
+)
+from custom_components.onlycat.data.pet import Pet
+from custom_components.onlycat.data.policy import DeviceTransitPolicy
+from custom_components.onlycat.snapshot import (
+    data_from_snapshot,
+    snapshot_from_data,
+    snapshot_structure,
+)
+
+device_transit_policy = {
+    "deviceTransitPolicyId": 1,
+    "deviceId": "OC-00000000001",
+    "name": "Nachts",
+    "transitPolicy": {
+        "rules": [
+            {
+                "action": {"lock": False},
+                "enabled": True,
+                "criteria": {
+                    "rfidCode": ["000000000000001", "000000000000002"],
+                    "eventTriggerSource": 3,
+                    "timeRange": "22:00-06:00",
+                },
+                "description": "Entry Rule",
+            },
+        ],
+        "idleLock": True,
+        "idleLockBattery": True,
+    },
+}
+
+
+def create_data() -> tuple[list[Device], list[Pet]]:
+    """Create a device with a transit policy and a pet."""
+    device = Device(
+        device_id="OC-00000000001",
+        connectivity=DeviceConnectivity(
+            connected=True,
+            disconnect_reason=None,
+            timestamp=datetime(2025, 8, 1, 10, 0, tzinfo=UTC),
+        ),
+        description="Device Name",
+        time_zone=ZoneInfo("Europe/Zurich"),
+        device_transit_policy_id=1,
+    )
+    policy = DeviceTransitPolicy.from_api_response(device_transit_policy)
+    policy.device = device
+    device.device_transit_policies = [policy]
+    pet = Pet(
+        device,
+        "000000000000001",
+        datetime(2025, 8, 1, 9, 0, tzinfo=UTC),
+        last_seen_event=Event(
+            device_id="OC-00000000001",
+            event_id=42,
+            timestamp=datetime(2025, 8, 1, 9, 0, tzinfo=UTC),
+            frame_count=10,
+            event_trigger_source=EventTriggerSource.OUTDOOR_MOTION,
+            event_classification=EventClassification.CLEAR,
+            rfid_codes=["000000000000001"],
+        ),
+        label="Cat",
+    )
+    return [device], [pet]
+
+
+def test_snapshot_round_trip() -> None:
+    """Test that restoring a snapshot yields the data it was created from."""
+    devices, pets = create_data()
+
+    restored_devices, restored_pets = data_from_snapshot(
+        snapshot_from_data(devices, pets)
+    )
+
+    restored_device = restored_devices[0]
+    assert restored_device.to_dict() == devices[0].to_dict()
+    assert restored_device.device_transit_policy.device is restored_device
+    assert (
+        restored_device.device_transit_policy.to_dict()
+        == devices[0].device_transit_policy.to_dict()
+    )
+    assert restored_pets[0].device is restored_device
+    assert restored_pets[0].to_dict() == pets[0].to_dict()
+    assert restored_pets[0].last_seen_event == pets[0].last_seen_event
+
+
+def test_snapshot_omits_access_tokens() -> None:
+    """Test that the access token of the last seen event isn't persisted."""
+    devices, pets = create_data()
+    pets[0].last_seen_event.access_token = "secret"  # noqa: S105
+
+    snapshot = snapshot_from_data(devices, pets)
+
+    assert "accessToken" not in snapshot["pets"][0]["lastSeenEvent"]
+    assert "secret" not in str(snapshot)
+
+
+def test_snapshot_structure_ignores_volatile_data() -> None:
+    """Test that connectivity and sightings don't change the snapshot structure."""
+    devices, pets = create_data()
+    cached = snapshot_from_data(devices, pets)
+    devices[0].connectivity = replace(devices[0].connectivity, connected=False)
+    pets[0].last_seen = datetime(2025, 8, 2, 9, 0, tzinfo=UTC)
+    pets[0].last_seen_event = replace(pets[0].last_seen_event, event_id=43)
+    assert snapshot_structure(cached) == snapshot_structure(
+        snapshot_from_data(devices, pets)
+    )
+
+    devices[0].device_transit_policy_id = 2
+    assert snapshot_structure(cached) != snapshot_structure(
+        snapshot_from_data(devices, pets)
+    )
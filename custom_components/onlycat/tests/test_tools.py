@@ -0,0 +1,108 @@
+"""Smoke tests for the development tools in tools/."""
+
+import importlib
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+TOOLS = Path(__file__).resolve().parents[3] / "tools"
+
+
+def import_tool(monkeypatch: pytest.MonkeyPatch, name: str) -> ModuleType:
+    """Import a tool like it is run, with the tools on the path."""
+    monkeypatch.syspath_prepend(str(TOOLS))
+    monkeypatch.delitem(sys.modules, name, raising=False)
+    return importlib.import_module(name)
+
+
+@pytest.mark.asyncio
+async def test_gateway_benchmark_runs(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the gateway benchmark sets up and measures a single flap."""
+    benchmark_gateway = import_tool(monkeypatch, "benchmark_gateway")
+
+    setup, throughput, elapsed = await benchmark_gateway.measure(1)
+
+    assert setup > 0
+    assert throughput > 0
+    assert elapsed > 0
+
+
+def rpc(event: str, request: dict | None, data: object) -> dict:
+    """Create a recorded RPC frame."""
+    return {"time": 0, "type": "rpc", "event": event, "request": request, "data": data}
+
+
+def push(time: float, event: str, data: dict) -> dict:
+    """Create a recorded push frame."""
+    return {"time": time, "type": "push", "event": event, "data": data}
+
+
+DEVICE = {
+    "deviceId": "OC-00000000001",
+    "description": "Flap",
+    "timeZone": "UTC",
+    "connectivity": {"connected": True, "disconnectReason": None, "timestamp": 0},
+}
+RFID_CODE = "000000000000001"
+FRAMES = [
+    rpc("getDevices", {"subscribe": True}, [DEVICE]),
+    rpc("getDevice", {"deviceId": "OC-00000000001", "subscribe": True}, DEVICE),
+    rpc("getDeviceTransitPolicies", {"deviceId": "OC-00000000001"}, []),
+    rpc("getDeviceEvents", {"deviceId": "OC-00000000001"}, []),
+    rpc(
+        "getLastSeenRfidCodesByDevice",
+        {"deviceId": "OC-00000000001"},
+        [{"rfidCode": RFID_CODE, "timestamp": "2025-08-01T00:00:00+00:00"}],
+    ),
+    rpc("getRfidProfile", {"rfidCode": RFID_CODE}, {"label": "Cat"}),
+    push(
+        1,
+        "deviceEventUpdate",
+        {
+            "deviceId": "OC-00000000001",
+            "eventId": 1,
+            "type": "create",
+            "body": {"eventId": 1, "eventTriggerSource": 3},
+        },
+    ),
+    push(
+        2,
+        "eventUpdate",
+        {
+            "deviceId": "OC-00000000001",
+            "eventId": 1,
+            "type": "update",
+            "body": {"rfidCodes": [RFID_CODE]},
+        },
+    ),
+    push(
+        3,
+        "eventUpdate",
+        {
+            "deviceId": "OC-00000000001",
+            "eventId": 1,
+            "type": "update",
+            "body": {"frameCount": 10},
+        },
+    ),
+]
+
+
+@pytest.mark.asyncio
+async def test_traffic_replay_runs(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    """Test that a short recording is replayed through the integration."""
+    traffic_replay = import_tool(monkeypatch, "traffic_replay")
+
+    latencies = await traffic_replay.replay(FRAMES, speed=0)
+
+    assert {event: len(values) for event, values in latencies.items()} == {
+        "deviceEventUpdate": 1,
+        "eventUpdate": 2,
+    }
+    output = capsys.readouterr().out
+    assert "sensor.oc_00000000001_event: off → on" in output
+    assert "Requests missing" not in output
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark event dispatch cost as the number of devices and pets grows."""
+
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.onlycat.api import OnlyCatApiClient
+from custom_components.onlycat.data.event import EventUpdate
+
+MESSAGES = 2000
+SIZES = [(1, 2), (10, 20), (50, 100), (100, 300)]
+ENTITIES_PER_DEVICE = 3  # event, lock and contraband sensors
+
+
+def event_update(device_id: str, rfid_code: str) -> dict:
+    """Create an update naming an RFID code in an event of a device."""
+    return {
+        "deviceId": device_id,
+        "eventId": 1,
+        "type": "update",
+        "body": {"rfidCodes": [rfid_code]},
+    }
+
+
+def build_client(devices: int, pets: int, *, keyed: bool) -> tuple:
+    """Create a client with the listeners of the entities of an account."""
+    client = OnlyCatApiClient(token="", session=MagicMock(), socket=MagicMock())
+    calls = [0]
+
+    def entity(device_id: str) -> Callable[[EventUpdate], Awaitable[None]]:
+        async def on_event_update(update: EventUpdate) -> None:
+            # The pre-router pattern: every entity filters messages itself.
+            if update.device_id != device_id:
+                return
+            calls[0] += 1
+
+        return on_event_update
+
+    device_ids = [f"OC-{i:011d}" for i in range(devices)]
+    for index, device_id in enumerate(device_ids):
+        listeners = ENTITIES_PER_DEVICE + pets // devices + (index < pets % devices)
+        for _ in range(listeners):
+            client.add_event_listener(
+                "eventUpdate",
+                entity(device_id),
+                device_id=device_id if keyed else None,
+            )
+    return client, device_ids, calls
+
+
+async def run(devices: int, pets: int, *, keyed: bool) -> tuple[float, int]:
+    """Return the µs per message dispatched and the number of listener calls."""
+    client, device_ids, calls = build_client(devices, pets, keyed=keyed)
+    messages = [
+        event_update(device_ids[i % devices], f"{i % max(pets, 1):015d}")
+        for i in range(MESSAGES)
+    ]
+    start = time.perf_counter()
+    for message in messages:
+        await client.handle_event("eventUpdate", message)
+    elapsed = time.perf_counter() - start
+    return elapsed / MESSAGES * 1e6, calls[0]
+
+
+async def main() -> None:
+    """Compare dispatching to all listeners with keyed dispatch."""
+    print(f"{'devices':>8} {'pets':>6} {'broadcast µs':>14} {'keyed µs':>10}")
+    for devices, pets in SIZES:
+        broadcast, broadcast_calls = await run(devices, pets, keyed=False)
+        keyed, keyed_calls = await run(devices, pets, keyed=True)
+        assert broadcast_calls == keyed_calls
+        print(f"{devices:>8} {pets:>6} {broadcast:>14.2f} {keyed:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
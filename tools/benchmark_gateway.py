@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark setup time and event throughput against the gateway simulator."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gateway_simulator import GatewaySimulator, SimulatorConfig
+
+from custom_components.onlycat import (
+    _gather_bounded,
+    _initialize_devices,
+    _initialize_pets,
+    _subscribe_to_device,
+    binary_sensor,
+    device_tracker,
+    select,
+    sensor,
+)
+from custom_components.onlycat.api import OnlyCatApiClient
+from custom_components.onlycat.const import (
+    LISTENER_TIMEOUT,
+    MAX_CONCURRENT_LISTENERS,
+    SUBSCRIPTION_CONCURRENCY,
+)
+from custom_components.onlycat.data import OnlyCatData
+
+FLAPS = [1, 10, 100]
+EVENTS_PER_FLAP = 5
+LATENCY = 0.02
+JITTER = 0.01
+
+
+async def measure(flaps: int) -> tuple[float, float, float]:
+    """Return the setup time, messages per second and time to conclude events."""
+    simulator = GatewaySimulator(
+        SimulatorConfig(
+            devices=flaps,
+            pets=3,
+            policies=2,
+            latency=LATENCY,
+            jitter=JITTER,
+            event_rate=0,
+            update_interval=0.1,
+        )
+    )
+    url = await simulator.start()
+    async with aiohttp.ClientSession() as session:
+        # Dispatching like the integration does.
+        client = OnlyCatApiClient(
+            token="simulator",  # noqa: S106
+            session=session,
+            concurrent_dispatch=True,
+            max_concurrent_listeners=MAX_CONCURRENT_LISTENERS,
+            listener_timeout=LISTENER_TIMEOUT,
+            url=url,
+        )
+        entry = SimpleNamespace(
+            entry_id="benchmark",
+            runtime_data=OnlyCatData(client=client, devices=[], pets=[]),
+            async_on_unload=lambda _func: None,
+        )
+
+        start = time.perf_counter()
+        await client.connect()
+        await _initialize_devices(entry)
+        await _initialize_pets(entry)
+        await _gather_bounded(
+            SUBSCRIPTION_CONCURRENCY,
+            (_subscribe_to_device(client, d) for d in entry.runtime_data.devices),
+        )
+        setup = time.perf_counter() - start
+
+        entities: list = []
+        for platform in [binary_sensor, device_tracker, select, sensor]:
+            await platform.async_setup_entry(None, entry, entities.extend)
+        for entity in entities:
+            await entity.async_added_to_hass()
+        concluded = asyncio.Event()
+        messages = 0
+        events = flaps * EVENTS_PER_FLAP
+
+        async def subscribe_to_event(update: object) -> None:
+            await client.send_message(
+                "getEvent",
+                {
+                    "deviceId": update.device_id,
+                    "eventId": update.event_id,
+                    "subscribe": True,
+                },
+            )
+
+        async def count(update: object) -> None:
+            nonlocal messages, events
+            messages += 1
+            if update.event.frame_count:
+                events -= 1
+                if not events:
+                    concluded.set()
+
+        client.add_event_listener("deviceEventUpdate", subscribe_to_event)
+        client.add_event_listener("deviceEventUpdate", count)
+        client.add_event_listener("eventUpdate", count)
+
+        start = time.perf_counter()
+        await simulator.run_events(flaps * EVENTS_PER_FLAP)
+        await asyncio.wait_for(concluded.wait(), timeout=60)
+        elapsed = time.perf_counter() - start
+
+        await client.disconnect()
+    await simulator.stop()
+    return setup, messages / elapsed, elapsed
+
+
+async def main() -> None:
+    """Measure accounts of a growing number of flaps."""
+    print(
+        f"RPC latency {LATENCY * 1000:.0f} ± {JITTER * 1000:.0f} ms,"
+        f" {EVENTS_PER_FLAP} events per flap back to back"
+    )
+    print(f"{'flaps':>6} {'setup ms':>9} {'messages/s':>11} {'events ms':>10}")
+    for flaps in FLAPS:
+        setup, throughput, elapsed = await measure(flaps)
+        print(
+            f"{flaps:>6} {setup * 1000:>9.0f} {throughput:>11.0f}"
+            f" {elapsed * 1000:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Benchmark the memory used by events, policies and devices of the data model."""
+
+import dataclasses
+import gc
+import importlib
+import json
+import sys
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.onlycat.data.device import Device
+from custom_components.onlycat.data.event import Event
+from custom_components.onlycat.data.policy import DeviceTransitPolicy
+
+DATA_PACKAGE = "custom_components.onlycat.data"
+DATA_MODULES = ["type", "merge", "event", "pet", "policy", "device"]
+COUNT = 10000
+DEVICES = 10
+RFID_CODES = 5
+
+
+def api_event(index: int) -> dict:
+    """Create an event as sent by the API."""
+    return {
+        "globalId": index,
+        "deviceId": "OC-" + f"{index % DEVICES:011d}",
+        "eventId": index,
+        "timestamp": "2025-08-01T10:00:00.000Z",
+        "frameCount": 120,
+        "eventTriggerSource": 3,
+        "eventClassification": 1,
+        "posterFrameIndex": 10,
+        "accessToken": "token",
+        "rfidCodes": [f"{index % RFID_CODES:015d}"],
+    }
+
+
+def api_policy(index: int) -> dict:
+    """Create a transit policy with two rules as sent by the API."""
+    return {
+        "deviceTransitPolicyId": index,
+        "deviceId": "OC-" + f"{index % DEVICES:011d}",
+        "name": "Policy",
+        "transitPolicy": {
+            "idleLock": True,
+            "idleLockBattery": True,
+            "rules": [
+                {
+                    "action": {"lock": True, "lockoutDuration": 10, "sound": "deny"},
+                    "criteria": {
+                        "eventTriggerSource": 3,
+                        "eventClassification": [2, 3],
+                    },
+                    "description": "Contraband Rule",
+                },
+                {
+                    "action": {"lock": False},
+                    "criteria": {
+                        "rfidCode": [f"{code:015d}" for code in range(RFID_CODES)],
+                        "eventTriggerSource": 3,
+                        "timeRange": ["06:00-12:00", "22:00-02:00"],
+                    },
+                    "description": "Entry Rule",
+                },
+            ],
+        },
+    }
+
+
+def api_device(index: int) -> dict:
+    """Create a device as sent by the API."""
+    return {
+        "deviceId": "OC-" + f"{index % DEVICES:011d}",
+        "description": "Cat Flap",
+        "timeZone": "Europe/Zurich",
+        "deviceTransitPolicyId": index,
+        "connectivity": {
+            "connected": True,
+            "disconnectReason": "SERVER_INITIATED_DISCONNECT",
+            "timestamp": 1754114553075,
+        },
+    }
+
+
+def bytes_per_object(create: Callable[[dict], object], messages: list[str]) -> float:
+    """
+    Return the memory retained per object created from the messages.
+
+    Messages are decoded while measuring, so that strings kept by the objects
+    are accounted for like they are when receiving them from the socket.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [create(json.loads(message)) for message in messages]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return used / COUNT
+
+
+def unslotted_data_model() -> dict[str, ModuleType]:
+    """
+    Import a second copy of the data model without slots and interning.
+
+    The modules are executed again with dataclass ignoring slots=True, and
+    sys.intern of the copies returns strings as they are.
+    """
+    dataclass = dataclasses.dataclass
+
+    def unslotted(cls: type | None = None, /, **kwargs: object) -> object:
+        return dataclass(cls, **{**kwargs, "slots": False})
+
+    package = sys.modules[DATA_PACKAGE]
+    originals = {
+        name: sys.modules.pop(f"{DATA_PACKAGE}.{name}") for name in DATA_MODULES
+    }
+    dataclasses.dataclass = unslotted
+    try:
+        copies = {
+            name: importlib.import_module(f"{DATA_PACKAGE}.{name}")
+            for name in DATA_MODULES
+        }
+    finally:
+        dataclasses.dataclass = dataclass
+        for name, module in originals.items():
+            sys.modules[f"{DATA_PACKAGE}.{name}"] = module
+            setattr(package, name, module)
+    for module in copies.values():
+        if hasattr(module, "sys"):
+            module.sys = SimpleNamespace(intern=lambda string: string)
+    return copies
+
+
+def main() -> None:
+    """Compare the footprint of the data model before and after slotting it."""
+    reference = unslotted_data_model()
+    print(f"{'object':>8} {'before':>8} {'after':>8} {'delta':>8}")
+    for name, create, create_before, build in [
+        (
+            "event",
+            Event.from_api_response,
+            reference["event"].Event.from_api_response,
+            api_event,
+        ),
+        (
+            "policy",
+            DeviceTransitPolicy.from_api_response,
+            reference["policy"].DeviceTransitPolicy.from_api_response,
+            api_policy,
+        ),
+        (
+            "device",
+            Device.from_api_response,
+            reference["device"].Device.from_api_response,
+            api_device,
+        ),
+    ]:
+        messages = [json.dumps(build(index)) for index in range(COUNT)]
+        before = bytes_per_object(create_before, messages)
+        after = bytes_per_object(create, messages)
+        print(
+            f"{name:>8} {before:>8.0f} {after:>8.0f} {(after - before) / before:>+8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
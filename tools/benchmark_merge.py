@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark merging partial event and device updates."""
+
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import fields
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.onlycat.data.device import Device
+from custom_components.onlycat.data.event import (
+    Event,
+    EventClassification,
+)
+
+COUNT = 200_000
+
+
+def reflective_update_from(target: object, update: object) -> None:
+    """Merge like before generating it, with fields() and getattr/setattr."""
+    if update is None:
+        return
+    for field in fields(target):
+        new_value = getattr(update, field.name, None)
+        if new_value is not None:
+            setattr(target, field.name, new_value)
+
+
+def measure(
+    merge: Callable[[object, object], None], target: object, update: object
+) -> float:
+    """Return the ns per merge of an update into a target."""
+    start = time.perf_counter()
+    for _ in range(COUNT):
+        merge(target, update)
+    return (time.perf_counter() - start) / COUNT * 1e9
+
+
+def main() -> None:
+    """Compare the reflective merge with the generated merges."""
+    updates = [
+        (
+            "event, 1 field",
+            Event(),
+            Event(
+                event_trigger_source=None,
+                event_classification=EventClassification.CLEAR,
+            ),
+        ),
+        (
+            "event, all fields",
+            Event(),
+            Event(
+                global_id=1,
+                device_id="OC-00000000001",
+                event_id=1,
+                timestamp=datetime(2025, 8, 1, tzinfo=UTC),
+                frame_count=120,
+                event_classification=EventClassification.CLEAR,
+                poster_frame_index=10,
+                access_token="token",  # noqa: S106
+                rfid_codes=["000000000000001"],
+            ),
+        ),
+        (
+            "device, 1 field",
+            Device(device_id="OC-00000000001"),
+            Device(device_id="OC-00000000001", time_zone=None),
+        ),
+    ]
+    print(f"{'update':>18} {'reflective ns':>14} {'generated ns':>13} {'speedup':>8}")
+    for name, target, update in updates:
+        reflective = measure(reflective_update_from, target, update)
+        generated = measure(type(target).update_from, target, update)
+        print(
+            f"{name:>18} {reflective:>14.0f} {generated:>13.0f}"
+            f" {reflective / generated:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
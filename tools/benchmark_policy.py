@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark transit policy evaluation, rule by rule versus compiled."""
+
+import random
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.onlycat.data.device import Device
+from custom_components.onlycat.data.event import (
+    Event,
+    EventClassification,
+    EventTriggerSource,
+)
+from custom_components.onlycat.data.policy import (
+    DeviceTransitPolicy,
+    PolicyResult,
+    TransitPolicy,
+)
+
+EVENTS = 5000
+RULE_COUNTS = [1, 5, 20, 50]
+RFID_CODES = [f"{i:015d}" for i in range(20)]
+# Share of the rules locking the flap.
+LOCKING_RULES = 0.5
+
+
+def random_rule(rng: random.Random) -> dict:
+    """Create a rule with all kinds of criteria as sent by the API."""
+    start, end = rng.randrange(24 * 60), rng.randrange(24 * 60)
+    return {
+        "action": {"lock": rng.random() < LOCKING_RULES},
+        "criteria": {
+            "eventTriggerSource": [
+                source.value for source in rng.sample(list(EventTriggerSource), 2)
+            ],
+            "eventClassification": [
+                cls.value for cls in rng.sample(list(EventClassification), 3)
+            ],
+            "rfidCode": rng.sample(RFID_CODES, 5),
+            "timeRange": f"{start // 60:02d}:{start % 60:02d}-"
+            f"{end // 60:02d}:{end % 60:02d}",
+        },
+    }
+
+
+def random_event(rng: random.Random) -> Event:
+    """Create an event at a random time of the year."""
+    return Event(
+        event_id=rng.randrange(1000),
+        timestamp=datetime(2025, 1, 1, tzinfo=UTC)
+        + timedelta(seconds=rng.randrange(365 * 24 * 3600)),
+        event_trigger_source=rng.choice(list(EventTriggerSource)),
+        event_classification=rng.choice(list(EventClassification)),
+        rfid_codes=rng.sample(RFID_CODES, 1),
+    )
+
+
+def reference_policy_result(policy: DeviceTransitPolicy, event: Event) -> PolicyResult:
+    """Evaluate like before compiling, with RuleCriteria.matches rule by rule."""
+    for rule in policy.transit_policy.rules:
+        if rule.criteria and rule.criteria.matches(event, policy.device.time_zone):
+            return PolicyResult.LOCKED if rule.action.lock else PolicyResult.UNLOCKED
+    if policy.transit_policy.idle_lock:
+        return PolicyResult.LOCKED
+    return PolicyResult.UNLOCKED
+
+
+def measure(
+    evaluate: Callable[[DeviceTransitPolicy, Event], PolicyResult],
+    policy: DeviceTransitPolicy,
+    events: list[Event],
+) -> tuple:
+    """Return the µs per evaluation of the events and their results."""
+    start = time.perf_counter()
+    results = [evaluate(policy, event) for event in events]
+    return (time.perf_counter() - start) / len(events) * 1e6, results
+
+
+def main() -> None:
+    """Compare the evaluators on policies of a growing number of rules."""
+    rng = random.Random(0)  # noqa: S311
+    device = Device(device_id="OC-00000000001", time_zone=ZoneInfo("Europe/Zurich"))
+    events = [random_event(rng) for _ in range(EVENTS)]
+    print(f"{'rules':>6} {'reference µs':>13} {'compiled µs':>12} {'speedup':>8}")
+    for rule_count in RULE_COUNTS:
+        policy = DeviceTransitPolicy(
+            device_transit_policy_id=1,
+            device_id=device.device_id,
+            transit_policy=TransitPolicy.from_api_response(
+                {
+                    "idleLock": True,
+                    "idleLockBattery": False,
+                    "rules": [random_rule(rng) for _ in range(rule_count)],
+                }
+            ),
+            device=device,
+        )
+        reference, expected = measure(reference_policy_result, policy, events)
+        compiled, results = measure(
+            DeviceTransitPolicy.determine_policy_result, policy, events
+        )
+        assert results == expected
+        print(
+            f"{rule_count:>6} {reference:>13.2f} {compiled:>12.2f}"
+            f" {reference / compiled:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
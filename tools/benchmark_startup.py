@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark resolving the last seen events of pets at startup."""
+
+import asyncio
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.onlycat import (
+    _fetch_pets,
+    _latest_event_by_rfid,
+)
+from custom_components.onlycat.data.device import Device
+from custom_components.onlycat.data.event import Event
+
+RUNS = 5
+# (devices, events per device, RFID codes per device)
+SIZES = [(1, 100, 5), (5, 200, 20), (10, 500, 50), (20, 1000, 50)]
+START = datetime(2025, 8, 1, tzinfo=UTC)
+
+
+def api_events(device_id: str, events: int, rfid_codes: int) -> list[dict]:
+    """
+    Create the events of a device, newest first like getDeviceEvents.
+
+    Every third event has no RFID code and half of the pets were last seen
+    before the listed events.
+    """
+    return [
+        {
+            "deviceId": device_id,
+            "eventId": event_id,
+            "timestamp": (START - timedelta(minutes=event_id)).isoformat(),
+            "eventTriggerSource": 3,
+            "rfidCodes": [f"{(event_id * 7) % (rfid_codes // 2):015d}"]
+            if event_id % 3
+            else [],
+        }
+        for event_id in range(events)
+    ]
+
+
+def linear_scan(events: list[Event], rfid_codes: list[str]) -> dict[str, Event]:
+    """Resolve like before indexing, with a scan of all events for every pet."""
+    latest_events = {}
+    for rfid_code in rfid_codes:
+        for event in events:
+            if event.rfid_codes and rfid_code in event.rfid_codes:
+                latest_events[rfid_code] = event
+                break
+    return latest_events
+
+
+def build_entry(devices: int, events: int, rfid_codes: int) -> tuple:
+    """Create an entry whose client answers instantly from synthetic data."""
+    device_list = [Device(device_id=f"OC-{i:011d}") for i in range(devices)]
+    device_events = {
+        device.device_id: api_events(device.device_id, events, rfid_codes)
+        for device in device_list
+    }
+    last_seen = [
+        {"rfidCode": f"{code:015d}", "timestamp": START.isoformat()}
+        for code in range(rfid_codes)
+    ]
+
+    async def send_message(event: str, data: dict) -> list[dict]:
+        if event == "getDeviceEvents":
+            return device_events[data["deviceId"]]
+        return last_seen
+
+    entry = MagicMock()
+    entry.runtime_data.history = {}
+    entry.runtime_data.client.send_message = send_message
+    entry.runtime_data.client.get_rfid_label = AsyncMock(return_value=None)
+    return entry, device_list, device_events
+
+
+async def main() -> None:
+    """Compare the resolutions on accounts of a growing size."""
+    print(
+        f"{'devices':>8} {'events':>7} {'rfids':>6}"
+        f" {'scan ms':>8} {'indexed ms':>11} {'_fetch_pets ms':>15}"
+    )
+    for devices, events, rfid_codes in SIZES:
+        entry, device_list, device_events = build_entry(devices, events, rfid_codes)
+        parsed = [
+            [Event.from_api_response(event) for event in api_device_events]
+            for api_device_events in device_events.values()
+        ]
+        codes = [f"{code:015d}" for code in range(rfid_codes)]
+
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            scanned = [linear_scan(events, codes) for events in parsed]
+        scan = (time.perf_counter() - start) / RUNS * 1000
+
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            await _fetch_pets(entry, device_list)
+        fetch = (time.perf_counter() - start) / RUNS * 1000
+
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            indexed = [_latest_event_by_rfid(events) for events in parsed]
+        index = (time.perf_counter() - start) / RUNS * 1000
+
+        assert indexed == scanned
+        print(
+            f"{devices:>8} {events:>7} {rfid_codes:>6}"
+            f" {scan:>8.2f} {index:>11.2f} {fetch:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
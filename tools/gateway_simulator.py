@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""Simulate the OnlyCat gateway locally, for load and startup benchmarks."""
+
+import argparse
+import asyncio
+import random
+import sys
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import socketio
+from aiohttp import web
+
+# Share of the flap events identifying a pet.
+IDENTIFIED_EVENTS = 0.8
+# Share of the flap events preceded by a change of the flap's connectivity.
+CONNECTIVITY_CHANGES = 0.05
+
+
+@dataclass
+class SimulatorConfig:
+    """Size and behaviour of the simulated account and gateway."""
+
+    devices: int = 1
+    # Per device.
+    pets: int = 2
+    policies: int = 2
+    events: int = 20
+    # Seconds an RPC takes, varied uniformly by up to jitter seconds.
+    latency: float = 0
+    jitter: float = 0
+    # Flap events per second over all devices, when running run_events.
+    event_rate: float = 1
+    # Seconds between the updates of a flap event.
+    update_interval: float = 0.5
+    seed: int = 0
+
+
+class GatewaySimulator:
+    """
+    A python-socketio server answering the RPCs the integration makes.
+
+    Clients subscribe to devices, their events and single events through the
+    subscribe flag of the requests, like on the gateway, and only receive the
+    pushes of their subscriptions.
+    """
+
+    def __init__(self, config: SimulatorConfig) -> None:
+        """Initialize the simulator with a generated account."""
+        self.config = config
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(config.seed)  # noqa: S311
+        self._next_event_id = 1
+        # Devices with an event in progress, a flap has one event at a time.
+        self._busy: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._runner: web.AppRunner | None = None
+        self.url: str | None = None
+
+        self.devices: dict[str, dict] = {}
+        self.policies: dict[int, dict] = {}
+        self.pets: dict[str, list[str]] = {}
+        self.events: dict[str, deque[dict]] = {}
+        now = datetime.now(UTC)
+        for index in range(config.devices):
+            self._add_device(index, now)
+
+        self.sio = socketio.AsyncServer(async_mode="aiohttp")
+        self.app = web.Application()
+        self.sio.attach(self.app)
+        self.sio.on("connect", self._on_connect)
+        for event, handler in {
+            "getDevices": self._get_devices,
+            "getDevice": self._get_device,
+            "getDeviceEvents": self._get_device_events,
+            "getEvent": self._get_event,
+            "getDeviceTransitPolicies": self._get_device_transit_policies,
+            "getDeviceTransitPolicy": self._get_device_transit_policy,
+            "getLastSeenRfidCodesByDevice": self._get_last_seen_rfid_codes,
+            "getRfidProfile": self._get_rfid_profile,
+            "activateDeviceTransitPolicy": self._activate_device_transit_policy,
+            "runDeviceCommand": self._run_device_command,
+        }.items():
+            self.sio.on(event, self._rpc(event, handler))
+
+    def _add_device(self, index: int, now: datetime) -> None:
+        device_id = f"OC-{index:011d}"
+        rfid_codes = [f"{index:06d}{pet:09d}" for pet in range(self.config.pets)]
+        policy_ids = [
+            index * 1000 + policy for policy in range(1, self.config.policies + 1)
+        ]
+        self.pets[device_id] = rfid_codes
+        self.devices[device_id] = {
+            "deviceId": device_id,
+            "description": f"Flap {index}",
+            "timeZone": "Europe/Zurich",
+            "deviceTransitPolicyId": policy_ids[0] if policy_ids else None,
+            "connectivity": {
+                "connected": True,
+                "disconnectReason": None,
+                "timestamp": int(now.timestamp() * 1000),
+            },
+        }
+        for number, policy_id in enumerate(policy_ids):
+            self.policies[policy_id] = {
+                "deviceTransitPolicyId": policy_id,
+                "deviceId": device_id,
+                "name": f"Policy {number}",
+                "transitPolicy": {
+                    "idleLock": True,
+                    "idleLockBattery": True,
+                    "rules": [
+                        {
+                            "action": {"lock": True},
+                            "criteria": {"eventClassification": [2, 3]},
+                            "description": "Contraband",
+                        },
+                        {
+                            "action": {"lock": number % 2 == 1},
+                            "criteria": {
+                                "eventTriggerSource": 3,
+                                "rfidCode": rfid_codes,
+                                "timeRange": "06:00-22:00",
+                            },
+                            "description": "Pets",
+                        },
+                    ],
+                },
+            }
+        self.events[device_id] = deque(maxlen=self.config.events)
+        for minutes in range(self.config.events, 0, -1):
+            event = self._new_event(device_id, now - timedelta(minutes=minutes))
+            self.events[device_id].appendleft(event)
+
+    def _new_event(self, device_id: str, timestamp: datetime) -> dict:
+        event_id = self._next_event_id
+        self._next_event_id += 1
+        rfid_codes = self.pets[device_id]
+        return {
+            "globalId": event_id,
+            "deviceId": device_id,
+            "eventId": event_id,
+            "timestamp": timestamp.isoformat(),
+            "frameCount": 100,
+            "eventTriggerSource": self._rng.choice([2, 3]),
+            "eventClassification": self._rng.choice([1, 1, 1, 2, 3]),
+            "posterFrameIndex": 10,
+            "accessToken": "token",
+            "rfidCodes": [self._rng.choice(rfid_codes)]
+            if rfid_codes and self._rng.random() < IDENTIFIED_EVENTS
+            else [],
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving, on a free port by default, and return the URL."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _rpc(self, event: str, handler: Any) -> Any:
+        async def respond(sid: str, data: dict | None = None) -> Any:
+            self.stats[event] += 1
+            delay = self.config.latency + self._rng.uniform(
+                -self.config.jitter, self.config.jitter
+            )
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return await handler(sid, data or {})
+
+        return respond
+
+    async def _subscribe(self, sid: str, data: dict, room: str) -> None:
+        if data.get("subscribe"):
+            await self.sio.enter_room(sid, room)
+
+    async def _on_connect(self, sid: str, _environ: dict, auth: dict | None) -> bool:
+        if not auth or not auth.get("token"):
+            return False
+        self.stats["connect"] += 1
+        await self.sio.emit(
+            "userUpdate", {"id": 1, "name": "simulator@onlycat.com"}, to=sid
+        )
+        return True
+
+    async def _get_devices(self, sid: str, data: dict) -> list[dict]:
+        await self._subscribe(sid, data, "devices")
+        return [
+            {"deviceId": device_id, "description": device["description"]}
+            for device_id, device in self.devices.items()
+        ]
+
+    async def _get_device(self, sid: str, data: dict) -> dict | None:
+        await self._subscribe(sid, data, data.get("deviceId"))
+        return self.devices.get(data.get("deviceId"))
+
+    async def _get_device_events(self, sid: str, data: dict) -> list[dict]:
+        device_id = data.get("deviceId")
+        await self._subscribe(sid, data, f"{device_id}/events")
+        return list(self.events.get(device_id, ()))
+
+    async def _get_event(self, sid: str, data: dict) -> dict | None:
+        event_id = data.get("eventId")
+        await self._subscribe(sid, data, f"event/{event_id}")
+        return next(
+            (
+                event
+                for event in self.events.get(data.get("deviceId"), ())
+                if event["eventId"] == event_id
+            ),
+            None,
+        )
+
+    async def _get_device_transit_policies(self, _sid: str, data: dict) -> list[dict]:
+        return [
+            {key: policy[key] for key in ("deviceTransitPolicyId", "deviceId", "name")}
+            for policy in self.policies.values()
+            if policy["deviceId"] == data.get("deviceId")
+        ]
+
+    async def _get_device_transit_policy(self, _sid: str, data: dict) -> dict | None:
+        return self.policies.get(int(data.get("deviceTransitPolicyId", 0)))
+
+    async def _get_last_seen_rfid_codes(self, _sid: str, data: dict) -> list[dict]:
+        last_seen = {}
+        for event in self.events.get(data.get("deviceId"), ()):
+            for rfid_code in event["rfidCodes"]:
+                last_seen.setdefault(rfid_code, event["timestamp"])
+        return [
+            {"rfidCode": rfid_code, "timestamp": timestamp}
+            for rfid_code, timestamp in last_seen.items()
+        ]
+
+    async def _get_rfid_profile(self, _sid: str, data: dict) -> dict:
+        rfid_code = data.get("rfidCode")
+        return {"rfidCode": rfid_code, "label": f"Cat {rfid_code[-3:]}"}
+
+    async def _activate_device_transit_policy(self, _sid: str, data: dict) -> dict:
+        device_id = data.get("deviceId")
+        policy_id = data.get("deviceTransitPolicyId")
+        self.devices[device_id]["deviceTransitPolicyId"] = policy_id
+        await self.push_device_update(device_id, {"deviceTransitPolicyId": policy_id})
+        return self.devices[device_id]
+
+    async def _run_device_command(self, _sid: str, data: dict) -> dict:
+        device_id = data.get("deviceId")
+        if data.get("command") == "unlock":
+            task = asyncio.create_task(
+                self.push_event(device_id, trigger_source=1, classification=10)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return {"deviceId": device_id, "command": data.get("command")}
+
+    async def push_device_update(self, device_id: str, body: dict) -> None:
+        """Push a deviceUpdate to the subscribers of a device."""
+        self.stats["deviceUpdate"] += 1
+        await self.sio.emit(
+            "deviceUpdate",
+            {"deviceId": device_id, "type": "update", "body": body},
+            room=device_id,
+        )
+
+    async def push_event(
+        self,
+        device_id: str,
+        trigger_source: int | None = None,
+        classification: int | None = None,
+    ) -> None:
+        """
+        Push a flap event as the gateway does while it happens.
+
+        The event is created with a deviceEventUpdate, followed by eventUpdates
+        to its subscribers naming the pet, classifying and concluding it.
+        """
+        self._busy.add(device_id)
+        try:
+            await self._push_event(device_id, trigger_source, classification)
+        finally:
+            self._busy.discard(device_id)
+
+    async def _push_event(
+        self,
+        device_id: str,
+        trigger_source: int | None,
+        classification: int | None,
+    ) -> None:
+        event = self._new_event(device_id, datetime.now(UTC))
+        if trigger_source is not None:
+            event["eventTriggerSource"] = trigger_source
+        if classification is not None:
+            event["eventClassification"] = classification
+        self.events[device_id].appendleft(event)
+
+        fields = ["globalId", "deviceId", "eventId", "timestamp", "eventTriggerSource"]
+        self.stats["deviceEventUpdate"] += 1
+        await self.sio.emit(
+            "deviceEventUpdate",
+            {
+                "deviceId": device_id,
+                "eventId": event["eventId"],
+                "type": "create",
+                "body": {key: event[key] for key in fields},
+            },
+            room=f"{device_id}/events",
+        )
+        for body in [
+            {"rfidCodes": event["rfidCodes"]},
+            {"eventClassification": event["eventClassification"]},
+            {"frameCount": event["frameCount"], "posterFrameIndex": 10},
+        ]:
+            await asyncio.sleep(self.config.update_interval)
+            self.stats["eventUpdate"] += 1
+            await self.sio.emit(
+                "eventUpdate",
+                {
+                    "deviceId": device_id,
+                    "eventId": event["eventId"],
+                    "type": "update",
+                    "body": {"deviceId": device_id, **body},
+                },
+                room=f"event/{event['eventId']}",
+            )
+
+    async def run_events(self, count: int | None = None) -> None:
+        """
+        Push count events, or forever, at event_rate on random devices.
+
+        With an event_rate of 0 events are pushed as fast as the devices can
+        take them.
+        """
+        tasks: set[asyncio.Task] = set()
+        pushed = 0
+        while count is None or pushed < count:
+            idle = [
+                device_id for device_id in self.devices if device_id not in self._busy
+            ]
+            if not idle:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            device_id = self._rng.choice(idle)
+            if self._rng.random() < CONNECTIVITY_CHANGES:
+                connectivity = self.devices[device_id]["connectivity"]
+                connectivity["connected"] = not connectivity["connected"]
+                await self.push_device_update(device_id, {"connectivity": connectivity})
+            self._busy.add(device_id)
+            task = asyncio.create_task(self.push_event(device_id))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            pushed += 1
+            if self.config.event_rate:
+                await asyncio.sleep(self._rng.expovariate(self.config.event_rate))
+        await asyncio.gather(*tasks)
+
+
+async def main() -> None:
+    """Serve a simulated account until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--pets", type=int, default=2, help="Per device")
+    parser.add_argument("--policies", type=int, default=2, help="Per device")
+    parser.add_argument("--events", type=int, default=20, help="Listed per device")
+    parser.add_argument("--latency", type=float, default=0, help="Seconds per RPC")
+    parser.add_argument("--jitter", type=float, default=0, help="Seconds")
+    parser.add_argument(
+        "--event-rate", type=float, default=0.1, help="Events per second, 0 for none"
+    )
+    parser.add_argument("--update-interval", type=float, default=0.5, help="Seconds")
+    args = parser.parse_args()
+
+    simulator = GatewaySimulator(
+        SimulatorConfig(
+            devices=args.devices,
+            pets=args.pets,
+            policies=args.policies,
+            events=args.events,
+            latency=args.latency,
+            jitter=args.jitter,
+            event_rate=args.event_rate,
+            update_interval=args.update_interval,
+        )
+    )
+    url = await simulator.start(args.host, args.port)
+    print(f"Simulating {args.devices} devices at {url} — press Ctrl+C to stop...")
+    try:
+        if args.event_rate:
+            await simulator.run_events()
+        else:
+            await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+        print(f"Handled {dict(simulator.stats)}")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        sys.exit(0)
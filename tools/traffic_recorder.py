@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Record the socket traffic of the integration to a compressed JSONL file."""
+
+import argparse
+import asyncio
+import contextlib
+import gzip
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+import socketio
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.onlycat import (
+    _initialize_devices,
+    _initialize_pets,
+    _subscribe_to_device,
+)
+from custom_components.onlycat.api import (
+    ONLYCAT_URL,
+    OnlyCatApiClient,
+)
+from custom_components.onlycat.data import OnlyCatData
+
+
+class TrafficRecorder:
+    """
+    Writer of a recording, one JSON frame per line.
+
+    Pushes are recorded as {"time", "type": "push", "event", "data"} and RPCs
+    as {"time", "type": "rpc", "event", "request", "data", "duration"}, with
+    time in seconds since the epoch and data holding the response.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open the recording for writing."""
+        self._file = gzip.open(path, "wt", encoding="utf-8")  # noqa: SIM115
+        self.frames = 0
+
+    def record(self, frame_type: str, event: str, data: Any, **extra: Any) -> None:
+        """Write a frame received now."""
+        frame = {"time": time.time(), "type": frame_type, "event": event, "data": data}
+        self._file.write(json.dumps({**frame, **extra}) + "\n")
+        self.frames += 1
+
+    def close(self) -> None:
+        """Close the recording."""
+        self._file.close()
+
+
+class RecordingSocket(socketio.AsyncClient):
+    """Socket client recording the pushes it receives and the RPCs it makes."""
+
+    def __init__(self, recorder: TrafficRecorder, **kwargs: Any) -> None:
+        """Initialize the socket, recording to recorder."""
+        super().__init__(**kwargs)
+        self._recorder = recorder
+
+    def on(self, event: str, handler: Any = None, namespace: str | None = None) -> Any:
+        """Register a handler, recording the pushes passed to the catch-all one."""
+        if event != "*" or handler is None:
+            return super().on(event, handler, namespace)
+
+        async def record_push(name: str, *args: Any) -> None:
+            self._recorder.record("push", name, args[0] if args else None)
+            await handler(name, *args)
+
+        return super().on(event, record_push, namespace)
+
+    async def call(self, event: str, data: Any = None, **kwargs: Any) -> Any:
+        """Make an RPC and record it with its response."""
+        start = time.perf_counter()
+        response = await super().call(event, data, **kwargs)
+        self._recorder.record(
+            "rpc",
+            event,
+            response,
+            request=data,
+            duration=time.perf_counter() - start,
+        )
+        return response
+
+
+async def main() -> None:
+    """Record the traffic of an account until stopped."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", type=Path, help="Recording to write, e.g. x.jsonl.gz")
+    parser.add_argument(
+        "--duration", type=float, help="Seconds to record, until Ctrl+C if not given"
+    )
+    parser.add_argument(
+        "--url", default=ONLYCAT_URL, help="Gateway, e.g. of gateway_simulator.py"
+    )
+    args = parser.parse_args()
+
+    token = os.getenv("ONLYCAT_TOKEN")
+    if not token:
+        print("Error: ONLYCAT_TOKEN environment variable is not set.")
+        sys.exit(1)
+
+    recorder = TrafficRecorder(args.output)
+    async with aiohttp.ClientSession() as session:
+        socket = RecordingSocket(
+            recorder, http_session=session, reconnection=True, ssl_verify=True
+        )
+        client = OnlyCatApiClient(
+            token=token, session=session, socket=socket, url=args.url
+        )
+        entry = SimpleNamespace(
+            runtime_data=OnlyCatData(client=client, devices=[], pets=[])
+        )
+
+        async def subscribe_to_event(update: Any) -> None:
+            await client.send_message(
+                "getEvent",
+                {
+                    "deviceId": update.device_id,
+                    "eventId": update.event_id,
+                    "subscribe": True,
+                },
+            )
+
+        # Start up like the integration does, so that a replay finds the same
+        # RPCs in the recording.
+        await client.connect()
+        await _initialize_devices(entry)
+        await _initialize_pets(entry)
+        for device in entry.runtime_data.devices:
+            await _subscribe_to_device(client, device)
+        client.add_event_listener("deviceEventUpdate", subscribe_to_event)
+        print(
+            f"Recording {len(entry.runtime_data.devices)} devices to {args.output}"
+            " — press Ctrl+C to stop..."
+        )
+
+        # Shielded, cancelling the wait would cancel the socket's read loop.
+        try:
+            async with asyncio.timeout(args.duration):
+                await asyncio.shield(client.wait())
+        except TimeoutError:
+            pass
+        finally:
+            await client.disconnect()
+            recorder.close()
+            print(f"Recorded {recorder.frames} frames")
+
+
+if __name__ == "__main__":
+    with contextlib.suppress(KeyboardInterrupt, asyncio.CancelledError):
+        asyncio.run(main())
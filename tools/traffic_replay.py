@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Replay a recording of socket traffic through the integration offline."""
+
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.onlycat import (
+    _apply_device_update,
+    _initialize_devices,
+    _initialize_pets,
+    binary_sensor,
+    device_tracker,
+    select,
+    sensor,
+)
+from custom_components.onlycat.api import OnlyCatApiClient
+from custom_components.onlycat.data import OnlyCatData
+
+PLATFORMS = [binary_sensor, device_tracker, select, sensor]
+
+
+def load_recording(path: Path) -> list[dict]:
+    """Read the frames of a recording."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def request_key(event: str, data: Any) -> tuple[str, str]:
+    """Return the key of a request, ignoring whether it subscribes."""
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if key != "subscribe"}
+    return event, json.dumps(data, sort_keys=True)
+
+
+class RecordedGateway:
+    """
+    Fake RPC backend answering with the responses of a recording.
+
+    Repeated requests get the recorded responses in order, the last one is
+    served once they are used up. Requests that were never recorded get None.
+    """
+
+    def __init__(self, frames: list[dict]) -> None:
+        """Initialize the gateway with the RPCs of a recording."""
+        self._responses: defaultdict[tuple[str, str], deque] = defaultdict(deque)
+        for frame in frames:
+            if frame["type"] == "rpc":
+                key = request_key(frame["event"], frame.get("request"))
+                self._responses[key].append(frame["data"])
+        self.misses: Counter[str] = Counter()
+
+    async def call(self, event: str, data: Any = None, **_kwargs: Any) -> Any:
+        """Answer a request with its next recorded response."""
+        responses = self._responses.get(request_key(event, data))
+        if not responses:
+            self.misses[event] += 1
+            return None
+        return responses.popleft() if len(responses) > 1 else responses[0]
+
+
+class ReplaySocket:
+    """The part of socketio.AsyncClient the API client uses, without a network."""
+
+    connected = True
+
+    def __init__(self, gateway: RecordedGateway) -> None:
+        """Initialize the socket, answering RPCs from gateway."""
+        self.call = gateway.call
+        self.handlers: dict[str, Any] = {}
+
+    def on(self, event: str, handler: Any = None, namespace: str | None = None) -> None:  # noqa: ARG002
+        """Register a handler."""
+        self.handlers[event] = handler
+
+    def get_sid(self, namespace: str | None = None) -> str:  # noqa: ARG002
+        """Return the ID of the session."""
+        return "replay"
+
+    async def emit(self, *_args: Any, **_kwargs: Any) -> None:
+        """Drop a message."""
+
+    async def connect(self, *_args: Any, **_kwargs: Any) -> None:
+        """Do nothing, the socket is always connected."""
+
+    async def disconnect(self) -> None:
+        """Do nothing, the socket is always connected."""
+
+    async def shutdown(self) -> None:
+        """Do nothing, the socket is always connected."""
+
+    async def wait(self) -> None:
+        """Return right away."""
+
+
+def entity_states(entities: list) -> dict[str, Any]:
+    """Return the states of the entities by entity ID."""
+    states = {}
+    for entity in entities:
+        try:
+            states[entity.entity_id] = entity.state
+        except Exception as error:  # noqa: BLE001
+            states[entity.entity_id] = f"<{type(error).__name__}>"
+    return states
+
+
+def percentile(latencies: list[float], percent: float) -> float:
+    """Return the percentile of sorted latencies by nearest rank."""
+    index = max(round(percent / 100 * len(latencies)) - 1, 0)
+    return latencies[min(index, len(latencies) - 1)]
+
+
+async def set_up(frames: list[dict]) -> tuple[OnlyCatApiClient, list, Counter]:
+    """
+    Start up like the integration does, answering RPCs from the recording.
+
+    The entities live outside of Home Assistant, their state is read directly
+    instead of written.
+    """
+    gateway = RecordedGateway(frames)
+    client = OnlyCatApiClient(token="", session=None, socket=ReplaySocket(gateway))
+    entry = SimpleNamespace(
+        entry_id="replay",
+        runtime_data=OnlyCatData(client=client, devices=[], pets=[]),
+        async_on_unload=lambda _func: None,
+    )
+    await _initialize_devices(entry)
+    await _initialize_pets(entry)
+    client.add_event_listener(
+        "deviceUpdate", partial(_apply_device_update, entry), ordered=True
+    )
+    entities: list = []
+    for platform in PLATFORMS:
+        await platform.async_setup_entry(None, entry, entities.extend)
+    for entity in entities:
+        await entity.async_added_to_hass()
+    return client, entities, gateway.misses
+
+
+async def replay(
+    frames: list[dict], speed: float, *, verbose: bool = False
+) -> dict[str, list[float]]:
+    """Feed the pushes of a recording to the client, printing state changes."""
+    client, entities, misses = await set_up(frames)
+    pushes = [frame for frame in frames if frame["type"] == "push"]
+    print(f"Replaying {len(pushes)} pushes to {len(entities)} entities")
+
+    latencies: defaultdict[str, list[float]] = defaultdict(list)
+    states = entity_states(entities)
+    start = time.perf_counter()
+    first = pushes[0]["time"] if pushes else 0
+    for frame in pushes:
+        offset = frame["time"] - first
+        due = start + offset / speed if speed else time.perf_counter()
+        await asyncio.sleep(max(due - time.perf_counter(), 0))
+        await client.handle_event(frame["event"], frame["data"])
+        # End to end: from when the message was due until it was processed.
+        latency = time.perf_counter() - due
+        latencies[frame["event"]].append(latency)
+        if verbose:
+            print(f"{offset:>10.3f} s {frame['event']:<18} {latency * 1000:>8.2f} ms")
+
+        new_states = entity_states(entities)
+        for entity_id, state in new_states.items():
+            if state != states.get(entity_id):
+                print(
+                    f"{offset:>10.3f} s {entity_id}: {states.get(entity_id)} → {state}"
+                )
+        states = new_states
+
+    if misses:
+        print(f"Requests missing from the recording: {dict(misses)}")
+    return latencies
+
+
+def print_report(latencies: dict[str, list[float]]) -> None:
+    """Print the latency percentiles by event."""
+    print(
+        f"{'event':>18} {'count':>6} {'p50 ms':>8} {'p95 ms':>8}"
+        f" {'p99 ms':>8} {'max ms':>8}"
+    )
+    for event, values in sorted(latencies.items()):
+        values = sorted(values)  # noqa: PLW2901
+        print(
+            f"{event:>18} {len(values):>6}"
+            + "".join(
+                f" {percentile(values, percent) * 1000:>8.2f}"
+                for percent in (50, 95, 99, 100)
+            )
+        )
+
+
+async def main() -> None:
+    """Replay a recording given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("recording", type=Path, help="Recording of traffic_recorder")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1,
+        help="Replay speed relative to real time, 0 replays as fast as possible",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Print the latency of every message"
+    )
+    args = parser.parse_args()
+
+    latencies = await replay(
+        load_recording(args.recording), args.speed, verbose=args.verbose
+    )
+    print_report(latencies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())